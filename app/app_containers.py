@@ -24,7 +24,8 @@ class ApplicationContainer(containers.DeclarativeContainer):
             "app.v1_0.routers.utilidad_router",
             "app.v1_0.routers.banco_router",
             "app.v1_0.routers.auth_router", 
-            "app.v1_0.routers.estado_router"
+            "app.v1_0.routers.estado_router",
+            "app.v1_0.routers.cartera_router"
             ]
     )
 
@@ -1,20 +1,41 @@
 import time
 import json
+import logging
+from datetime import timedelta
+
+import aiocron
 from fastapi import FastAPI, APIRouter
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.v1_0.v1_router import v1_router
 from app.app_containers import ApplicationContainer  
 from app.utils.database import async_session  
+from app.utils.database.db_connector import settings
+from app.utils.database.lectura import instalar_lectura_consistente, middleware_lectura_consistente
+from app.utils.database.consultas_lentas import instalar_consultas_lentas
+from app.utils.database.instrumentacion import instalar_instrumentacion_sql, middleware_instrumentacion_sql
+from app.utils.logger import MiddlewareContextoLog, configurar_logging
+from app.utils.memoria import MiddlewareMemoria, rastreador_memoria
+from app.utils.metricas import MiddlewareMetricas, instalar_metricas_sql, registro
+from app.v1_0.helper.eventos_producto import instalar_eventos_producto
 
 PREFIX = "/sales-api"
 
 def create_app() -> FastAPI:
     """FastAPI configuration for the Sales System."""
 
+    configurar_logging(
+        nivel=settings.get("logging.nivel", "INFO"),
+        formato=settings.get("logging.formato", "auto"),
+        muestreo={m["logger"]: float(m["tasa"]) for m in settings.get("logging.muestreo", [])},
+    )
     container = ApplicationContainer()
     container.db_session.override(async_session)
+    instalar_eventos_producto()
+    instalar_lectura_consistente()
+    instalar_metricas_sql()
 
     app = FastAPI(
         openapi_url=f"{PREFIX}/openapi.json",
@@ -32,6 +53,49 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.middleware("http")(
+        middleware_lectura_consistente(settings.get("database.replica.sticky_segundos", 5))
+    )
+    if settings.get("instrumentacion.activo", True):
+        instalar_instrumentacion_sql()
+        app.middleware("http")(
+            middleware_instrumentacion_sql(
+                umbral_sentencias=settings.get("instrumentacion.umbral_sentencias", 20),
+                umbral_repeticiones=settings.get("instrumentacion.umbral_repeticiones", 5),
+                umbral_ms=settings.get("instrumentacion.umbral_ms", 500),
+            )
+        )
+    # Casi sin costo mientras tracemalloc no esté activo (memoria.activo o
+    # POST /admin/memoria/iniciar).
+    if settings.get("memoria.activo", False):
+        rastreador_memoria.iniciar(settings.get("memoria.frames", 10))
+    app.add_middleware(MiddlewareMemoria)
+    app.add_middleware(MiddlewareMetricas)
+    # Última en agregarse = la más externa: el request_id queda en todos los
+    # logs de la solicitud, incluidos los de los demás middlewares.
+    app.add_middleware(
+        MiddlewareContextoLog,
+        umbral_lenta_ms=settings.get("logging.umbral_lenta_ms", 1000),
+    )
+
+    @registro.recolector
+    def _recolectar_commit_agrupado():
+        commit_agrupado = container.api_container.venta_service().commit_agrupado
+        if commit_agrupado is None:
+            return
+        yield "ventas_commit_agrupado_lotes_total", "counter", "Lotes confirmados por el commit agrupado", (), commit_agrupado.lotes
+        yield "ventas_commit_agrupado_items_total", "counter", "Ventas procesadas por el commit agrupado", (), commit_agrupado.items
+        yield (
+            "ventas_commit_agrupado_lotes_fallidos_total", "counter",
+            "Lotes que fallaron y se reprocesaron venta por venta", (), commit_agrupado.lotes_fallidos,
+        )
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registro.exponer(), media_type="text/plain; version=0.0.4")
+
+    if settings.get("consultas_lentas.activo", True):
+        instalar_consultas_lentas()
     base_router = APIRouter(prefix=PREFIX)
     base_router.include_router(v1_router)
 
@@ -43,9 +107,59 @@ def create_app() -> FastAPI:
     app.include_router(base_router)
     return app
 
+logger = logging.getLogger(__name__)
+
+
+async def cerrar_kardex(app: FastAPI) -> None:
+    """Tarea programada: snapshot periódico del kardex."""
+    kardex_service = app.container.api_container.kardex_service()
+    margen = timedelta(minutes=settings.get("inventario.snapshot_margen_minutos", 5))
+    try:
+        async with async_session() as db:
+            await kardex_service.cerrar_periodo(db, margen=margen)
+    except Exception:
+        logger.exception("No se pudo generar el snapshot del kardex")
+
+
+async def purgar_idempotencia(app: FastAPI) -> None:
+    """Tarea programada: limpieza por TTL de las claves de idempotencia."""
+    idempotencia_service = app.container.api_container.idempotencia_service()
+    try:
+        async with async_session() as db:
+            await idempotencia_service.purgar_vencidas(db)
+    except Exception:
+        logger.exception("No se pudieron purgar las claves de idempotencia")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.container.init_resources()
+
+    # Abre el kardex de los productos con stock previo al historial, antes de
+    # que cualquier venta/compra registre movimientos sobre ellos.
+    try:
+        async with async_session() as db:
+            await app.container.api_container.kardex_service().abrir_kardex(db)
+    except Exception:
+        logger.exception("No se pudo abrir el kardex de inventario")
+
+    cron_kardex = aiocron.crontab(
+        settings.get("inventario.snapshot_cron", "0 3 * * *"),
+        func=cerrar_kardex,
+        args=(app,),
+        start=True,
+    )
+    cron_idempotencia = aiocron.crontab(
+        settings.get("idempotencia.purga_cron", "15 * * * *"),
+        func=purgar_idempotencia,
+        args=(app,),
+        start=True,
+    )
     yield
+    cron_kardex.stop()
+    cron_idempotencia.stop()
+    venta_service = app.container.api_container.venta_service()
+    if venta_service.commit_agrupado is not None:
+        await venta_service.commit_agrupado.cerrar()
 
 app = create_app()
@@ -0,0 +1,96 @@
+# app/utils/admision.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from fastapi import HTTPException
+
+from app.utils.database.db_connector import settings
+
+
+class ControlAdmision:
+    """
+    Control de admisión para una clase de carga (p. ej. reportes).
+
+    Deja pasar hasta `max_concurrentes` solicitudes a la vez; las siguientes
+    esperan en cola hasta `espera_max` segundos. Si la cola está llena o la
+    espera se agota, la solicitud se rechaza con 429 y Retry-After en lugar de
+    acumularse y quitarle conexiones y CPU a las ventas.
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        max_concurrentes: int,
+        max_en_cola: int,
+        espera_max: float,
+        retry_after: int,
+    ):
+        self.nombre = nombre
+        self.max_concurrentes = max_concurrentes
+        self.max_en_cola = max_en_cola
+        self.espera_max = espera_max
+        self.retry_after = retry_after
+        self._semaforo = asyncio.Semaphore(max_concurrentes)
+        self.en_curso = 0
+        self.en_cola = 0
+        self.admitidas = 0
+        self.rechazadas = 0
+
+    def _rechazar(self) -> HTTPException:
+        self.rechazadas += 1
+        return HTTPException(
+            status_code=429,
+            detail=f"Demasiadas solicitudes de {self.nombre} en curso; reintente más tarde",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    @asynccontextmanager
+    async def admitir(self) -> AsyncIterator[None]:
+        if self._semaforo.locked() and self.en_cola >= self.max_en_cola:
+            raise self._rechazar()
+        self.en_cola += 1
+        try:
+            await asyncio.wait_for(self._semaforo.acquire(), timeout=self.espera_max)
+        except asyncio.TimeoutError:
+            raise self._rechazar()
+        finally:
+            self.en_cola -= 1
+
+        self.admitidas += 1
+        self.en_curso += 1
+        try:
+            yield
+        finally:
+            self.en_curso -= 1
+            self._semaforo.release()
+
+    async def dependencia(self) -> AsyncIterator[None]:
+        """Para usar como `Depends(...)` en endpoints o routers."""
+        async with self.admitir():
+            yield
+
+    def estadisticas(self) -> Dict[str, int]:
+        return {
+            "max_concurrentes": self.max_concurrentes,
+            "max_en_cola": self.max_en_cola,
+            "en_curso": self.en_curso,
+            "en_cola": self.en_cola,
+            "admitidas": self.admitidas,
+            "rechazadas": self.rechazadas,
+        }
+
+
+def _desde_config(nombre: str) -> ControlAdmision:
+    return ControlAdmision(
+        nombre,
+        max_concurrentes=settings.get(f"admision.{nombre}.max_concurrentes", 3),
+        max_en_cola=settings.get(f"admision.{nombre}.max_en_cola", 10),
+        espera_max=settings.get(f"admision.{nombre}.espera_max_segundos", 5),
+        retry_after=settings.get(f"admision.{nombre}.retry_after_segundos", 5),
+    )
+
+
+# Reportes, exportaciones e historiales pesados (pool de reportes).
+admision_reportes = _desde_config("reportes")
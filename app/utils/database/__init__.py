@@ -1,3 +1,17 @@
-from app.utils.database.db_connector import async_session, get_db
+from app.utils.database.db_connector import (
+    async_session,
+    async_read_session,
+    async_report_session,
+    get_db,
+    get_read_db,
+    get_report_db,
+)
 
-__all__ = ["async_session", "get_db"]   
\ No newline at end of file
+__all__ = [
+    "async_session",
+    "async_read_session",
+    "async_report_session",
+    "get_db",
+    "get_read_db",
+    "get_report_db",
+]   
\ No newline at end of file
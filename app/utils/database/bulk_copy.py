@@ -0,0 +1,56 @@
+# app/utils/database/bulk_copy.py
+
+from typing import Any, AsyncIterable, Iterable, Sequence, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def copiar_filas(
+    session: AsyncSession,
+    tabla: str,
+    columnas: Sequence[str],
+    filas: Union[Iterable[Sequence[Any]], AsyncIterable[Sequence[Any]]]
+) -> int:
+    """
+    Carga filas en `tabla` con COPY ... FROM STDIN usando la conexión (y la
+    transacción) de la sesión. Las filas se consumen en streaming, sin
+    materializarlas en memoria; `filas` puede ser un iterable asíncrono
+    (p. ej. filas leídas en un hilo, ver `helper.importacion.leer_en_hilo`).
+
+    Soporta los drivers `psycopg` y `asyncpg`.
+
+    Returns:
+        int: Número de filas copiadas.
+    """
+    conexion = await session.connection()
+    raw = await conexion.get_raw_connection()
+    driver_conn = raw.driver_connection
+    driver = conexion.dialect.driver
+
+    total = 0
+
+    async def contar(it):
+        nonlocal total
+        if not hasattr(it, "__aiter__"):
+            it = _en_async(it)
+        async for fila in it:
+            total += 1
+            yield tuple(fila)
+
+    if driver == "psycopg":
+        lista_columnas = ", ".join(columnas)
+        async with driver_conn.cursor() as cur:
+            async with cur.copy(f"COPY {tabla} ({lista_columnas}) FROM STDIN") as copy:
+                async for fila in contar(filas):
+                    await copy.write_row(fila)
+    elif driver == "asyncpg":
+        await driver_conn.copy_records_to_table(
+            tabla, records=contar(filas), columns=list(columnas)
+        )
+    else:
+        raise RuntimeError(f"COPY no soportado para el driver '{driver}'")
+    return total
+
+
+async def _en_async(filas: Iterable[Sequence[Any]]):
+    for fila in filas:
+        yield fila
@@ -0,0 +1,135 @@
+# app/utils/database/commit_agrupado.py
+
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.database.db_connector import async_session
+from app.utils.database.lectura import marcar_escritura_confirmada
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+class CommitAgrupado(Generic[T, R]):
+    """
+    Agrupa operaciones que llegan casi al mismo tiempo en una sola
+    transacción ("group commit").
+
+    Cada `enviar` encola su item y espera su propio resultado. Un único
+    worker toma el primer item pendiente, espera hasta `espera` segundos (o
+    hasta `max_lote` items) a que lleguen más y los entrega juntos a
+    `procesar_lote`, que abre su propia transacción y retorna, en el mismo
+    orden, el resultado o la excepción de cada item. Si el lote completo
+    falla (deadlock, error inesperado), cada item se reintenta por separado
+    con `procesar_uno` para que un item problemático no arrastre a los demás.
+
+    El worker usa sus propias sesiones, no la del llamador: al recibir un
+    resultado, `enviar` marca en el contexto del llamador que la solicitud
+    escribió (lecturas siguientes y cookie de lectura en el primario).
+    """
+
+    def __init__(
+        self,
+        procesar_lote: Callable[[List[T], AsyncSession], Awaitable[List[Union[R, BaseException]]]],
+        procesar_uno: Callable[[T, AsyncSession], Awaitable[R]],
+        espera: float = 0.005,
+        max_lote: int = 50,
+    ):
+        self.procesar_lote = procesar_lote
+        self.procesar_uno = procesar_uno
+        self.espera = espera
+        self.max_lote = max_lote
+        self._cola: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Contadores para diagnóstico
+        self.lotes = 0
+        self.items = 0
+        self.lotes_fallidos = 0
+
+    async def enviar(self, item: T) -> R:
+        """Encola `item` y espera el resultado de su lote."""
+        if self._worker is None or self._worker.done():
+            self._cola = asyncio.Queue()
+            # Contexto vacío: el worker atiende a todas las solicitudes, no
+            # hereda el estado (lectura, log) de la que lo creó.
+            self._worker = asyncio.create_task(self._trabajar(), context=contextvars.Context())
+        futuro = asyncio.get_running_loop().create_future()
+        self._cola.put_nowait((item, futuro))
+        resultado = await futuro
+        marcar_escritura_confirmada()
+        return resultado
+
+    async def cerrar(self) -> None:
+        """Detiene el worker; los items aún encolados reciben CancelledError."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._cola is not None and not self._cola.empty():
+            _, futuro = self._cola.get_nowait()
+            futuro.cancel()
+
+    async def _trabajar(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.espera
+            while len(lote) < self.max_lote:
+                if not self._cola.empty():
+                    lote.append(self._cola.get_nowait())
+                    continue
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            # Quien ya abandonó la espera (request cancelada) no entra al lote.
+            lote = [(item, futuro) for item, futuro in lote if not futuro.done()]
+            if lote:
+                await self._procesar(lote)
+
+    async def _procesar(self, lote: List[Tuple[T, asyncio.Future]]) -> None:
+        self.lotes += 1
+        self.items += len(lote)
+        try:
+            async with async_session() as db:
+                resultados = await self.procesar_lote([item for item, _ in lote], db)
+        except Exception:
+            self.lotes_fallidos += 1
+            logger.warning(
+                "Falló el lote agrupado de %d items; se reintentan por separado",
+                len(lote), exc_info=True,
+            )
+            for item, futuro in lote:
+                try:
+                    async with async_session() as db:
+                        resultado = await self.procesar_uno(item, db)
+                except Exception as exc:
+                    _resolver(futuro, exc)
+                else:
+                    _resolver(futuro, resultado)
+            return
+
+        for (_, futuro), resultado in zip(lote, resultados):
+            _resolver(futuro, resultado)
+
+
+def _resolver(futuro: asyncio.Future, resultado) -> None:
+    if futuro.done():
+        return
+    if isinstance(resultado, BaseException):
+        futuro.set_exception(resultado)
+    else:
+        futuro.set_result(resultado)
@@ -0,0 +1,218 @@
+# app/utils/database/consultas_lentas.py
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Deque, Dict, List, Optional
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.database.db_connector import settings
+
+logger = logging.getLogger(__name__)
+
+# Opción de ejecución que excluye una sentencia del registro (el propio EXPLAIN).
+OPCION_IGNORAR = "consultas_lentas_ignorar"
+
+# Sentencias que admiten EXPLAIN sin ejecutarse (sin ANALYZE no se ejecutan).
+PREFIJOS_EXPLICABLES = ("select", "with", "insert", "update", "delete")
+
+_RAIZ_APP = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_CAPAS_ORIGEN = (
+    os.path.join(_RAIZ_APP, "v1_0", "routers") + os.sep,
+    os.path.join(_RAIZ_APP, "v1_0", "services") + os.sep,
+)
+
+
+@dataclass
+class ConsultaLenta:
+    """Sentencia que superó el umbral, con sus parámetros redactados."""
+    fecha: datetime
+    duracion_ms: float
+    sentencia: str
+    parametros: Any
+    origen: str
+    plan: Optional[Any] = None
+
+
+def _redactar_valor(valor: Any) -> Any:
+    # Se conserva el tipo (y el largo de los textos), nunca el valor.
+    if valor is None or isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (str, bytes)):
+        return f"<{type(valor).__name__}:{len(valor)}>"
+    if isinstance(valor, (int, float, Decimal)):
+        return f"<{type(valor).__name__}>"
+    if isinstance(valor, (list, tuple)):
+        return [_redactar_valor(v) for v in valor]
+    return f"<{type(valor).__name__}>"
+
+
+def redactar_parametros(parametros: Any, executemany: bool = False) -> Any:
+    """Parámetros sin sus valores: nombres/posiciones y tipos."""
+    if executemany:
+        filas = list(parametros or [])
+        return {"filas": len(filas), "primera": redactar_parametros(filas[0]) if filas else None}
+    if isinstance(parametros, dict):
+        return {k: _redactar_valor(v) for k, v in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_redactar_valor(v) for v in parametros]
+    return _redactar_valor(parametros)
+
+
+def _frames():
+    """
+    Pila de la sentencia en curso. Con los engines asíncronos la sentencia
+    corre en un greenlet hijo: el router y el servicio que la originaron
+    están en la pila del greenlet padre.
+    """
+    frame = sys._getframe()
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    actual = greenlet.getcurrent()
+    frame = actual.parent.gr_frame if actual.parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def origen_sentencia() -> str:
+    """Endpoint y método de servicio que originaron la sentencia en curso."""
+    encontrados: List[str] = []
+    for frame in _frames():
+        archivo = frame.f_code.co_filename
+        if archivo.startswith(_CAPAS_ORIGEN):
+            nombre = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            modulo = os.path.splitext(os.path.basename(archivo))[0]
+            encontrados.append(nombre if "." in nombre else f"{modulo}.{nombre}")
+    # La pila va del más interno al más externo: router > servicio.
+    return " > ".join(reversed(encontrados)) or "desconocido"
+
+
+class RegistroConsultasLentas:
+    """
+    Buffer circular de las últimas `capacidad` sentencias que tardaron más de
+    `umbral_ms`. Para una muestra (`muestreo_explain`) se obtiene el plan con
+    `EXPLAIN (FORMAT JSON)` en una tarea aparte, sin demorar la solicitud; una
+    misma sentencia se explica a lo más una vez cada `explain_cada_segundos`
+    y nunca hay más de un EXPLAIN en curso.
+    """
+
+    def __init__(
+        self,
+        umbral_ms: float,
+        capacidad: int,
+        muestreo_explain: float,
+        explain_cada_segundos: float,
+    ):
+        self.umbral_ms = umbral_ms
+        self.muestreo_explain = muestreo_explain
+        self.explain_cada_segundos = explain_cada_segundos
+        self._consultas: Deque[ConsultaLenta] = deque(maxlen=capacidad)
+        self._explicadas: Dict[str, float] = {}
+        self._explain_en_curso = False
+        self._tareas = set()
+
+    def registrar(self, conn, statement, parameters, duracion: float, executemany: bool) -> None:
+        consulta = ConsultaLenta(
+            fecha=datetime.now(),
+            duracion_ms=round(duracion * 1000, 3),
+            sentencia=statement,
+            parametros=redactar_parametros(parameters, executemany),
+            origen=origen_sentencia(),
+        )
+        self._consultas.append(consulta)
+        logger.warning(
+            "Consulta lenta (%.1f ms) desde %s: %s",
+            consulta.duracion_ms, consulta.origen, " ".join(statement.split())[:300],
+        )
+        if not executemany and self._debe_explicar(statement):
+            self._explicar(conn.engine, consulta, statement, parameters)
+
+    def _debe_explicar(self, statement: str) -> bool:
+        if self._explain_en_curso or random.random() >= self.muestreo_explain:
+            return False
+        if not statement.lstrip().lower().startswith(PREFIJOS_EXPLICABLES):
+            return False
+        ahora = time.monotonic()
+        if ahora - self._explicadas.get(statement, float("-inf")) < self.explain_cada_segundos:
+            return False
+        self._explicadas[statement] = ahora
+        if len(self._explicadas) > 10 * (self._consultas.maxlen or 1):
+            self._explicadas.clear()
+        return True
+
+    def _explicar(self, sync_engine: Engine, consulta: ConsultaLenta, statement, parameters) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # engine síncrono fuera del event loop: sólo se registra
+        self._explain_en_curso = True
+        tarea = loop.create_task(self._obtener_plan(sync_engine, consulta, statement, parameters))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _obtener_plan(self, sync_engine: Engine, consulta: ConsultaLenta, statement, parameters) -> None:
+        try:
+            # Mismo engine (y pool) en el que corrió la sentencia; la conexión
+            # se devuelve con rollback.
+            async with AsyncEngine(sync_engine).connect() as conn:
+                conn = await conn.execution_options(**{OPCION_IGNORAR: True})
+                resultado = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                )
+                consulta.plan = resultado.scalar()
+        except Exception as e:
+            consulta.plan = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self._explain_en_curso = False
+
+    def consultas(self) -> List[Dict[str, Any]]:
+        """Consultas registradas, de la más reciente a la más antigua."""
+        return [asdict(c) for c in reversed(self._consultas)]
+
+    def limpiar(self) -> None:
+        self._consultas.clear()
+        self._explicadas.clear()
+
+
+consultas_lentas = RegistroConsultasLentas(
+    umbral_ms=settings.get("consultas_lentas.umbral_ms", 200),
+    capacidad=settings.get("consultas_lentas.capacidad", 100),
+    muestreo_explain=settings.get("consultas_lentas.muestreo_explain", 0.2),
+    explain_cada_segundos=settings.get("consultas_lentas.explain_cada_segundos", 300),
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.inicio_consulta = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or context.execution_options.get(OPCION_IGNORAR):
+        return
+    duracion = time.perf_counter() - context.inicio_consulta
+    if duracion * 1000 >= consultas_lentas.umbral_ms:
+        consultas_lentas.registrar(conn, statement, parameters, duracion, executemany)
+
+
+def instalar_consultas_lentas() -> None:
+    """Registra los hooks del registro de consultas lentas (idempotente)."""
+    for nombre, hook in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(Engine, nombre, hook):
+            event.listen(Engine, nombre, hook)
@@ -1,18 +1,30 @@
 # app/db_conector.py
 
+import os
+
 from dynaconf import Dynaconf
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.utils.database.pool import crear_engine
+from app.utils.database.lectura import leer_del_primario, marcar_replica_caida, replica_caida
 
 settings = Dynaconf(
     settings_files=["config.yml"],
     load_dotenv=True
 )
 
-DATABASE_URL  = settings.database.url
-DATABASE_ECHO = settings.database.echo
+DATABASE_URL    = settings.database.url
+# Perfil del engine/pool: APP_ENV o database.perfil (ver database.perfiles en config.yml).
+DATABASE_PERFIL = os.getenv("APP_ENV") or settings.get("database.perfil", "local")
 
-engine = create_async_engine(DATABASE_URL, echo=DATABASE_ECHO)
+engine = crear_engine(
+    DATABASE_URL,
+    DATABASE_PERFIL,
+    settings.get(f"database.perfiles.{DATABASE_PERFIL}", {}),
+)
 
 async_session = sessionmaker(
     bind=engine,
@@ -20,6 +32,136 @@ async_session = sessionmaker(
     expire_on_commit=False
 )
 
+# Réplica de solo lectura (opcional). Sin database.replica.url, las sesiones
+# de lectura usan el primario.
+REPLICA_URL = settings.get("database.replica.url") or None
+
+read_engine = (
+    crear_engine(
+        REPLICA_URL,
+        DATABASE_PERFIL,
+        settings.get(f"database.perfiles.{DATABASE_PERFIL}", {}),
+    )
+    if REPLICA_URL else engine
+)
+
+FALLBACK_REPLICA = bool(REPLICA_URL) and settings.get("database.replica.fallback", True)
+
+
+def _replica_caida(context):
+    # Sin conexión a la réplica: las lecturas siguientes van al primario.
+    if context.connection is None or context.is_disconnect:
+        marcar_replica_caida(settings.get("database.replica.caida_segundos", 30))
+
+
+class _SesionReplica(Session):
+    """
+    Sesión que lee de `replica` salvo que deba leer de `primario`
+    (`_usar_primario`), decidido en cada sentencia.
+
+    Si la réplica no acepta la conexión, el hook handle_error la marca
+    caída y la sentencia se reintenta una vez en el primario, en vez de
+    fallar la solicitud que se topó con la caída. Sólo se reintenta cuando
+    no llegó a haber conexión (error al conectar): con una conexión
+    invalidada a mitad de la transacción, el error se propaga.
+    """
+
+    replica = None
+    primario = None
+
+    @staticmethod
+    def _usar_primario() -> bool:
+        return replica_caida()
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._usar_primario():
+            return self.primario.sync_engine
+        return self.replica.sync_engine
+
+    def _con_fallback(self, metodo, *args, **kwargs):
+        en_replica = FALLBACK_REPLICA and not self._usar_primario()
+        try:
+            return metodo(*args, **kwargs)
+        except DBAPIError as exc:
+            if not en_replica or exc.connection_invalidated or not self._usar_primario():
+                raise
+            return metodo(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        return self._con_fallback(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._con_fallback(super().scalar, *args, **kwargs)
+
+
+class SesionLectura(_SesionReplica):
+    """
+    Sesión de lectura: consulta la réplica salvo que la solicitud deba leer
+    del primario (escribió hace poco o la réplica está caída). Se decide en
+    cada sentencia, así una lectura posterior a una escritura en la misma
+    solicitud ve lo escrito.
+    """
+
+    replica = read_engine
+    primario = engine
+
+    @staticmethod
+    def _usar_primario() -> bool:
+        return leer_del_primario()
+
+
+async_read_session = sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=SesionLectura,
+    expire_on_commit=False,
+    info={"lectura": True},
+)
+
+# Pool de reportes: exportaciones y consultas analíticas con su propio tamaño
+# y statement_timeout (database.reportes sobre el perfil activo), para que no
+# agoten las conexiones de las ventas. Lee de la réplica si existe.
+report_engine = crear_engine(
+    REPLICA_URL or DATABASE_URL,
+    DATABASE_PERFIL,
+    {
+        **settings.get(f"database.perfiles.{DATABASE_PERFIL}", {}),
+        **settings.get("database.reportes", {}),
+    },
+)
+
+# Con réplica: pool de reportes sobre el primario, con los mismos límites,
+# para cuando la réplica está caída (abre conexiones sólo si se usa).
+report_engine_primario = (
+    crear_engine(
+        DATABASE_URL,
+        DATABASE_PERFIL,
+        {
+            **settings.get(f"database.perfiles.{DATABASE_PERFIL}", {}),
+            **settings.get("database.reportes", {}),
+        },
+    )
+    if FALLBACK_REPLICA else report_engine
+)
+
+if FALLBACK_REPLICA:
+    for _motor in (read_engine, report_engine):
+        event.listen(_motor.sync_engine, "handle_error", _replica_caida)
+
+
+class SesionReportes(_SesionReplica):
+    """Sesión de reportes: la réplica, o el primario mientras esté caída."""
+
+    replica = report_engine
+    primario = report_engine_primario
+
+
+async_report_session = sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=SesionReportes,
+    expire_on_commit=False,
+    info={"lectura": True},
+)
+
 async def get_db() -> AsyncSession:
     """
     Crea y entrega la sesión sin iniciar automáticamente una transacción.
@@ -30,3 +172,28 @@ async def get_db() -> AsyncSession:
         yield session
     finally:
         await session.close()
+
+
+async def get_read_db() -> AsyncSession:
+    """
+    Como `get_db`, pero para endpoints de solo lectura (listados, consultas y
+    reportes): usa la réplica cuando está configurada y disponible.
+    """
+    session = async_read_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_report_db() -> AsyncSession:
+    """
+    Sesión del pool de reportes, para endpoints pesados de solo lectura
+    (exportaciones, cartera, historiales). Usar junto con el control de
+    admisión de reportes.
+    """
+    session = async_report_session()
+    try:
+        yield session
+    finally:
+        await session.close()
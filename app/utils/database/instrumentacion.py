@@ -0,0 +1,114 @@
+# app/utils/database/instrumentacion.py
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.logger import actualizar_contexto_log
+
+logger = logging.getLogger(__name__)
+
+# Largo máximo de una sentencia en el log.
+LARGO_SENTENCIA_LOG = 300
+
+
+@dataclass
+class MetricasSQL:
+    """Sentencias ejecutadas y tiempo de base de datos de una solicitud."""
+    sentencias: int = 0
+    tiempo: float = 0.0
+    # Forma de la sentencia (SQL con parámetros sin sustituir) -> ejecuciones.
+    formas: Counter = field(default_factory=Counter)
+
+
+_metricas: ContextVar[Optional[MetricasSQL]] = ContextVar("metricas_sql", default=None)
+
+
+def metricas_actuales() -> Optional[MetricasSQL]:
+    """Métricas SQL de la solicitud en curso (None fuera de una solicitud)."""
+    return _metricas.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # En el contexto de ejecución (y no en la conexión) para no dejar restos
+    # cuando la sentencia falla y after_cursor_execute no se llama.
+    if context is not None:
+        context.inicio_sql = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metricas = _metricas.get()
+    if metricas is not None and context is not None:
+        metricas.sentencias += 1
+        metricas.tiempo += time.perf_counter() - context.inicio_sql
+        metricas.formas[statement] += 1
+
+
+def instalar_instrumentacion_sql() -> None:
+    """Registra los hooks de conteo y tiempo en todos los engines (idempotente)."""
+    for nombre, hook in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(Engine, nombre, hook):
+            event.listen(Engine, nombre, hook)
+
+
+def _resumen(sentencia: str) -> str:
+    sentencia = " ".join(sentencia.split())
+    if len(sentencia) > LARGO_SENTENCIA_LOG:
+        return sentencia[:LARGO_SENTENCIA_LOG] + "..."
+    return sentencia
+
+
+def middleware_instrumentacion_sql(
+    umbral_sentencias: int,
+    umbral_repeticiones: int,
+    umbral_ms: float,
+):
+    """
+    Middleware HTTP: cuenta sentencias y tiempo de base de datos de cada
+    solicitud y los informa en `Server-Timing` (db y app). Registra en el log
+    las solicitudes que superan `umbral_sentencias` o `umbral_ms`, y las que
+    ejecutan una misma forma de sentencia `umbral_repeticiones` veces o más
+    (patrón N+1: una consulta por fila de un listado).
+    """
+    async def instrumentacion_sql(request: Request, call_next):
+        metricas = MetricasSQL()
+        token = _metricas.set(metricas)
+        inicio = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _metricas.reset(token)
+        total_ms = (time.perf_counter() - inicio) * 1000
+        db_ms = metricas.tiempo * 1000
+        actualizar_contexto_log(sql_sentencias=metricas.sentencias, sql_ms=round(db_ms, 1))
+
+        response.headers.append(
+            "Server-Timing",
+            f'db;dur={db_ms:.1f};desc="{metricas.sentencias} sentencias", app;dur={total_ms:.1f}',
+        )
+
+        ruta = f"{request.method} {request.url.path}"
+        repetidas = [
+            (forma, veces) for forma, veces in metricas.formas.most_common()
+            if veces >= umbral_repeticiones
+        ]
+        for forma, veces in repetidas:
+            logger.warning("Posible N+1 en %s: %d ejecuciones de %s", ruta, veces, _resumen(forma))
+        if metricas.sentencias > umbral_sentencias or db_ms > umbral_ms:
+            logger.warning(
+                "%s ejecutó %d sentencias en %.1f ms de base de datos (%.1f ms total)",
+                ruta, metricas.sentencias, db_ms, total_ms,
+            )
+        return response
+
+    return instrumentacion_sql
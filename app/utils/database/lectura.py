@@ -0,0 +1,111 @@
+# app/utils/database/lectura.py
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Cookie que mantiene las lecturas de un cliente en el primario durante unos
+# segundos después de que escribió (lee lo que acaba de escribir aunque la
+# réplica tenga retraso).
+COOKIE_PRIMARIO = "pos_leer_primario"
+
+# Estado de la solicitud en curso: {"primario": bool, "escribio": bool}.
+_estado: ContextVar[Optional[dict]] = ContextVar("estado_lectura", default=None)
+
+# Hasta cuándo (time.monotonic) se considera caída la réplica.
+_replica_caida_hasta = 0.0
+
+
+def leer_del_primario() -> bool:
+    """
+    True si las sesiones de lectura deben ir al primario: la solicitud (o el
+    cliente, por la cookie) escribió hace poco, o la réplica está caída.
+    """
+    estado = _estado.get()
+    return bool(estado and estado["primario"]) or replica_caida()
+
+
+def replica_caida() -> bool:
+    """True mientras la réplica se considera caída (ver `marcar_replica_caida`)."""
+    return time.monotonic() < _replica_caida_hasta
+
+
+def marcar_replica_caida(segundos: float) -> None:
+    """Envía las lecturas al primario durante `segundos`."""
+    global _replica_caida_hasta
+    _replica_caida_hasta = time.monotonic() + segundos
+
+
+def _marcar_escritura(session: Session) -> None:
+    if not session.info.get("lectura"):
+        session.info["escribe"] = True
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    _marcar_escritura(session)
+
+
+def _do_orm_execute(orm_execute_state) -> None:
+    # Cubre los INSERT/UPDATE/DELETE por lotes que no pasan por el flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _marcar_escritura(orm_execute_state.session)
+
+
+def marcar_escritura_confirmada() -> None:
+    """
+    Marca que la solicitud en curso confirmó escrituras: sus lecturas
+    siguientes van al primario y la respuesta fija la cookie. Los hooks lo
+    hacen solos para las sesiones de la solicitud; llamarlo cuando la
+    escritura la confirmó otra tarea por ella (p. ej. el commit agrupado).
+    """
+    estado = _estado.get()
+    if estado is not None:
+        estado["primario"] = True
+        estado["escribio"] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop("escribe", False):
+        marcar_escritura_confirmada()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop("escribe", None)
+
+
+def instalar_lectura_consistente() -> None:
+    """Registra los hooks que detectan escrituras confirmadas (idempotente)."""
+    for nombre, hook in (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(Session, nombre, hook):
+            event.listen(Session, nombre, hook)
+
+
+def middleware_lectura_consistente(sticky_segundos: int):
+    """
+    Middleware HTTP: abre el estado de lectura de cada solicitud y, si la
+    solicitud confirmó escrituras, fija la cookie que mantiene al cliente
+    leyendo del primario durante `sticky_segundos`.
+    """
+    async def lectura_consistente(request: Request, call_next):
+        estado = {"primario": COOKIE_PRIMARIO in request.cookies, "escribio": False}
+        token = _estado.set(estado)
+        try:
+            response = await call_next(request)
+        finally:
+            _estado.reset(token)
+        if estado["escribio"] and sticky_segundos > 0:
+            response.set_cookie(
+                COOKIE_PRIMARIO, "1", max_age=sticky_segundos, httponly=True, samesite="lax"
+            )
+        return response
+
+    return lectura_consistente
@@ -0,0 +1,135 @@
+# app/utils/database/pool.py
+
+import logging
+import time
+from typing import Any, Dict, Mapping
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.utils.database.url_builder import construir_url, driver_de
+
+# Perfiles en los que se permite `echo` (log de cada sentencia SQL);
+# también sus variantes, p. ej. "local_asyncpg".
+PERFILES_DESARROLLO = ("local", "dev", "desarrollo")
+
+
+class PoolConMetricas(AsyncAdaptedQueuePool):
+    """
+    Pool de conexiones que además mide cuánto tarda cada checkout
+    (espera por una conexión libre o apertura de una nueva) y cuántos
+    terminan en timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_overflow = kwargs.get("max_overflow", 10)
+        self.adquisiciones = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            self.adquisiciones += 1
+            self.espera_total += espera
+            self.espera_max = max(self.espera_max, espera)
+
+
+def _connect_args(driver: str, perfil: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Argumentos de conexión según el driver: caché de sentencias preparadas
+    y statement_timeout.
+
+    Con `pgbouncer: true` (pool en modo transacción) se desactivan las
+    sentencias preparadas del lado del servidor, porque una sentencia
+    preparada en una conexión física no existe en la siguiente, y no se
+    envían parámetros de arranque (PgBouncer los rechaza); en ese caso el
+    statement_timeout debe fijarse en el rol de la base de datos.
+    """
+    pgbouncer = bool(perfil.get("pgbouncer", False))
+    statement_timeout_ms = perfil.get("statement_timeout_ms", 0)
+    args: Dict[str, Any] = {}
+
+    if driver == "asyncpg":
+        if pgbouncer:
+            args["statement_cache_size"] = 0
+            args["prepared_statement_cache_size"] = 0
+            # Nombres únicos: evita choques con sentencias de otro cliente
+            # que PgBouncer haya dejado en la misma conexión física.
+            args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        else:
+            # Caché de asyncpg (por conexión) y del adaptador de SQLAlchemy.
+            args["statement_cache_size"] = perfil.get("statement_cache_size", 100)
+            args["prepared_statement_cache_size"] = perfil.get("statement_cache_size", 100)
+            if statement_timeout_ms:
+                args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+    else:
+        if pgbouncer:
+            args["prepare_threshold"] = None
+        else:
+            # Ejecuciones de una misma consulta antes de prepararla en el servidor.
+            args["prepare_threshold"] = perfil.get("prepare_threshold", 5)
+            if statement_timeout_ms:
+                args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+    return args
+
+
+def crear_engine(url: str, nombre_perfil: str, perfil: Mapping[str, Any]) -> AsyncEngine:
+    """
+    Crea el engine asíncrono a partir de un perfil de `database.perfiles`
+    (config.yml): driver, tamaño del pool, overflow, timeout de checkout,
+    reciclaje de conexiones, pre-ping, caché de sentencias preparadas y
+    statement_timeout. `echo` sólo se respeta en perfiles de desarrollo.
+    """
+    if perfil.get("driver"):
+        url = construir_url(url, perfil["driver"])
+    if perfil.get("echo", False) and nombre_perfil.split("_")[0] in PERFILES_DESARROLLO:
+        # En lugar de echo=True, que agrega un handler que escribe a stdout
+        # desde el event loop, se sube el nivel del logger: las sentencias
+        # pasan por la cola de logging (app.utils.logger).
+        logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.INFO)
+    return create_async_engine(
+        url,
+        poolclass=PoolConMetricas,
+        pool_size=perfil.get("pool_size", 5),
+        max_overflow=perfil.get("max_overflow", 10),
+        pool_timeout=perfil.get("pool_timeout", 30),
+        pool_recycle=perfil.get("pool_recycle", 1800),
+        pool_pre_ping=perfil.get("pool_pre_ping", True),
+        connect_args=_connect_args(driver_de(url), perfil),
+    )
+
+
+def estadisticas_pool(engine: AsyncEngine) -> Dict[str, Any]:
+    """Estado actual del pool del engine y métricas acumuladas de checkout."""
+    pool = engine.pool
+    datos: Dict[str, Any] = {
+        "tamano": pool.size(),
+        "en_uso": pool.checkedout(),
+        "libres": pool.checkedin(),
+        # overflow() es negativo mientras el pool no ha abierto todas sus conexiones.
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": getattr(pool, "max_overflow", 0),
+        "timeout": pool.timeout(),
+    }
+    if isinstance(pool, PoolConMetricas):
+        datos.update(
+            adquisiciones=pool.adquisiciones,
+            espera_promedio_ms=(
+                round(pool.espera_total / pool.adquisiciones * 1000, 3)
+                if pool.adquisiciones else 0.0
+            ),
+            espera_max_ms=round(pool.espera_max * 1000, 3),
+            timeouts=pool.timeouts,
+        )
+    return datos
@@ -0,0 +1,185 @@
+# app/utils/database/transacciones.py
+
+import asyncio
+import functools
+import logging
+import random
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Type
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.database.db_connector import settings
+
+logger = logging.getLogger(__name__)
+
+# Orden canónico de bloqueo: catálogos con saldos/stock primero, documentos al
+# final. Toda transacción que escriba varias de estas tablas bloquea sus filas
+# en este orden (y por id dentro de cada tabla), así dos transacciones nunca
+# esperan una por la otra en orden cruzado.
+ORDEN_BLOQUEO = ("producto", "banco", "cliente", "proveedor", "compra", "venta")
+
+# SQLSTATE de PostgreSQL que indican que la transacción puede reintentarse.
+SQLSTATE_DEADLOCK = "40P01"
+SQLSTATE_SERIALIZACION = "40001"
+
+# Clave en Session.info: la sesión está dentro de `transaccion_externa`.
+CLAVE_TRANSACCION_EXTERNA = "transaccion_externa"
+
+
+@dataclass
+class ContadoresReintento:
+    deadlocks: int = 0
+    serializacion: int = 0
+    reintentos: int = 0
+    agotados: int = 0
+
+
+contadores_reintento = ContadoresReintento()
+
+
+def estadisticas_reintento() -> Dict[str, int]:
+    """Copia de los contadores de reintentos desde que arrancó el proceso."""
+    return asdict(contadores_reintento)
+
+
+def _posicion(modelo: Type) -> tuple:
+    tabla = modelo.__tablename__
+    if tabla in ORDEN_BLOQUEO:
+        return (ORDEN_BLOQUEO.index(tabla), tabla)
+    return (len(ORDEN_BLOQUEO), tabla)
+
+
+async def bloquear_filas(
+    session: AsyncSession,
+    filas: Mapping[Type, Iterable[Optional[int]]],
+) -> Dict[Type, Dict[int, Any]]:
+    """
+    Bloquea (FOR UPDATE) las filas indicadas por modelo, en el orden canónico
+    de tablas y por id dentro de cada tabla, con una consulta por tabla.
+
+    Las entidades se recargan (populate_existing), de modo que un
+    `get_by_id` posterior en la misma sesión ve el estado ya bloqueado y no
+    una copia leída antes del bloqueo. Los ids None se ignoran.
+
+    Returns:
+        Dict[Type, Dict[int, Any]]: {modelo: {id: entidad}} de las filas encontradas.
+    """
+    bloqueadas: Dict[Type, Dict[int, Any]] = {}
+    for modelo in sorted(filas, key=_posicion):
+        ids = sorted({i for i in filas[modelo] if i is not None})
+        if not ids:
+            continue
+        stmt = (
+            select(modelo)
+            .where(modelo.id.in_(ids))
+            .order_by(modelo.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        bloqueadas[modelo] = {e.id: e for e in result.scalars().all()}
+    return bloqueadas
+
+
+@asynccontextmanager
+async def transaccion_externa(db: AsyncSession) -> AsyncIterator[None]:
+    """
+    Abre una transacción que engloba la de los servicios llamados dentro:
+    sus `transaccion(db)` se unen a ella en vez de abrir y confirmar la
+    propia, de modo que lo que el llamador escriba junto a la operación
+    (p. ej. la respuesta de una Idempotency-Key) se confirma o revierte
+    con ella en un solo commit.
+    """
+    async with db.begin():
+        db.info[CLAVE_TRANSACCION_EXTERNA] = True
+        try:
+            yield
+        finally:
+            db.info.pop(CLAVE_TRANSACCION_EXTERNA, None)
+
+
+@asynccontextmanager
+async def transaccion(db: AsyncSession) -> AsyncIterator[None]:
+    """
+    `db.begin()` para los servicios de escritura: abre y confirma la
+    transacción, salvo dentro de `transaccion_externa`, donde la operación
+    queda en la transacción del llamador y el commit es suyo.
+    """
+    if db.info.get(CLAVE_TRANSACCION_EXTERNA):
+        yield
+        return
+    async with db.begin():
+        yield
+
+
+def en_transaccion_externa(db: AsyncSession) -> bool:
+    return bool(db.info.get(CLAVE_TRANSACCION_EXTERNA))
+
+
+def _sesion_externa(args, kwargs) -> bool:
+    return any(
+        isinstance(valor, AsyncSession) and en_transaccion_externa(valor)
+        for valor in (*args, *kwargs.values())
+    )
+
+
+def _sqlstate(exc: DBAPIError) -> Optional[str]:
+    orig = exc.orig
+    # psycopg expone `sqlstate`; el adaptador de asyncpg, `sqlstate` o `pgcode`.
+    return getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+
+
+def reintentar_transaccion(
+    max_intentos: Optional[int] = None,
+    base_ms: Optional[float] = None,
+    tope_ms: Optional[float] = None,
+):
+    """
+    Decorador para métodos de servicio que abren su propia transacción con
+    `async with db.begin()` o `transaccion(db)`: si la transacción aborta
+    por deadlock o por conflicto de serialización, se reintenta la llamada
+    completa con espera exponencial y jitter ("full jitter"). Cualquier
+    otro error se propaga de inmediato.
+
+    Dentro de `transaccion_externa` no reintenta: la transacción abortada es
+    la del llamador, que es quien debe reintentar (también decorado).
+
+    Los valores por defecto salen de `database.reintentos` en config.yml.
+    """
+    def decorador(func):
+        @functools.wraps(func)
+        async def envoltura(*args, **kwargs):
+            if _sesion_externa(args, kwargs):
+                return await func(*args, **kwargs)
+            intentos = max_intentos or settings.get("database.reintentos.max_intentos", 3)
+            base = (base_ms or settings.get("database.reintentos.base_ms", 20)) / 1000
+            tope = (tope_ms or settings.get("database.reintentos.tope_ms", 500)) / 1000
+            intento = 1
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except DBAPIError as exc:
+                    sqlstate = _sqlstate(exc)
+                    if sqlstate == SQLSTATE_DEADLOCK:
+                        contadores_reintento.deadlocks += 1
+                    elif sqlstate == SQLSTATE_SERIALIZACION:
+                        contadores_reintento.serializacion += 1
+                    else:
+                        raise
+                    if intento >= intentos:
+                        contadores_reintento.agotados += 1
+                        raise
+                    contadores_reintento.reintentos += 1
+                    espera = random.uniform(0, min(tope, base * 2 ** (intento - 1)))
+                    logger.warning(
+                        "%s abortó (SQLSTATE %s), reintento %d/%d en %.0f ms",
+                        func.__qualname__, sqlstate, intento, intentos - 1, espera * 1000,
+                    )
+                    intento += 1
+                    await asyncio.sleep(espera)
+        return envoltura
+    return decorador
@@ -0,0 +1,24 @@
+# app/utils/database/url_builder.py
+
+from sqlalchemy.engine import make_url
+
+# Drivers asíncronos de PostgreSQL soportados por la aplicación.
+DRIVERS = ("psycopg", "asyncpg")
+
+
+def construir_url(url: str, driver: str) -> str:
+    """
+    Retorna `url` usando el driver indicado (`postgresql+<driver>`),
+    conservando credenciales, host, base y parámetros.
+
+    Raises:
+        ValueError: Si el driver no está soportado.
+    """
+    if driver not in DRIVERS:
+        raise ValueError(f"Driver no soportado: {driver} (opciones: {', '.join(DRIVERS)})")
+    return make_url(url).set(drivername=f"postgresql+{driver}").render_as_string(hide_password=False)
+
+
+def driver_de(url: str) -> str:
+    """Nombre del driver de una URL `postgresql+<driver>://...`."""
+    return make_url(url).get_driver_name()
@@ -0,0 +1,61 @@
+# app/utils/eventos.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Set
+
+# Marca que recibe un suscriptor cuyo buffer se llenó: perdió eventos y
+# debe recargar el estado completo.
+RESYNC = object()
+
+
+def es_respuesta_sse(mensaje: dict) -> bool:
+    """
+    True si `mensaje` (ASGI `http.response.start`) abre un stream SSE. Los
+    middlewares lo usan para no tratar una conexión de larga duración como
+    una solicitud más (latencias, solicitudes en curso, umbrales lentos).
+    """
+    for nombre, valor in mensaje.get("headers", ()):
+        if nombre.lower() == b"content-type":
+            return valor.split(b";", 1)[0].strip().lower() == b"text/event-stream"
+    return False
+
+
+class BrokerEventos:
+    """
+    Difusión en memoria (un proceso) de eventos a suscriptores asíncronos.
+
+    Cada suscriptor tiene una cola acotada; publicar nunca bloquea. Si un
+    suscriptor lento llena su cola, se vacía y recibe RESYNC en lugar de
+    acumular memoria sin límite.
+    """
+
+    def __init__(self, max_pendientes: int = 256):
+        self.max_pendientes = max_pendientes
+        self._suscriptores: Set[asyncio.Queue] = set()
+
+    @property
+    def suscriptores(self) -> int:
+        return len(self._suscriptores)
+
+    def publicar(self, evento: Any) -> None:
+        for cola in list(self._suscriptores):
+            try:
+                cola.put_nowait(evento)
+            except asyncio.QueueFull:
+                while not cola.empty():
+                    cola.get_nowait()
+                cola.put_nowait(RESYNC)
+
+    @asynccontextmanager
+    async def suscribir(self) -> AsyncIterator[asyncio.Queue]:
+        cola: asyncio.Queue = asyncio.Queue(maxsize=self.max_pendientes)
+        self._suscriptores.add(cola)
+        try:
+            yield cola
+        finally:
+            self._suscriptores.discard(cola)
+
+
+# Cambios de stock/precio/estado de productos (ver app.v1_0.helper.eventos_producto).
+broker_productos = BrokerEventos()
@@ -0,0 +1,254 @@
+# app/utils/logger.py
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Mapping, Optional
+
+import colorlog
+
+from app.utils.eventos import es_respuesta_sse
+
+ENCABEZADO_REQUEST_ID = "x-request-id"
+
+# Contexto de la solicitud en curso: request_id, método, ruta y métricas que
+# otros middlewares agregan (sentencias SQL, tiempo de BD).
+_contexto: ContextVar[Optional[dict]] = ContextVar("contexto_log", default=None)
+
+# Atributos propios de LogRecord; el resto son campos `extra` o de contexto.
+_CAMPOS_RECORD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+log_solicitudes = logging.getLogger("app.solicitudes")
+
+
+def actualizar_contexto_log(**campos: Any) -> None:
+    """Agrega campos al contexto de la solicitud en curso (sin efecto fuera de una)."""
+    contexto = _contexto.get()
+    if contexto is not None:
+        contexto.update(campos)
+
+
+class FiltroContexto(logging.Filter):
+    """Copia el request_id, método y ruta de la solicitud en curso al registro."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        contexto = _contexto.get()
+        if contexto is not None:
+            for campo in ("request_id", "metodo", "ruta"):
+                if not hasattr(record, campo):
+                    setattr(record, campo, contexto.get(campo))
+        return True
+
+
+class FiltroMuestreo(logging.Filter):
+    """
+    Emite sólo una fracción de los logs bajo WARNING de los loggers
+    configurados (por prefijo: "sqlalchemy.engine" cubre sus hijos).
+    WARNING o superior se emite siempre. Los registros que pasan el muestreo
+    llevan la tasa en `muestreo`, para escalar conteos al analizarlos.
+    """
+
+    def __init__(self, tasas: Mapping[str, float]):
+        super().__init__()
+        self.tasas = dict(tasas)
+        self._cache: Dict[str, float] = {}
+
+    def _tasa(self, nombre: str) -> float:
+        tasa = self._cache.get(nombre)
+        if tasa is None:
+            tasa = 1.0
+            for prefijo in sorted(self.tasas, key=len, reverse=True):
+                if nombre == prefijo or nombre.startswith(prefijo + "."):
+                    tasa = self.tasas[prefijo]
+                    break
+            self._cache[nombre] = tasa
+        return tasa
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        tasa = self._tasa(record.name)
+        if tasa >= 1:
+            return True
+        if random.random() < tasa:
+            record.muestreo = tasa
+            return True
+        return False
+
+
+class ColaHandler(QueueHandler):
+    """
+    QueueHandler que resuelve mensaje y excepción en el hilo que loguea (los
+    argumentos pueden cambiar después) pero los deja separados, para que el
+    formato JSON los emita en campos distintos.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class FormatoJSON(logging.Formatter):
+    """Un objeto JSON por línea, con los campos de contexto y `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        for campo, valor in record.__dict__.items():
+            if campo not in _CAMPOS_RECORD and valor is not None:
+                datos[campo] = valor
+        if record.exc_text:
+            datos["excepcion"] = record.exc_text
+        if record.stack_info:
+            datos["stack"] = record.stack_info
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def _formato(formato: str) -> logging.Formatter:
+    if formato == "auto":
+        formato = "color" if sys.stderr.isatty() else "json"
+    if formato == "color":
+        return colorlog.ColoredFormatter(
+            "%(log_color)s%(levelname)-8s%(reset)s %(asctime)s %(name)s [%(request_id)s] %(message)s",
+            defaults={"request_id": "-"},
+        )
+    return FormatoJSON()
+
+
+def configurar_logging(nivel: str, formato: str, muestreo: Mapping[str, float]) -> None:
+    """
+    Configura el logging del proceso (idempotente): todos los loggers,
+    incluidos los de uvicorn, escriben en una cola en memoria y un hilo
+    (QueueListener) hace la escritura a stderr, de modo que loguear nunca
+    bloquea el event loop con I/O de consola. stdout queda libre para la
+    salida de los scripts que importan la app (p. ej. el trabajador de
+    `benchmark_drivers`, que entrega su resultado en la última línea).
+
+    `formato`: "json" (una línea por registro), "color" (consola de
+    desarrollo) o "auto" (color si stderr es una terminal).
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    salida = logging.StreamHandler(sys.stderr)
+    salida.setFormatter(_formato(formato))
+
+    cola: queue.SimpleQueue = queue.SimpleQueue()
+    handler = ColaHandler(cola)
+    handler.addFilter(FiltroMuestreo(muestreo))
+    handler.addFilter(FiltroContexto())
+
+    raiz = logging.getLogger()
+    raiz.handlers = [handler]
+    raiz.setLevel(nivel.upper())
+    # uvicorn instala sus propios handlers, que escriben directo a la consola.
+    for nombre in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logger_uvicorn = logging.getLogger(nombre)
+        logger_uvicorn.handlers = []
+        logger_uvicorn.propagate = True
+
+    _listener = QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+    atexit.register(detener_logging)
+
+
+def detener_logging() -> None:
+    """Vacía la cola y detiene el hilo de escritura."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _request_id(scope) -> str:
+    for nombre, valor in scope.get("headers", ()):
+        if nombre == ENCABEZADO_REQUEST_ID.encode():
+            valor = valor.decode("latin-1").strip()
+            if valor and len(valor) <= 128 and valor.isprintable():
+                return valor
+    return uuid.uuid4().hex
+
+
+class MiddlewareContextoLog:
+    """
+    Middleware ASGI: abre el contexto de log de cada solicitud (request_id
+    recibido en X-Request-ID o generado, y devuelto en la respuesta) y emite
+    un registro por solicitud en `app.solicitudes` con ruta, estado,
+    latencia y sentencias SQL. Las solicitudes con error o más lentas que
+    `umbral_lenta_ms` se emiten como WARNING/ERROR, fuera del muestreo.
+    Los streams SSE (`text/event-stream`) duran lo que el cliente siga
+    conectado, así que no se comparan con el umbral.
+    """
+
+    def __init__(self, app, umbral_lenta_ms: float):
+        self.app = app
+        self.umbral_lenta_ms = umbral_lenta_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope)
+        contexto = {"request_id": request_id, "metodo": scope["method"], "ruta": scope["path"]}
+        token = _contexto.set(contexto)
+        estado = {"codigo": 500, "sse": False}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+                estado["sse"] = es_respuesta_sse(mensaje)
+                mensaje["headers"] = [
+                    *mensaje.get("headers", ()),
+                    (ENCABEZADO_REQUEST_ID.encode(), request_id.encode()),
+                ]
+            await send(mensaje)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            route = scope.get("route")
+            if route is not None:
+                contexto["ruta"] = route.path
+            codigo = estado["codigo"]
+            if codigo >= 500:
+                nivel = logging.ERROR
+            elif duracion_ms >= self.umbral_lenta_ms and not estado["sse"]:
+                nivel = logging.WARNING
+            else:
+                nivel = logging.INFO
+            log_solicitudes.log(
+                nivel,
+                "%s %s %d %.1f ms",
+                scope["method"], contexto["ruta"], codigo, duracion_ms,
+                extra={
+                    "estado": codigo,
+                    "duracion_ms": round(duracion_ms, 1),
+                    "sql_sentencias": contexto.get("sql_sentencias"),
+                    "sql_ms": contexto.get("sql_ms"),
+                },
+            )
+            _contexto.reset(token)
@@ -0,0 +1,223 @@
+# app/utils/memoria.py
+
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.utils.eventos import es_respuesta_sse
+
+# Asignaciones del propio tracemalloc y del sistema de imports: ruido en los snapshots.
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class MemoriaRuta:
+    """Pico de memoria asignada durante las solicitudes de una ruta."""
+    solicitudes: int = 0
+    # Solicitudes medidas: las que corrieron sin otra solicitud en curso.
+    medidas: int = 0
+    pico_max: int = 0
+    pico_total: int = 0
+
+
+class RastreadorMemoria:
+    """
+    Seguimiento de memoria con tracemalloc: snapshots con diff contra una
+    base y pico de memoria por ruta.
+
+    El pico de tracemalloc es global al proceso, así que sólo se atribuye a
+    una ruta cuando la solicitud corrió sola (sin otra en curso); las
+    solapadas se cuentan pero no se miden. Con tráfico real las mediciones
+    se acumulan igual en los momentos de menos carga. Los streams SSE no
+    cuentan como solicitudes en curso (ver `conexion_larga`): si no, una
+    terminal suscrita impediría medir cualquier otra solicitud.
+    """
+
+    def __init__(self):
+        self._rutas: Dict[str, MemoriaRuta] = {}
+        self._base: Optional[tracemalloc.Snapshot] = None
+        self._en_curso = 0
+        # Solicitud que reinició el pico; las que empiecen después no se miden.
+        self._medicion: Optional[int] = None
+        self._secuencia = 0
+
+    @property
+    def activo(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def iniciar(self, frames: int) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def detener(self) -> None:
+        tracemalloc.stop()
+        self._base = None
+
+    # --- pico por ruta -------------------------------------------------
+
+    def inicio_solicitud(self) -> Optional[int]:
+        """Retorna un identificador de medición si la solicitud corre sola."""
+        self._en_curso += 1
+        if not tracemalloc.is_tracing():
+            return None
+        if self._en_curso == 1:
+            self._secuencia += 1
+            self._medicion = self._secuencia
+            tracemalloc.reset_peak()
+            return self._medicion
+        # Otra solicitud empezó mientras corría la medida: deja de ser exclusiva.
+        self._medicion = None
+        return None
+
+    def conexion_larga(self, medicion: Optional[int]) -> None:
+        """
+        La solicitud respondió con un stream (SSE) que dura lo que el cliente
+        siga conectado: deja de contar como en curso desde ya, no se mide y
+        no debe llamar a `fin_solicitud`.
+        """
+        self._en_curso -= 1
+        if medicion is not None and medicion == self._medicion:
+            self._medicion = None
+
+    def fin_solicitud(self, ruta: str, medicion: Optional[int], inicio: int) -> None:
+        self._en_curso -= 1
+        if not tracemalloc.is_tracing():
+            return
+        datos = self._rutas.setdefault(ruta, MemoriaRuta())
+        datos.solicitudes += 1
+        if medicion is not None and medicion == self._medicion and tracemalloc.is_tracing():
+            _, pico = tracemalloc.get_traced_memory()
+            pico = max(pico - inicio, 0)
+            datos.medidas += 1
+            datos.pico_max = max(datos.pico_max, pico)
+            datos.pico_total += pico
+        if medicion == self._medicion:
+            self._medicion = None
+
+    def rutas(self) -> List[Dict[str, Any]]:
+        """
+        Rutas ordenadas por pico máximo, de mayor a menor. `solicitudes`
+        cuenta todas; los picos salen sólo de las `medidas`, las que
+        corrieron solas. Los streams SSE no aparecen.
+        """
+        return sorted(
+            (
+                {
+                    "ruta": ruta,
+                    "solicitudes": d.solicitudes,
+                    "medidas": d.medidas,
+                    "pico_max_kb": round(d.pico_max / 1024, 1),
+                    "pico_promedio_kb": round(d.pico_total / d.medidas / 1024, 1) if d.medidas else 0.0,
+                }
+                for ruta, d in self._rutas.items()
+            ),
+            key=lambda r: r["pico_max_kb"],
+            reverse=True,
+        )
+
+    def reiniciar_rutas(self) -> None:
+        self._rutas.clear()
+
+    # --- snapshots -----------------------------------------------------
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc no está activo (memoria.activo o POST /admin/memoria/iniciar)")
+        return tracemalloc.take_snapshot().filter_traces(_FILTROS)
+
+    def _totales(self) -> Dict[str, float]:
+        actual, pico = tracemalloc.get_traced_memory()
+        return {"actual_kb": round(actual / 1024, 1), "pico_kb": round(pico / 1024, 1)}
+
+    def snapshot(self, agrupar: str, limite: int) -> Dict[str, Any]:
+        """Mayores asignaciones vivas; el snapshot queda como base del diff."""
+        self._base = self._snapshot()
+        estadisticas = self._base.statistics(agrupar)[:limite]
+        return {
+            **self._totales(),
+            "estadisticas": [
+                {
+                    "ubicacion": _ubicacion(e.traceback, agrupar),
+                    "tamano_kb": round(e.size / 1024, 1),
+                    "bloques": e.count,
+                }
+                for e in estadisticas
+            ],
+        }
+
+    def diff(self, agrupar: str, limite: int, actualizar_base: bool) -> Dict[str, Any]:
+        """Diferencia contra el último snapshot base (crecimiento desde entonces)."""
+        if self._base is None:
+            raise RuntimeError("No hay snapshot base: tome uno con GET /admin/memoria/snapshot")
+        actual = self._snapshot()
+        estadisticas = actual.compare_to(self._base, agrupar)[:limite]
+        if actualizar_base:
+            self._base = actual
+        return {
+            **self._totales(),
+            "estadisticas": [
+                {
+                    "ubicacion": _ubicacion(e.traceback, agrupar),
+                    "tamano_kb": round(e.size / 1024, 1),
+                    "bloques": e.count,
+                    "diferencia_kb": round(e.size_diff / 1024, 1),
+                    "diferencia_bloques": e.count_diff,
+                }
+                for e in estadisticas
+            ],
+        }
+
+
+def _ubicacion(traza: tracemalloc.Traceback, agrupar: str) -> str:
+    if agrupar == "traceback":
+        # Del frame más externo al que asignó.
+        return " -> ".join(f"{f.filename}:{f.lineno}" for f in traza)
+    frame = traza[0]
+    return frame.filename if agrupar == "filename" else f"{frame.filename}:{frame.lineno}"
+
+
+rastreador_memoria = RastreadorMemoria()
+
+
+class MiddlewareMemoria:
+    """
+    Middleware ASGI que registra el pico de memoria asignada de cada
+    solicitud por ruta (plantilla de la ruta, no la URL).
+
+    Cuenta las solicitudes en curso aunque tracemalloc esté inactivo: al
+    activarlo, las que ya estaban corriendo deben impedir que la siguiente
+    se mida como si corriera sola. Una respuesta `text/event-stream` sale
+    de la cuenta en cuanto empieza (`conexion_larga`).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sse = False
+
+        async def enviar(mensaje):
+            nonlocal sse
+            if mensaje["type"] == "http.response.start" and es_respuesta_sse(mensaje):
+                sse = True
+                rastreador_memoria.conexion_larga(medicion)
+            await send(mensaje)
+
+        inicio, _ = tracemalloc.get_traced_memory()
+        medicion = rastreador_memoria.inicio_solicitud()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            if not sse:
+                route = scope.get("route")
+                ruta = f'{scope["method"]} {getattr(route, "path", None) or "sin_ruta"}'
+                rastreador_memoria.fin_solicitud(ruta, medicion, inicio)
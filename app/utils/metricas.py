@@ -0,0 +1,281 @@
+# app/utils/metricas.py
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.admision import admision_reportes
+from app.utils.database.db_connector import engine, read_engine, report_engine, report_engine_primario
+from app.utils.database.pool import estadisticas_pool
+from app.utils.database.transacciones import estadisticas_reintento
+from app.utils.eventos import es_respuesta_sse
+
+# Límites (segundos) de los histogramas de latencia.
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Etiquetas = Tuple[Tuple[str, str], ...]
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formato_etiquetas(etiquetas: Etiquetas) -> str:
+    if not etiquetas:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in etiquetas) + "}"
+
+
+class Contador:
+    """
+    Contador monótono con etiquetas.
+
+    Sin locks: sólo se incrementa desde el event loop (un hilo), donde un
+    `+=` sobre el dict no se intercala con otro.
+    """
+
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self._valores: Dict[Etiquetas, float] = defaultdict(float)
+
+    def inc(self, valor: float = 1, **etiquetas: str) -> None:
+        self._valores[tuple(sorted(etiquetas.items()))] += valor
+
+    def muestras(self) -> Iterable[Tuple[str, Etiquetas, float]]:
+        for etiquetas, valor in self._valores.items():
+            yield self.nombre, etiquetas, valor
+
+
+class Gauge(Contador):
+    """Valor que sube y baja."""
+
+    tipo = "gauge"
+
+    def dec(self, valor: float = 1, **etiquetas: str) -> None:
+        self.inc(-valor, **etiquetas)
+
+    def fijar(self, valor: float, **etiquetas: str) -> None:
+        self._valores[tuple(sorted(etiquetas.items()))] = valor
+
+
+class Histograma:
+    """Histograma acumulado por etiquetas con buckets fijos."""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, buckets: Sequence[float] = BUCKETS_LATENCIA):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.buckets = tuple(buckets)
+        # etiquetas -> [conteos por bucket (no acumulados) + inf, suma]
+        self._series: Dict[Etiquetas, List] = {}
+
+    def observar(self, valor: float, **etiquetas: str) -> None:
+        clave = tuple(sorted(etiquetas.items()))
+        serie = self._series.get(clave)
+        if serie is None:
+            serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0]
+        serie[0][bisect_left(self.buckets, valor)] += 1
+        serie[1] += valor
+
+    def muestras(self) -> Iterable[Tuple[str, Etiquetas, float]]:
+        for etiquetas, (conteos, suma) in self._series.items():
+            acumulado = 0
+            for limite, conteo in zip((*self.buckets, float("inf")), conteos):
+                acumulado += conteo
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                yield f"{self.nombre}_bucket", (*etiquetas, ("le", le)), acumulado
+            yield f"{self.nombre}_sum", etiquetas, suma
+            yield f"{self.nombre}_count", etiquetas, acumulado
+
+
+class Registro:
+    """Métricas del proceso y recolectores que se evalúan en cada lectura."""
+
+    def __init__(self):
+        self._metricas: List = []
+        self._recolectores: List[Callable[[], Iterable[Tuple[str, str, str, Etiquetas, float]]]] = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def contador(self, nombre: str, ayuda: str) -> Contador:
+        return self.registrar(Contador(nombre, ayuda))
+
+    def gauge(self, nombre: str, ayuda: str) -> Gauge:
+        return self.registrar(Gauge(nombre, ayuda))
+
+    def histograma(self, nombre: str, ayuda: str, buckets: Sequence[float] = BUCKETS_LATENCIA) -> Histograma:
+        return self.registrar(Histograma(nombre, ayuda, buckets))
+
+    def recolector(self, funcion):
+        """
+        Registra una función que retorna (nombre, tipo, ayuda, etiquetas, valor)
+        calculados al momento de la lectura (p. ej. estado del pool).
+        """
+        self._recolectores.append(funcion)
+        return funcion
+
+    def exponer(self) -> str:
+        """Formato de texto de Prometheus (0.0.4)."""
+        lineas: List[str] = []
+        for m in self._metricas:
+            lineas.append(f"# HELP {m.nombre} {m.ayuda}")
+            lineas.append(f"# TYPE {m.nombre} {m.tipo}")
+            for nombre, etiquetas, valor in m.muestras():
+                lineas.append(f"{nombre}{_formato_etiquetas(etiquetas)} {valor}")
+        # Las muestras de una métrica deben quedar juntas bajo su HELP/TYPE.
+        familias: Dict[str, Tuple[str, str, List[str]]] = {}
+        for recolector in self._recolectores:
+            for nombre, tipo, ayuda, etiquetas, valor in recolector():
+                familia = familias.setdefault(nombre, (tipo, ayuda, []))
+                familia[2].append(f"{nombre}{_formato_etiquetas(etiquetas)} {valor}")
+        for nombre, (tipo, ayuda, muestras) in familias.items():
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            lineas.extend(muestras)
+        return "\n".join(lineas) + "\n"
+
+
+registro = Registro()
+
+solicitudes_http = registro.contador(
+    "http_solicitudes_total", "Solicitudes HTTP atendidas por método, ruta y estado"
+)
+duracion_http = registro.histograma(
+    "http_duracion_segundos", "Latencia de las solicitudes HTTP por método y ruta"
+)
+en_curso_http = registro.gauge("http_solicitudes_en_curso", "Solicitudes HTTP en curso")
+conexiones_sse = registro.gauge("http_sse_conexiones_abiertas", "Conexiones SSE abiertas")
+cache_sql = registro.contador(
+    "sqlalchemy_cache_compilacion_total",
+    "Sentencias por resultado de la caché de compilación de SQLAlchemy",
+)
+ventas_registradas = registro.contador(
+    "ventas_registradas_total", "Ventas registradas por origen (directa, agrupada, offline)"
+)
+pagos_registrados = registro.contador("pagos_registrados_total", "Pagos registrados por tipo (venta/compra)")
+idempotencia_solicitudes = registro.contador(
+    "idempotencia_solicitudes_total",
+    "Solicitudes con Idempotency-Key por resultado (nueva, repetida, conflicto, distinta)",
+)
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI (sin BaseHTTPMiddleware, para no agregar una tarea por
+    solicitud) que mide latencia, estado y solicitudes en curso por ruta.
+
+    La ruta es la plantilla (`/ventas/{venta_id}`), no la URL, para que la
+    cardinalidad de las etiquetas no crezca con los IDs.
+
+    Las respuestas SSE (`text/event-stream`) duran lo que el cliente siga
+    conectado: al abrirse pasan de `http_solicitudes_en_curso` a
+    `http_sse_conexiones_abiertas` y no se observan en el histograma de
+    latencia.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = {"codigo": 500, "sse": False}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+                if es_respuesta_sse(mensaje):
+                    estado["sse"] = True
+                    en_curso_http.dec()
+                    conexiones_sse.inc()
+            await send(mensaje)
+
+        en_curso_http.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracion = time.perf_counter() - inicio
+            if estado["sse"]:
+                conexiones_sse.dec()
+            else:
+                en_curso_http.dec()
+            route = scope.get("route")
+            ruta = getattr(route, "path", None) or "sin_ruta"
+            metodo = scope["method"]
+            solicitudes_http.inc(metodo=metodo, ruta=ruta, estado=str(estado["codigo"]))
+            if not estado["sse"]:
+                duracion_http.observar(duracion, metodo=metodo, ruta=ruta)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        # CACHE_HIT, CACHE_MISS, CACHING_DISABLED, NO_CACHE_KEY o NO_DIALECT_SUPPORT.
+        resultado = getattr(context, "cache_hit", None)
+        cache_sql.inc(resultado=getattr(resultado, "name", "desconocido").lower())
+
+
+def instalar_metricas_sql() -> None:
+    """Registra el conteo de aciertos de la caché de compilación (idempotente)."""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@registro.recolector
+def _recolectar_base_datos():
+    """Pools, reintentos de transacción y control de admisión, al momento de leer."""
+    pools = {"oltp": engine, "reportes": report_engine}
+    if read_engine is not engine:
+        pools["lectura"] = read_engine
+    if report_engine_primario is not report_engine:
+        pools["reportes_primario"] = report_engine_primario
+    campos = {
+        "en_uso": ("db_pool_conexiones_en_uso", "gauge", "Conexiones del pool en uso"),
+        "libres": ("db_pool_conexiones_libres", "gauge", "Conexiones abiertas libres en el pool"),
+        "overflow": ("db_pool_overflow", "gauge", "Conexiones abiertas por encima del tamaño del pool"),
+        "tamano": ("db_pool_tamano", "gauge", "Tamaño configurado del pool"),
+        "adquisiciones": ("db_pool_checkouts_total", "counter", "Checkouts de conexiones"),
+        "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts que agotaron pool_timeout"),
+        "espera_max_ms": ("db_pool_espera_max_ms", "gauge", "Mayor espera por una conexión (ms)"),
+    }
+    for nombre_pool, motor in pools.items():
+        datos = estadisticas_pool(motor)
+        for campo, (nombre, tipo, ayuda) in campos.items():
+            if campo in datos:
+                yield nombre, tipo, ayuda, (("pool", nombre_pool),), datos[campo]
+
+    for motivo, valor in estadisticas_reintento().items():
+        yield (
+            "db_transacciones_reintento_total", "counter",
+            "Eventos de reintento de transacciones (deadlocks, serializacion, reintentos, agotados)",
+            (("evento", motivo),), valor,
+        )
+
+    admision = admision_reportes.estadisticas()
+    clase = (("clase", admision_reportes.nombre),)
+    yield "admision_en_curso", "gauge", "Solicitudes admitidas en curso", clase, admision["en_curso"]
+    yield "admision_en_cola", "gauge", "Solicitudes esperando admisión", clase, admision["en_cola"]
+    yield "admision_rechazadas_total", "counter", "Solicitudes rechazadas con 429", clase, admision["rechazadas"]
+
+    totales: Dict[str, float] = defaultdict(float)
+    for _, etiquetas, valor in cache_sql.muestras():
+        totales[dict(etiquetas)["resultado"]] += valor
+    consultas = totales["cache_hit"] + totales["cache_miss"]
+    if consultas:
+        yield (
+            "sqlalchemy_cache_compilacion_ratio", "gauge",
+            "Proporción de aciertos de la caché de compilación de SQLAlchemy",
+            (), round(totales["cache_hit"] / consultas, 4),
+        )
@@ -0,0 +1,150 @@
+# app/utils/perfilador.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+import greenlet
+
+from app.utils.database.db_connector import settings
+
+# Raíz del proyecto, para acortar las rutas de archivo en las pilas.
+_RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _etiqueta(frame) -> str:
+    archivo = frame.f_code.co_filename
+    if archivo.startswith(_RAIZ):
+        archivo = os.path.relpath(archivo, _RAIZ)
+    else:
+        archivo = os.path.basename(archivo)
+    nombre = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+    # ';' separa frames y ' ' separa la pila del conteo en el formato colapsado.
+    return f"{archivo}:{nombre}".replace(";", ":").replace(" ", "_")
+
+
+# Greenlet en curso de cada hilo rastreado (ver `PerfiladorMuestreo.muestrear_loop`).
+_greenlet_actual: Dict[int, greenlet.greenlet] = {}
+
+
+def _al_cambiar_greenlet(evento: str, args) -> None:
+    if evento in ("switch", "throw"):
+        _, destino = args
+        _greenlet_actual[threading.get_ident()] = destino
+
+
+def _pila(frame, hilo_id: Optional[int] = None) -> str:
+    """
+    Pila colapsada de `frame`. Si el hilo está dentro de un greenlet hijo
+    (las sentencias de SQLAlchemy async corren en uno), se agrega la pila
+    del greenlet padre, donde están el handler y el servicio que esperan la
+    sentencia; como en `consultas_lentas._frames`, pero para otro hilo.
+    """
+    etiquetas = []
+    while frame is not None:
+        etiquetas.append(_etiqueta(frame))
+        frame = frame.f_back
+    actual = _greenlet_actual.get(hilo_id)
+    padre = actual.parent if actual is not None else None
+    frame = padre.gr_frame if padre is not None else None
+    while frame is not None:
+        etiquetas.append(_etiqueta(frame))
+        frame = frame.f_back
+    return ";".join(reversed(etiquetas))
+
+
+class PerfiladorMuestreo:
+    """
+    Perfilador por muestreo para el proceso en ejecución: un hilo aparte lee
+    `sys._current_frames()` cada `intervalo` segundos y cuenta las pilas.
+
+    No instrumenta llamadas (a diferencia de cProfile), así que el costo es
+    el de tomar la pila unas cientos de veces por segundo y no depende de
+    cuánto código se ejecute. Sólo un perfil a la vez por proceso.
+    """
+
+    def __init__(self, max_segundos: float):
+        self.max_segundos = max_segundos
+        self._lock = threading.Lock()
+
+    @property
+    def ocupado(self) -> bool:
+        return self._lock.locked()
+
+    def muestrear(
+        self,
+        segundos: float,
+        intervalo: float,
+        hilo_id: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Muestrea durante `segundos` (bloqueante: correr en un hilo). Con
+        `hilo_id` sólo se cuenta ese hilo (p. ej. el del event loop); si no,
+        todos menos el propio. Retorna {pila colapsada: muestras}.
+
+        Lanza RuntimeError si ya hay un perfil en curso.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Ya hay un perfil en curso en este proceso")
+        try:
+            return self._muestrear(segundos, intervalo, hilo_id)
+        finally:
+            self._lock.release()
+
+    async def muestrear_loop(
+        self,
+        segundos: float,
+        intervalo: float,
+        solo_loop: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Como `muestrear`, llamado desde el event loop sin bloquearlo (el
+        muestreo corre en otro hilo). Mientras dura, registra los cambios de
+        greenlet del hilo del loop para que las pilas tomadas dentro de una
+        sentencia SQL incluyan la del handler que la espera. Con `solo_loop`
+        sólo se muestrea el hilo del loop.
+
+        Lanza RuntimeError si ya hay un perfil en curso.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Ya hay un perfil en curso en este proceso")
+        hilo_loop = threading.get_ident()
+        anterior = greenlet.settrace(_al_cambiar_greenlet)
+        _greenlet_actual[hilo_loop] = greenlet.getcurrent()
+        try:
+            return await asyncio.to_thread(
+                self._muestrear, segundos, intervalo, hilo_loop if solo_loop else None
+            )
+        finally:
+            greenlet.settrace(anterior)
+            _greenlet_actual.pop(hilo_loop, None)
+            self._lock.release()
+
+    def _muestrear(self, segundos: float, intervalo: float, hilo_id: Optional[int]) -> Dict[str, int]:
+        propio = threading.get_ident()
+        nombres = {t.ident: t.name for t in threading.enumerate()}
+        pilas: Counter = Counter()
+        fin = time.monotonic() + min(segundos, self.max_segundos)
+        while time.monotonic() < fin:
+            for ident, frame in sys._current_frames().items():
+                if ident == propio or (hilo_id is not None and ident != hilo_id):
+                    continue
+                hilo = nombres.get(ident, str(ident)).replace(" ", "_").replace(";", ":")
+                pilas[f"{hilo};{_pila(frame, ident)}"] += 1
+            time.sleep(intervalo)
+        return dict(pilas)
+
+
+def formato_colapsado(pilas: Dict[str, int]) -> str:
+    """Formato 'folded' de flamegraph.pl / speedscope / inferno: `a;b;c N`."""
+    return "".join(
+        f"{pila} {muestras}\n"
+        for pila, muestras in sorted(pilas.items(), key=lambda p: p[1], reverse=True)
+    )
+
+
+perfilador = PerfiladorMuestreo(max_segundos=settings.get("perfilador.max_segundos", 60))
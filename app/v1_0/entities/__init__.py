@@ -10,13 +10,47 @@ from .detalle_utilidadesDTO import DetalleUtilidadDTO
 from .detalle_ventaDTO import DetalleVentaDTO, DetalleVentaViewDTO
 from .gastoDTO import GastoDTO
 from .inversionDTO import InversionDTO
-from .productoDTO import ProductoDTO, ProductoListDTO, ProductosPageDTO
+from .productoDTO import (
+    ProductoDTO,
+    ProductoListDTO,
+    ProductosPageDTO,
+    ProductoUpsertResultadoDTO,
+    AjustePrecioItemDTO,
+    AjustePreciosResultadoDTO,
+    AjusteInventarioDTO,
+    ConteoInventarioResultadoDTO,
+    ProductoBajoStockDTO,
+)
 from .proveedorDTO import ProveedorDTO,ProveedoresPageDTO,ProveedorListDTO
 from .transaccionDTO import TransaccionDTO, TransaccionListDTO, TransaccionPageDTO, TransaccionResponseDTO
 from .utilidadDTO import UtilidadDTO, UtilidadListDTO, UtilidadPageDTO
-from .ventaDTO import VentaDTO, VentaListDTO, VentasPageDTO
+from .ventaDTO import (
+    VentaDTO,
+    VentaListDTO,
+    VentasPageDTO,
+    ResultadoSincronizacionDTO,
+    SincronizacionVentasDTO,
+)
 from .userDTO import UserDTO
 from .estadoDTO import EstadoDTO
+from .carteraDTO import (
+    CarteraClienteDTO,
+    CarteraClientesDTO,
+    CarteraProveedorDTO,
+    CarteraProveedoresDTO,
+    PagoCompraHistorialDTO,
+    CompraPendienteDTO,
+    CarteraProveedorDetalleDTO,
+)
+from .importacionDTO import ImportacionResultadoDTO, RechazoImportacionDTO
+from .kardexDTO import MovimientoKardexDTO, KardexProductoDTO, StockAFechaDTO, CierreKardexDTO
+from .adminDTO import (
+    EstadoPoolDTO,
+    ConsultaLentaDTO,
+    EstadisticaMemoriaDTO,
+    SnapshotMemoriaDTO,
+    MemoriaRutaDTO,
+)
 
 __all__ = [
     "BancoDTO",
@@ -43,8 +77,16 @@ __all__ = [
     "ProveedorListDTO",
     "ProductoListDTO",
     "ProductosPageDTO",
+    "ProductoUpsertResultadoDTO",
+    "AjustePrecioItemDTO",
+    "AjustePreciosResultadoDTO",
+    "AjusteInventarioDTO",
+    "ConteoInventarioResultadoDTO",
+    "ProductoBajoStockDTO",
     "VentaListDTO", 
     "VentasPageDTO",
+    "ResultadoSincronizacionDTO",
+    "SincronizacionVentasDTO",
     "EstadoDTO",
     "DetalleVentaViewDTO",
     "PagoResponseDTO",
@@ -53,5 +95,23 @@ __all__ = [
     "UtilidadPageDTO",
     "TransaccionListDTO", 
     "TransaccionPageDTO",
-    "TransaccionResponseDTO"
-]
\ No newline at end of file
+    "TransaccionResponseDTO",
+    "CarteraClienteDTO",
+    "CarteraClientesDTO",
+    "CarteraProveedorDTO",
+    "CarteraProveedoresDTO",
+    "PagoCompraHistorialDTO",
+    "CompraPendienteDTO",
+    "CarteraProveedorDetalleDTO",
+    "ImportacionResultadoDTO",
+    "RechazoImportacionDTO",
+    "MovimientoKardexDTO",
+    "KardexProductoDTO",
+    "StockAFechaDTO",
+    "CierreKardexDTO",
+    "EstadoPoolDTO",
+    "ConsultaLentaDTO",
+    "EstadisticaMemoriaDTO",
+    "SnapshotMemoriaDTO",
+    "MemoriaRutaDTO",
+]
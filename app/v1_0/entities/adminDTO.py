@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class EstadoPoolDTO:
+    """Estado del pool de conexiones y contadores de reintentos de transacción."""
+    perfil: str
+    tamano: int
+    en_uso: int
+    libres: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    adquisiciones: int = 0
+    espera_promedio_ms: float = 0.0
+    espera_max_ms: float = 0.0
+    timeouts: int = 0
+    reintentos: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class ConsultaLentaDTO:
+    """Sentencia lenta registrada: parámetros redactados y plan (si se muestreó)."""
+    fecha: datetime
+    duracion_ms: float
+    sentencia: str
+    parametros: Any
+    origen: str
+    plan: Optional[Any] = None
+
+
+@dataclass
+class EstadisticaMemoriaDTO:
+    """Memoria viva asignada en una ubicación (y su crecimiento, en un diff)."""
+    ubicacion: str
+    tamano_kb: float
+    bloques: int
+    diferencia_kb: Optional[float] = None
+    diferencia_bloques: Optional[int] = None
+
+
+@dataclass
+class SnapshotMemoriaDTO:
+    """Memoria rastreada por tracemalloc y mayores asignaciones."""
+    actual_kb: float
+    pico_kb: float
+    estadisticas: List[EstadisticaMemoriaDTO]
+
+
+@dataclass
+class MemoriaRutaDTO:
+    """Pico de memoria por ruta (sólo solicitudes que corrieron solas)."""
+    ruta: str
+    solicitudes: int
+    medidas: int
+    pico_max_kb: float
+    pico_promedio_kb: float
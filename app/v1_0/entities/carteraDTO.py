@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+
+@dataclass
+class CarteraClienteDTO:
+    """Saldo pendiente de un cliente agrupado por edad de sus ventas a crédito."""
+    cliente_id: int
+    cliente: str
+    ventas_abiertas: int
+    dias_0_30: float
+    dias_31_60: float
+    dias_61_90: float
+    dias_mas_90: float
+    total: float
+
+
+@dataclass
+class CarteraClientesDTO:
+    """Reporte de cuentas por cobrar por edades a una fecha de corte."""
+    fecha_corte: datetime
+    items: List[CarteraClienteDTO]
+    dias_0_30: float
+    dias_31_60: float
+    dias_61_90: float
+    dias_mas_90: float
+    total: float
+
+
+@dataclass
+class CarteraProveedorDTO:
+    """Saldo pendiente con un proveedor agrupado por edad de sus compras a crédito."""
+    proveedor_id: int
+    proveedor: str
+    compras_abiertas: int
+    dias_0_30: float
+    dias_31_60: float
+    dias_61_90: float
+    dias_mas_90: float
+    total: float
+
+
+@dataclass
+class CarteraProveedoresDTO:
+    """Reporte de cuentas por pagar por edades a una fecha de corte."""
+    fecha_corte: datetime
+    items: List[CarteraProveedorDTO]
+    dias_0_30: float
+    dias_31_60: float
+    dias_61_90: float
+    dias_mas_90: float
+    total: float
+
+
+@dataclass
+class PagoCompraHistorialDTO:
+    """Pago realizado sobre una compra a crédito."""
+    id: int
+    banco: str
+    monto: float
+    fecha_creacion: datetime
+
+
+@dataclass
+class CompraPendienteDTO:
+    """Compra a crédito con saldo pendiente y su historial de pagos."""
+    id: int
+    fecha: datetime
+    dias: int
+    total: float
+    saldo: float
+    pagos: List[PagoCompraHistorialDTO]
+
+
+@dataclass
+class CarteraProveedorDetalleDTO:
+    """Detalle de las compras abiertas con un proveedor."""
+    proveedor_id: int
+    compras: List[CompraPendienteDTO]
+    total: float
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class RechazoImportacionDTO:
+    """Fila del archivo que no se pudo importar."""
+    linea: int
+    cc_nit: Optional[str]
+    motivo: str
+
+
+@dataclass
+class ImportacionResultadoDTO:
+    """Resumen de una importación masiva de clientes o proveedores."""
+    procesados: int
+    insertados: int
+    actualizados: int
+    rechazados: List[RechazoImportacionDTO] = field(default_factory=list)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class MovimientoKardexDTO:
+    """Movimiento de inventario con el saldo resultante del producto."""
+    id: int
+    fecha: datetime
+    tipo: str
+    documento_id: Optional[int]
+    cantidad: int
+    saldo: int
+
+
+@dataclass
+class KardexProductoDTO:
+    """Historial de movimientos de un producto en un rango de fechas."""
+    producto_id: int
+    referencia: str
+    desde: datetime
+    hasta: datetime
+    saldo_inicial: int
+    saldo_final: int
+    # Hay más movimientos en el rango que los retornados (ver `limite`).
+    truncado: bool
+    movimientos: List[MovimientoKardexDTO]
+
+
+@dataclass
+class StockAFechaDTO:
+    """Stock de un producto al cierre de una fecha."""
+    producto_id: int
+    fecha: datetime
+    cantidad: int
+
+
+@dataclass
+class CierreKardexDTO:
+    """Resultado de un punto de control del kardex."""
+    corte: datetime
+    iniciales: int
+    snapshots: int
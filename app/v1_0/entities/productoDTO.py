@@ -11,6 +11,7 @@ class ProductoDTO(BaseModel):
     precio_compra: float
     precio_venta: float
     activo: bool = True
+    stock_minimo: int = 0
     fecha_creacion: datetime = Field(default_factory=datetime.now)
 
 @dataclass
@@ -26,6 +27,7 @@ class ProductoListDTO:
     precio_venta: float
     activo: bool
     fecha_creacion: datetime
+    stock_minimo: int = 0
 
 @dataclass
 class ProductosPageDTO:
@@ -39,3 +41,67 @@ class ProductosPageDTO:
     total_pages: int
     has_next: bool
     has_prev: bool
+
+@dataclass
+class ProductoUpsertResultadoDTO:
+    """
+    Resumen de una carga masiva de productos por referencia.
+    """
+    insertados: int
+    actualizados: int
+
+@dataclass
+class AjustePrecioItemDTO:
+    """
+    Precio anterior y nuevo de un producto afectado por un ajuste masivo.
+    """
+    id: int
+    referencia: str
+    descripcion: str
+    precio_anterior: float
+    precio_nuevo: float
+
+@dataclass
+class AjustePreciosResultadoDTO:
+    """
+    Resultado de un ajuste masivo de precios (o su vista previa si aplicado=False).
+    """
+    campo: str
+    porcentaje: float
+    aplicado: bool
+    total: int
+    items: List[AjustePrecioItemDTO]
+
+@dataclass
+class AjusteInventarioDTO:
+    """
+    Ajuste de stock aplicado a un producto por un conteo físico.
+    """
+    producto_id: int
+    referencia: str
+    cantidad_anterior: int
+    cantidad_nueva: int
+    diferencia: int
+
+@dataclass
+class ConteoInventarioResultadoDTO:
+    """
+    Resultado de aplicar una hoja de conteo físico.
+    """
+    procesados: int
+    ajustados: int
+    sin_cambios: int
+    no_encontradas: List[str]
+    ajustes: List[AjusteInventarioDTO]
+
+@dataclass
+class ProductoBajoStockDTO:
+    """
+    Producto activo cuyo stock está en o por debajo de su punto de reorden.
+    """
+    id: int
+    referencia: str
+    descripcion: str
+    cantidad: int
+    stock_minimo: int
+    faltante: int
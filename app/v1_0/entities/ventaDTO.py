@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
+from uuid import UUID
 from pydantic import BaseModel
 
 
@@ -34,3 +35,19 @@ class VentasPageDTO:
     total_pages: int
     has_next: bool
     has_prev: bool
+
+
+@dataclass
+class ResultadoSincronizacionDTO:
+    uuid: UUID
+    estado: str  # "creada", "duplicada" o "rechazada"
+    venta_id: Optional[int] = None
+    motivo: Optional[str] = None
+
+
+@dataclass
+class SincronizacionVentasDTO:
+    creadas: int
+    duplicadas: int
+    rechazadas: int
+    resultados: List[ResultadoSincronizacionDTO]
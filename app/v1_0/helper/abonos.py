@@ -0,0 +1,41 @@
+from typing import Dict, List, Tuple
+
+
+def repartir_abono(
+    monto: float,
+    saldos: List[Tuple[int, float]]
+) -> Dict[int, float]:
+    """
+    Reparte un abono entre varios documentos (ventas o compras) con saldo
+    pendiente, en el orden recibido, hasta agotar el monto.
+
+    Args:
+        monto (float): Monto total a repartir; debe ser mayor que cero.
+        saldos (List[Tuple[int, float]]): Pares (documento_id, saldo pendiente)
+            en el orden en que deben cubrirse.
+
+    Returns:
+        Dict[int, float]: Monto aplicado a cada documento, sólo para los
+        documentos que reciben parte del abono (conserva el orden).
+
+    Raises:
+        ValueError: Si el monto es inválido o supera el saldo pendiente total.
+    """
+    if monto <= 0:
+        raise ValueError("El monto debe ser mayor que cero")
+
+    total_pendiente = sum(saldo for _, saldo in saldos)
+    if monto > round(total_pendiente, 2):
+        raise ValueError(
+            f"Monto superior al saldo pendiente total ({total_pendiente:.2f})"
+        )
+
+    abonos: Dict[int, float] = {}
+    restante = monto
+    for documento_id, saldo in saldos:
+        if restante <= 0:
+            break
+        aplicado = saldo if restante >= saldo else restante
+        abonos[documento_id] = aplicado
+        restante = round(restante - aplicado, 2)
+    return abonos
@@ -0,0 +1,155 @@
+"""
+Compara el rendimiento de los perfiles de base de datos (psycopg vs asyncpg,
+con o sin caché de sentencias preparadas) sobre los endpoints más usados:
+listado de productos y creación de ventas.
+
+Cada perfil de `database.perfiles` se mide en un proceso aparte (APP_ENV
+distinto), llamando a la aplicación en memoria, sin servidor HTTP de por
+medio, para que la diferencia medida sea la del driver y el pool.
+
+La creación de ventas escribe datos reales: usar una base de pruebas.
+
+Uso:
+    python -m app.v1_0.helper.benchmark_drivers local local_asyncpg
+    python -m app.v1_0.helper.benchmark_drivers produccion produccion_asyncpg \\
+        --venta 1 1 1 --producto 10 --solicitudes 2000 --concurrencia 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+PREFIJO = "/sales-api/v1"
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def _medir(cliente, metodo: str, ruta: str, cuerpo: Optional[Dict[str, Any]],
+                 solicitudes: int, concurrencia: int) -> Dict[str, Any]:
+    latencias: List[float] = []
+    errores = 0
+    pendientes = iter(range(solicitudes))
+
+    async def trabajador():
+        nonlocal errores
+        for _ in pendientes:
+            inicio = time.perf_counter()
+            respuesta = await cliente.request(metodo, ruta, json=cuerpo)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if respuesta.status_code >= 400:
+                errores += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+    return {
+        "solicitudes": solicitudes,
+        "rps": round(solicitudes / duracion, 1),
+        "p50_ms": round(statistics.median(latencias), 2),
+        "p95_ms": round(_percentil(latencias, 0.95), 2),
+        "p99_ms": round(_percentil(latencias, 0.99), 2),
+        "errores": errores,
+    }
+
+
+async def _trabajador(args: argparse.Namespace) -> Dict[str, Any]:
+    """Se ejecuta en el proceso hijo, con APP_ENV apuntando al perfil."""
+    import httpx
+    from app.main import app
+    from app.utils.database.db_connector import engine
+
+    escenarios = [("GET", f"{PREFIJO}/productos/?page=1", None)]
+    if args.venta:
+        cliente_id, banco_id, estado_id = args.venta
+        escenarios.append((
+            "POST",
+            f"{PREFIJO}/ventas/crear",
+            {
+                "cliente_id": cliente_id,
+                "banco_id": banco_id,
+                "estado_id": estado_id,
+                "carrito": [
+                    {"producto_id": args.producto, "cantidad": 1, "precio_producto": args.precio}
+                ],
+            },
+        ))
+
+    resultados: Dict[str, Any] = {"driver": engine.url.get_driver_name(), "escenarios": {}}
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as cliente:
+        for metodo, ruta, cuerpo in escenarios:
+            # Calentamiento: abre el pool y llena las cachés de sentencias.
+            await _medir(cliente, metodo, ruta, cuerpo, args.concurrencia * 2, args.concurrencia)
+            resultados["escenarios"][f"{metodo} {ruta}"] = await _medir(
+                cliente, metodo, ruta, cuerpo, args.solicitudes, args.concurrencia
+            )
+    await engine.dispose()
+    return resultados
+
+
+def _ejecutar_perfil(perfil: str, argv: List[str]) -> Dict[str, Any]:
+    proceso = subprocess.run(
+        [sys.executable, "-m", "app.v1_0.helper.benchmark_drivers", "--trabajador", *argv],
+        env={**os.environ, "APP_ENV": perfil},
+        capture_output=True,
+        text=True,
+    )
+    if proceso.returncode != 0:
+        lineas = proceso.stderr.strip().splitlines()
+        raise RuntimeError(f"Perfil {perfil}: {lineas[-1] if lineas else proceso.returncode}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de drivers/perfiles de base de datos.")
+    parser.add_argument("perfiles", nargs="*", help="Perfiles de database.perfiles a comparar")
+    parser.add_argument("--solicitudes", type=int, default=500)
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--venta", type=int, nargs=3, metavar=("CLIENTE", "BANCO", "ESTADO"),
+                        help="Incluye POST /ventas/crear con estos IDs")
+    parser.add_argument("--producto", type=int, default=1, help="Producto vendido en cada venta")
+    parser.add_argument("--precio", type=float, default=1000.0)
+    parser.add_argument("--trabajador", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.trabajador:
+        print(json.dumps(asyncio.run(_trabajador(args))))
+        return
+    if not args.perfiles:
+        parser.error("Indique al menos un perfil")
+
+    argv = [
+        "--solicitudes", str(args.solicitudes),
+        "--concurrencia", str(args.concurrencia),
+        "--producto", str(args.producto),
+        "--precio", str(args.precio),
+    ]
+    if args.venta:
+        argv += ["--venta", *map(str, args.venta)]
+    print(f"{'perfil':<20} {'driver':<9} {'escenario':<36} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}")
+    for perfil in args.perfiles:
+        try:
+            resultado = _ejecutar_perfil(perfil, argv)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            continue
+        for escenario, m in resultado["escenarios"].items():
+            print(
+                f"{perfil:<20} {resultado['driver']:<9} {escenario.replace(PREFIJO, ''):<36} "
+                f"{m['rps']:>8} {m['p50_ms']:>8} {m['p95_ms']:>8} {m['p99_ms']:>8} {m['errores']:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
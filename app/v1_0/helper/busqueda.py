@@ -0,0 +1,10 @@
+def escapar_like(texto: str, escape: str = "\\") -> str:
+    """
+    Escapa los comodines de LIKE (`%`, `_`) y el propio carácter de escape
+    para buscar `texto` de forma literal.
+    """
+    return (
+        texto.replace(escape, escape * 2)
+        .replace("%", f"{escape}%")
+        .replace("_", f"{escape}_")
+    )
@@ -0,0 +1,24 @@
+import csv
+import io
+from typing import Any, Iterable, Sequence
+
+
+def filas_a_csv(
+    encabezados: Sequence[str],
+    filas: Iterable[Sequence[Any]]
+) -> str:
+    """
+    Serializa filas a texto CSV (separado por comas, con encabezado).
+
+    Args:
+        encabezados (Sequence[str]): Nombres de las columnas.
+        filas (Iterable[Sequence[Any]]): Valores de cada fila, en el orden de los encabezados.
+
+    Returns:
+        str: Contenido CSV listo para enviarse como archivo.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(encabezados)
+    writer.writerows(filas)
+    return buffer.getvalue()
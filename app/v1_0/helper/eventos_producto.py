@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Iterable, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.utils.eventos import broker_productos
+from app.v1_0.models import Producto
+
+logger = logging.getLogger(__name__)
+
+# Clave en Session.info con los ids de producto modificados en la transacción.
+CLAVE_CAMBIOS = "productos_cambiados"
+
+# Ids confirmados pendientes de publicar. Un único publicador los consume en
+# orden: cada lectura es posterior a la anterior, así que un evento nunca
+# llega después de otro con un estado más nuevo del mismo producto.
+_pendientes: Set[int] = set()
+# Referencias fuertes a las tareas: el loop sólo guarda referencias débiles.
+_tareas: Set[asyncio.Task] = set()
+
+
+def marcar_productos(session, ids: Iterable[int]) -> None:
+    """
+    Registra productos modificados por sentencias masivas (UPDATE/INSERT
+    Core) que el seguimiento del ORM no ve. Acepta AsyncSession o Session.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(CLAVE_CAMBIOS, set()).update(ids)
+
+
+def _al_hacer_flush(session: Session, flush_context) -> None:
+    ids = {
+        obj.id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Producto) and obj.id is not None
+    }
+    if ids:
+        session.info.setdefault(CLAVE_CAMBIOS, set()).update(ids)
+
+
+def _al_confirmar(session: Session) -> None:
+    ids = session.info.pop(CLAVE_CAMBIOS, None)
+    if not ids or not broker_productos.suscriptores:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # Sin loop (scripts síncronos): no hay terminales suscritas.
+    _pendientes.update(ids)
+    if all(t.done() for t in _tareas):
+        tarea = loop.create_task(_publicador())
+        _tareas.add(tarea)
+        tarea.add_done_callback(_tareas.discard)
+
+
+def _al_revertir(session: Session) -> None:
+    session.info.pop(CLAVE_CAMBIOS, None)
+
+
+async def _publicador() -> None:
+    """Publica los ids pendientes, en tandas, hasta vaciarlos."""
+    while _pendientes:
+        ids = set(_pendientes)
+        _pendientes.clear()
+        try:
+            await _publicar(ids)
+        except Exception:
+            logger.exception("No se pudieron publicar los cambios de %d producto(s)", len(ids))
+
+
+async def _publicar(ids: Set[int]) -> None:
+    """
+    Lee el estado confirmado de los productos y publica un evento compacto
+    (id, cantidad, precio_venta, activo). Los ids que ya no existen se
+    publican como eliminados.
+    """
+    from app.utils.database import async_session
+
+    async with async_session() as db:
+        filas = (
+            await db.execute(
+                select(
+                    Producto.id,
+                    Producto.cantidad,
+                    Producto.precio_venta,
+                    Producto.activo,
+                ).where(Producto.id.in_(ids))
+            )
+        ).all()
+
+    cambios = [
+        {"id": f.id, "cantidad": f.cantidad, "precio_venta": f.precio_venta, "activo": f.activo}
+        for f in filas
+    ]
+    encontrados = {f.id for f in filas}
+    cambios.extend({"id": i, "eliminado": True} for i in sorted(ids - encontrados))
+    broker_productos.publicar(cambios)
+
+
+def instalar_eventos_producto() -> None:
+    """
+    Engancha la captura de cambios de producto a todas las sesiones: después
+    de cada flush acumula los ids tocados y, tras el commit, publica su
+    estado final a los suscriptores SSE. Un rollback descarta lo acumulado.
+    """
+    if event.contains(Session, "after_flush", _al_hacer_flush):
+        return
+    event.listen(Session, "after_flush", _al_hacer_flush)
+    event.listen(Session, "after_commit", _al_confirmar)
+    event.listen(Session, "after_rollback", _al_revertir)
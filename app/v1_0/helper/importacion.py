@@ -0,0 +1,112 @@
+import csv
+from itertools import islice
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, TextIO, Tuple, TypeVar
+
+from email_validator import validate_email, EmailNotValidError
+from starlette.concurrency import run_in_threadpool
+
+from app.v1_0.entities import RechazoImportacionDTO
+
+# Columnas aceptadas en el CSV de clientes/proveedores (encabezado obligatorio).
+COLUMNAS_TERCERO = ("cc_nit", "nombre", "direccion", "ciudad", "celular", "correo")
+COLUMNAS_OBLIGATORIAS = ("cc_nit", "nombre", "direccion", "ciudad")
+
+FilaTercero = Tuple[int, str, str, str, str, Optional[str], Optional[str]]
+T = TypeVar("T")
+
+# Filas que se leen y validan por cada salto al threadpool.
+TAMANO_LOTE_LECTURA = 1000
+
+
+def _limpiar(valor: Optional[str]) -> Optional[str]:
+    if valor is None:
+        return None
+    valor = valor.strip()
+    return valor or None
+
+
+class LectorTerceros:
+    """
+    Lee en streaming un CSV de clientes o proveedores y entrega filas
+    normalizadas con las mismas reglas de `crear_cliente`/`crear_proveedor`:
+    ciudad en mayúsculas y sin espacios, celular sólo dígitos y correo válido.
+
+    Las filas inválidas no se entregan; quedan en `rechazos` con su número de
+    línea. Cada fila entregada es (linea, cc_nit, nombre, direccion, ciudad,
+    celular, correo).
+    """
+
+    def __init__(self, archivo: TextIO):
+        self.archivo = archivo
+        self.procesados = 0
+        self.rechazos: List[RechazoImportacionDTO] = []
+
+    def __iter__(self) -> Iterator[FilaTercero]:
+        lector = csv.DictReader(self.archivo)
+        encabezados = {(h or "").strip().lower() for h in (lector.fieldnames or [])}
+        faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in encabezados]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+
+        for registro in lector:
+            self.procesados += 1
+            linea = lector.line_num
+            datos = {
+                (k or "").strip().lower(): v
+                for k, v in registro.items()
+                if isinstance(v, str)
+            }
+            try:
+                yield (linea, *self._normalizar(datos))
+            except ValueError as e:
+                self.rechazos.append(
+                    RechazoImportacionDTO(
+                        linea=linea,
+                        cc_nit=_limpiar(datos.get("cc_nit")),
+                        motivo=str(e),
+                    )
+                )
+
+    @staticmethod
+    def _normalizar(datos: dict) -> Tuple[str, str, str, str, Optional[str], Optional[str]]:
+        valores = {c: _limpiar(datos.get(c)) for c in COLUMNAS_TERCERO}
+
+        vacios = [c for c in COLUMNAS_OBLIGATORIAS if not valores[c]]
+        if vacios:
+            raise ValueError(f"Campos obligatorios vacíos: {', '.join(vacios)}")
+
+        celular = valores["celular"]
+        if celular and not celular.isdigit():
+            raise ValueError("El número de celular debe contener solo dígitos")
+
+        correo = valores["correo"]
+        if correo:
+            try:
+                correo = validate_email(correo, check_deliverability=False).normalized
+            except EmailNotValidError:
+                raise ValueError(f"Correo inválido: {correo}")
+
+        return (
+            valores["cc_nit"],
+            valores["nombre"],
+            valores["direccion"],
+            valores["ciudad"].upper(),
+            celular,
+            correo,
+        )
+
+
+async def leer_en_hilo(filas: Iterable[T], tamano_lote: int = TAMANO_LOTE_LECTURA) -> AsyncIterator[T]:
+    """
+    Consume `filas` en el threadpool, de a `tamano_lote`, y las entrega como
+    iterable asíncrono. La lectura del archivo subido (disco) y el parseo y
+    validación de cada fila no corren en el event loop, y sólo un lote queda
+    en memoria a la vez.
+    """
+    iterador = iter(filas)
+    while True:
+        lote = await run_in_threadpool(lambda: list(islice(iterador, tamano_lote)))
+        if not lote:
+            return
+        for fila in lote:
+            yield fila
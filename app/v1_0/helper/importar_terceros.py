@@ -0,0 +1,47 @@
+"""
+Importación masiva de clientes o proveedores desde la línea de comandos.
+
+Uso:
+    python -m app.v1_0.helper.importar_terceros clientes archivo.csv
+    python -m app.v1_0.helper.importar_terceros proveedores archivo.csv
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.app_containers import ApplicationContainer
+from app.utils.database import async_session
+
+
+async def importar(tipo: str, ruta: str) -> int:
+    api = ApplicationContainer().api_container
+    async with async_session() as db:
+        with open(ruta, encoding="utf-8-sig", newline="") as archivo:
+            if tipo == "clientes":
+                resultado = await api.cliente_service().importar_clientes(archivo, db)
+            else:
+                resultado = await api.proveedor_service().importar_proveedores(archivo, db)
+
+    print(
+        f"Procesados: {resultado.procesados} | Insertados: {resultado.insertados} | "
+        f"Actualizados: {resultado.actualizados} | Rechazados: {len(resultado.rechazados)}"
+    )
+    for rechazo in resultado.rechazados:
+        print(f"  línea {rechazo.linea} ({rechazo.cc_nit or '-'}): {rechazo.motivo}", file=sys.stderr)
+    return 1 if resultado.rechazados else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importa clientes o proveedores desde un CSV.")
+    parser.add_argument("tipo", choices=["clientes", "proveedores"])
+    parser.add_argument("archivo", help="Ruta del CSV (cc_nit, nombre, direccion, ciudad, celular, correo)")
+    args = parser.parse_args()
+    try:
+        sys.exit(asyncio.run(importar(args.tipo, args.archivo)))
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Aplica las migraciones SQL de `migraciones/` (NNN_nombre.sql) en orden.
+
+Cada archivo corre en su propia transacción y queda registrado en la tabla
+`migracion_aplicada`; los ya aplicados se omiten. Un advisory lock evita que
+dos procesos migren a la vez (p. ej. varios despliegues simultáneos).
+
+Uso:
+    python -m app.v1_0.helper.migrar             # aplica las pendientes
+    python -m app.v1_0.helper.migrar --listar    # muestra aplicadas y pendientes
+"""
+
+import argparse
+import os
+import sys
+from typing import List
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from app.utils.database.db_connector import DATABASE_URL
+
+DIRECTORIO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "migraciones",
+)
+
+# Clave del advisory lock de sesión que serializa las migraciones.
+CLAVE_BLOQUEO = 7_364_201
+
+
+def _conninfo(url: str) -> str:
+    # libpq no entiende el sufijo del driver de SQLAlchemy (postgresql+psycopg).
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def migraciones_disponibles() -> List[str]:
+    return sorted(f for f in os.listdir(DIRECTORIO) if f.endswith(".sql"))
+
+
+def migrar(listar: bool = False) -> int:
+    with psycopg.connect(_conninfo(DATABASE_URL), autocommit=True) as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS migracion_aplicada ("
+            " nombre varchar(255) PRIMARY KEY,"
+            " fecha timestamp NOT NULL DEFAULT localtimestamp)"
+        )
+        conn.execute("SELECT pg_advisory_lock(%s)", (CLAVE_BLOQUEO,))
+        try:
+            aplicadas = {
+                fila[0] for fila in conn.execute("SELECT nombre FROM migracion_aplicada")
+            }
+            pendientes = [m for m in migraciones_disponibles() if m not in aplicadas]
+
+            if listar:
+                for nombre in migraciones_disponibles():
+                    print(f"{'aplicada ' if nombre in aplicadas else 'pendiente'}  {nombre}")
+                return 0
+
+            for nombre in pendientes:
+                with open(os.path.join(DIRECTORIO, nombre), encoding="utf-8") as archivo:
+                    sql = archivo.read()
+                with conn.transaction():
+                    # Sin parámetros psycopg usa el protocolo simple: admite
+                    # varias sentencias en una sola llamada.
+                    conn.execute(sql)
+                    conn.execute("INSERT INTO migracion_aplicada (nombre) VALUES (%s)", (nombre,))
+                print(f"Aplicada: {nombre}")
+            if not pendientes:
+                print("Sin migraciones pendientes")
+            return 0
+        finally:
+            conn.execute("SELECT pg_advisory_unlock(%s)", (CLAVE_BLOQUEO,))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aplica las migraciones SQL pendientes.")
+    parser.add_argument("--listar", action="store_true", help="Sólo muestra el estado de cada migración")
+    args = parser.parse_args()
+    try:
+        sys.exit(migrar(args.listar))
+    except psycopg.Error as e:
+        print(f"Error al migrar: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,10 @@ from .categoria_gastos import CategoriaGastos
 from .detalle_pago_venta import DetallePagoVenta
 from .detalle_pago_compra import DetallePagoCompra
 from .user import User
+from .ajuste_inventario import AjusteInventario
+from .movimiento_inventario import MovimientoInventario
+from .snapshot_inventario import SnapshotInventario
+from .clave_idempotencia import ClaveIdempotencia
 __all__ = [
     "Cliente", 
     "Producto", 
@@ -27,5 +31,7 @@ __all__ = [
     "Proveedor", 
     "Transaccion", "Gasto", "Utilidad", 
     "DetalleUtilidad", "Inversion", "Credito", 
-    "Banco", "Estado", "TipoTransaccion", "CategoriaGastos", "DetallePagoVenta", "DetallePagoCompra", "User"
+    "Banco", "Estado", "TipoTransaccion", "CategoriaGastos", "DetallePagoVenta", "DetallePagoCompra", "User",
+    "AjusteInventario", "MovimientoInventario", "SnapshotInventario",
+    "ClaveIdempotencia"
 ]
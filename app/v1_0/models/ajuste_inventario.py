@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .base import Base
+
+class AjusteInventario(Base):
+    """
+    Registro de auditoría de cada ajuste de stock por conteo físico.
+    DDL: migraciones/004_ajuste_inventario.sql
+    """
+    __tablename__ = "ajuste_inventario"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    producto_id = Column(Integer, ForeignKey("producto.id", ondelete="CASCADE"), nullable=False, index=True)
+    cantidad_anterior = Column(Integer, nullable=False)
+    cantidad_nueva = Column(Integer, nullable=False)
+    diferencia = Column(Integer, nullable=False)
+    observacion = Column(Text, nullable=True)
+    fecha = Column(DateTime, default=datetime.now, nullable=False)
+
+    producto = relationship("Producto")
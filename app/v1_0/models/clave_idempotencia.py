@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from .base import Base
+
+class ClaveIdempotencia(Base):
+    """
+    Resultado guardado de una operación de escritura identificada por el
+    encabezado Idempotency-Key, para responder reintentos sin re-ejecutarla.
+    DDL: migraciones/007_clave_idempotencia.sql
+    """
+    __tablename__ = "clave_idempotencia"
+
+    clave = Column(String(255), primary_key=True)
+    alcance = Column(String(100), primary_key=True)
+    hash_solicitud = Column(String(64), nullable=False)
+    estado = Column(String(20), nullable=False)
+    codigo_estado = Column(Integer, nullable=True)
+    respuesta = Column(JSONB, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
+    expira_en = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Limpieza por TTL.
+        Index("ix_clave_idempotencia_expira_en", expira_en),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -16,3 +16,20 @@ class Cliente(Base):
     correo = Column(String, nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now)
     saldo = Column(Float, default=0.0)
+
+    __table_args__ = (
+        # DDL (incluye la extensión pg_trgm): migraciones/003_busqueda_terceros.sql
+        # Búsqueda por prefijo de cc_nit (LIKE 'abc%').
+        Index(
+            "ix_cliente_cc_nit_patron",
+            cc_nit,
+            postgresql_ops={"cc_nit": "text_pattern_ops"},
+        ),
+        # Búsqueda aproximada por nombre (pg_trgm: %, similarity, ILIKE).
+        Index(
+            "ix_cliente_nombre_trgm",
+            nombre,
+            postgresql_using="gin",
+            postgresql_ops={"nombre": "gin_trgm_ops"},
+        ),
+    )
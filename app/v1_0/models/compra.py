@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import Base
@@ -20,4 +20,16 @@ class Compra(Base):
     pagos_compra = relationship(
         "DetallePagoCompra",
         back_populates="compra"
-    )
\ No newline at end of file
+    )
+
+    __table_args__ = (
+        # Compras a crédito abiertas: sostiene el reporte de cuentas por pagar.
+        # DDL: migraciones/002_cartera_proveedores.sql
+        Index(
+            "ix_compra_credito_abierta",
+            proveedor_id,
+            fecha_compra,
+            postgresql_where=saldo > 0,
+            postgresql_include=["saldo"],
+        ),
+    )
@@ -8,7 +8,7 @@ class DetallePagoCompra(Base):
     __tablename__ = "detalle_pago_compra"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    compra_id = Column(Integer, ForeignKey("compra.id"), nullable=False)
+    compra_id = Column(Integer, ForeignKey("compra.id"), nullable=False, index=True)
     banco_id = Column(Integer, ForeignKey("banco.id"), nullable=False)
     monto = Column(Float, nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Index, func
+from .base import Base
+
+class MovimientoInventario(Base):
+    """
+    Kardex: cada cambio de stock de un producto como un movimiento con signo.
+    Es de sólo inserción; las anulaciones se registran como movimientos inversos.
+    DDL: migraciones/005_kardex.sql
+    """
+    __tablename__ = "movimiento_inventario"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    producto_id = Column(Integer, ForeignKey("producto.id", ondelete="CASCADE"), nullable=False)
+    cantidad = Column(Integer, nullable=False)
+    tipo = Column(String(20), nullable=False)
+    documento_id = Column(Integer, nullable=True)
+    # Reloj de la base, el mismo de los snapshots y cortes: un reloj de la
+    # aplicación adelantado o atrasado dejaría movimientos del lado
+    # equivocado de un corte.
+    fecha = Column(DateTime, server_default=func.localtimestamp(), nullable=False)
+
+    __table_args__ = (
+        # Historial y stock a fecha: lectura por rango (producto_id, fecha).
+        Index(
+            "ix_movimiento_inventario_producto_fecha",
+            producto_id,
+            fecha,
+            id,
+            postgresql_include=["cantidad"],
+        ),
+        # Cortes de snapshot: movimientos posteriores al último corte.
+        Index("ix_movimiento_inventario_fecha", fecha),
+    )
@@ -1,5 +1,5 @@
 # producto.py
-from sqlalchemy import Column, Integer, String, Float,DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Float,DateTime, Boolean, Index, and_
 from sqlalchemy.orm import relationship
 from .base import Base
 from datetime import datetime
@@ -14,6 +14,19 @@ class Producto(Base):
     precio_venta = Column(Float, nullable=False)
     cantidad = Column(Integer, nullable=False)
     activo = Column(Boolean, default=True, nullable=False)
+    stock_minimo = Column(Integer, default=0, server_default="0", nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.now)
 
     detalles_venta = relationship("DetalleVenta", back_populates="producto", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Lista de reposición: sólo contiene los productos activos en o bajo
+        # su punto de reorden; PostgreSQL la mantiene en cada cambio de stock.
+        # DDL: migraciones/006_stock_minimo.sql
+        Index(
+            "ix_producto_bajo_stock",
+            referencia,
+            postgresql_where=and_(activo, stock_minimo > 0, cantidad <= stock_minimo),
+            postgresql_include=["cantidad", "stock_minimo"],
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from datetime import datetime
 from .base import Base
 
@@ -13,3 +13,20 @@ class Proveedor(Base):
     celular = Column(String, nullable=True)
     correo = Column(String, nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        # DDL (incluye la extensión pg_trgm): migraciones/003_busqueda_terceros.sql
+        # Búsqueda por prefijo de cc_nit (LIKE 'abc%').
+        Index(
+            "ix_proveedor_cc_nit_patron",
+            cc_nit,
+            postgresql_ops={"cc_nit": "text_pattern_ops"},
+        ),
+        # Búsqueda aproximada por nombre (pg_trgm: %, similarity, ILIKE).
+        Index(
+            "ix_proveedor_nombre_trgm",
+            nombre,
+            postgresql_using="gin",
+            postgresql_ops={"nombre": "gin_trgm_ops"},
+        ),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from .base import Base
+
+class SnapshotInventario(Base):
+    """
+    Punto de control del kardex: stock de un producto al cierre de `fecha`
+    (suma de todos sus movimientos con fecha <= `fecha`).
+    DDL: migraciones/005_kardex.sql
+    """
+    __tablename__ = "snapshot_inventario"
+
+    producto_id = Column(Integer, ForeignKey("producto.id", ondelete="CASCADE"), primary_key=True)
+    fecha = Column(DateTime, primary_key=True)
+    cantidad = Column(Integer, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -15,6 +15,9 @@ class Venta(Base):
     estado_id = Column(Integer, nullable=False)
     saldo_restante = Column(Float, nullable=True)
     fecha = Column(DateTime, default=datetime.now)
+    # UUID generado por la terminal para ventas registradas sin conexión.
+    # DDL: migraciones/008_venta_uuid_terminal.sql
+    uuid_terminal = Column(Uuid, nullable=True, unique=True)
 
     cliente = relationship(Cliente)   
     banco = relationship("Banco")
@@ -23,4 +26,16 @@ class Venta(Base):
     pagos_venta     = relationship(
         "DetallePagoVenta",
         back_populates="venta"
-    )
\ No newline at end of file
+    )
+
+    __table_args__ = (
+        # Ventas a crédito abiertas: sostiene el reporte de cartera por edades.
+        # DDL: migraciones/001_cartera_clientes.sql
+        Index(
+            "ix_venta_credito_abierta",
+            cliente_id,
+            fecha,
+            postgresql_where=saldo_restante > 0,
+            postgresql_include=["saldo_restante"],
+        ),
+    )
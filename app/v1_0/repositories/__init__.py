@@ -19,6 +19,8 @@ from .inversion_repository import InversionRepository
 from .tipo_transaccion_repository import TipoTransaccionRepository
 from .transaccion_repository import TransaccionRepository
 from .user_repository import UserRepository
+from .movimiento_inventario_repository import MovimientoInventarioRepository
+from .clave_idempotencia_repository import ClaveIdempotenciaRepository
 __all__ = [
     "BaseRepository",
     "ClienteRepository",
@@ -40,5 +42,7 @@ __all__ = [
     "InversionRepository",
     "TipoTransaccionRepository",
     "TransaccionRepository",
-    "UserRepository"
+    "UserRepository",
+    "MovimientoInventarioRepository",
+    "ClaveIdempotenciaRepository"
 ]
@@ -1,8 +1,8 @@
 # app/v1_0/repositories/banco_repository.py
 
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Dict, Optional, List
+from sqlalchemy import select, update, values, column, Integer, Float
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.models import Banco
@@ -124,4 +124,41 @@ class BancoRepository(BaseRepository[Banco]):
                 Lista de instancias de modelo Banco.
             """
             result = await session.execute(select(Banco))
-            return list(result.scalars().all())
\ No newline at end of file
+            return list(result.scalars().all())
+
+    async def aplicar_deltas_saldo(
+        self,
+        deltas: Dict[int, float],
+        session: AsyncSession
+    ) -> int:
+        """
+        Suma a cada banco su delta con un único UPDATE ... FROM (VALUES ...).
+        Retorna cuántos bancos actualizó.
+        """
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return 0
+        delta = values(
+            column("banco_id", Integer),
+            column("monto", Float),
+            name="deltas",
+        ).data(sorted(deltas.items()))
+        stmt = (
+            update(Banco)
+            .where(Banco.id == delta.c.banco_id)
+            .values(saldo=Banco.saldo + delta.c.monto, fecha_actualizacion=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def nombres_por_id(
+        self,
+        ids: List[int],
+        session: AsyncSession
+    ) -> Dict[int, str]:
+        """Retorna {id: nombre} de los bancos existentes entre `ids`."""
+        if not ids:
+            return {}
+        stmt = select(Banco.id, Banco.nombre).where(Banco.id.in_(ids))
+        return dict((await session.execute(stmt)).all())
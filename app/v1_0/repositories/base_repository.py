@@ -1,11 +1,18 @@
 # app/v1_0/repositories/base.py
 
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Any, AsyncIterable, Dict, Generic, Iterable, TypeVar, Type, Optional, List, Sequence, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, literal_column, Table, Column, Integer, MetaData
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.utils.database.bulk_copy import copiar_filas
 
 T = TypeVar("T")
 
+# Literal en línea (no parámetro) para que el planificador pueda usar los
+# índices parciales definidos con "saldo > 0".
+SALDO_CERO = literal_column("0")
+
 class BaseRepository(Generic[T]):
     """
     Repositorio base que expone operaciones CRUD básicas sobre una entidad T.
@@ -49,3 +56,56 @@ class BaseRepository(Generic[T]):
         """
         await session.delete(entity)
         await session.flush()
+
+    async def upsert_desde_copy(
+        self,
+        filas: Union[Iterable[Sequence[Any]], AsyncIterable[Sequence[Any]]],
+        columnas: Sequence[str],
+        clave: str,
+        session: AsyncSession,
+        valores_nuevos: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, int]:
+        """
+        Carga masiva: copia `filas` (linea, *columnas) con COPY a una tabla
+        temporal (ON COMMIT DROP) y luego hace un único
+        INSERT ... SELECT ... ON CONFLICT (clave) DO UPDATE sobre la entidad.
+
+        Si la clave se repite en el archivo gana la última línea.
+        `valores_nuevos` son expresiones que sólo se usan al insertar
+        (p. ej. fecha de creación); en conflicto se actualizan únicamente
+        `columnas`, salvo la clave.
+
+        Returns:
+            Tuple[int, int]: (insertados, actualizados).
+        """
+        tabla = self.model_class.__table__
+        staging = Table(
+            f"staging_{tabla.name}",
+            MetaData(),
+            Column("linea", Integer),
+            *[Column(c, tabla.c[c].type) for c in columnas],
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DROP",
+        )
+        conexion = await session.connection()
+        await conexion.run_sync(staging.create)
+        await copiar_filas(session, staging.name, ["linea", *columnas], filas)
+
+        extras = valores_nuevos or {}
+        origen = (
+            select(
+                *[staging.c[c] for c in columnas],
+                *[expr.label(nombre) for nombre, expr in extras.items()],
+            )
+            .distinct(staging.c[clave])
+            .order_by(staging.c[clave], staging.c.linea.desc())
+        )
+        stmt = pg_insert(tabla).from_select([*columnas, *extras], origen)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[tabla.c[clave]],
+            set_={c: stmt.excluded[c] for c in columnas if c != clave},
+        ).returning(literal_column("(xmax = 0)").label("insertado"))
+
+        resultado = (await session.execute(stmt)).scalars().all()
+        insertados = sum(1 for nuevo in resultado if nuevo)
+        return insertados, len(resultado) - insertados
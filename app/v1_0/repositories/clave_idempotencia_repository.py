@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.v1_0.models import ClaveIdempotencia
+from .base_repository import BaseRepository
+
+ESTADO_EN_PROCESO = "en_proceso"
+ESTADO_COMPLETADO = "completado"
+
+
+class ClaveIdempotenciaRepository(BaseRepository[ClaveIdempotencia]):
+    def __init__(self):
+        super().__init__(ClaveIdempotencia)
+
+    async def reservar(
+        self,
+        clave: str,
+        alcance: str,
+        hash_solicitud: str,
+        expira_en: datetime,
+        session: AsyncSession
+    ) -> bool:
+        """
+        Reserva la clave en estado en_proceso con un único
+        INSERT ... ON CONFLICT DO UPDATE ... WHERE. Si ya existe, sólo la
+        toma cuando está vencida. Si otra transacción tiene la misma clave
+        sin confirmar, espera a que termine.
+
+        Returns:
+            bool: True si la reserva es de esta solicitud.
+        """
+        ahora = datetime.now()
+        stmt = pg_insert(ClaveIdempotencia).values(
+            clave=clave,
+            alcance=alcance,
+            hash_solicitud=hash_solicitud,
+            estado=ESTADO_EN_PROCESO,
+            fecha_creacion=ahora,
+            expira_en=expira_en,
+        )
+        actual = ClaveIdempotencia.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[actual.clave, actual.alcance],
+            set_={
+                "hash_solicitud": stmt.excluded.hash_solicitud,
+                "estado": ESTADO_EN_PROCESO,
+                "codigo_estado": None,
+                "respuesta": None,
+                "fecha_creacion": stmt.excluded.fecha_creacion,
+                "expira_en": stmt.excluded.expira_en,
+            },
+            where=actual.expira_en < ahora,
+        ).returning(actual.clave)
+        return (await session.execute(stmt)).first() is not None
+
+    async def obtener(
+        self,
+        clave: str,
+        alcance: str,
+        session: AsyncSession
+    ) -> Optional[ClaveIdempotencia]:
+        """Recupera la clave registrada para el alcance, o None."""
+        stmt = select(ClaveIdempotencia).where(
+            ClaveIdempotencia.clave == clave,
+            ClaveIdempotencia.alcance == alcance,
+        )
+        return (await session.execute(stmt)).scalar_one_or_none()
+
+    async def completar(
+        self,
+        clave: str,
+        alcance: str,
+        codigo_estado: int,
+        respuesta: Any,
+        session: AsyncSession
+    ) -> None:
+        """Guarda la respuesta de la operación y marca la clave como completada."""
+        stmt = (
+            update(ClaveIdempotencia)
+            .where(ClaveIdempotencia.clave == clave, ClaveIdempotencia.alcance == alcance)
+            .values(estado=ESTADO_COMPLETADO, codigo_estado=codigo_estado, respuesta=respuesta)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+
+    async def purgar_vencidas(
+        self,
+        session: AsyncSession
+    ) -> int:
+        """Elimina las claves vencidas y retorna cuántas borró."""
+        stmt = delete(ClaveIdempotencia).where(ClaveIdempotencia.expira_en < datetime.now())
+        result = await session.execute(stmt)
+        return result.rowcount
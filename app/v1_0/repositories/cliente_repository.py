@@ -1,10 +1,12 @@
-from typing import Optional, List, Tuple
-from sqlalchemy import select, func
+from typing import AsyncIterable, Dict, Iterable, Optional, List, Tuple, Union
+from sqlalchemy import select, func, update, and_, or_, case, literal, values, column, Integer, Float
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.v1_0.models import Cliente
+from app.v1_0.models import Cliente, Venta
 from app.v1_0.entities import ClienteDTO
-from .base_repository import BaseRepository
+from app.v1_0.helper.busqueda import escapar_like
+from app.v1_0.helper.importacion import COLUMNAS_TERCERO, FilaTercero
+from .base_repository import BaseRepository, SALDO_CERO
 
 
 class ClienteRepository(BaseRepository[Cliente]):
@@ -64,6 +66,59 @@ class ClienteRepository(BaseRepository[Cliente]):
         await self.update(cliente, session)
         return cliente
 
+    async def ajustar_saldo(
+        self,
+        cliente_id: int,
+        delta: float,
+        session: AsyncSession
+    ) -> None:
+        """
+        Suma `delta` (positivo o negativo) al saldo del Cliente con un UPDATE
+        atómico, sin leer la fila antes. Mantiene el saldo como el agregado
+        de `venta.saldo_restante` de sus ventas a crédito.
+        """
+        if not delta:
+            return
+        stmt = (
+            update(Cliente)
+            .where(Cliente.id == cliente_id)
+            .values(saldo=func.coalesce(Cliente.saldo, 0.0) + delta)
+        )
+        await session.execute(stmt)
+
+    async def recompute_saldos_clientes(
+        self,
+        session: AsyncSession
+    ) -> int:
+        """
+        Reconstruye el saldo de todos los clientes a partir de la suma de
+        `venta.saldo_restante` de sus ventas abiertas, con un único
+        UPDATE ... FROM (SELECT cliente_id, SUM(...)). Sólo escribe las filas
+        cuyo saldo difiere; retorna cuántas se corrigieron.
+        """
+        saldos = (
+            select(
+                Cliente.id.label("cliente_id"),
+                func.coalesce(func.sum(Venta.saldo_restante), 0.0).label("saldo"),
+            )
+            .select_from(Cliente)
+            .outerjoin(
+                Venta,
+                and_(Venta.cliente_id == Cliente.id, Venta.saldo_restante > SALDO_CERO),
+            )
+            .group_by(Cliente.id)
+            .subquery("saldos")
+        )
+        stmt = (
+            update(Cliente)
+            .where(Cliente.id == saldos.c.cliente_id)
+            .where(Cliente.saldo.is_distinct_from(saldos.c.saldo))
+            .values(saldo=saldos.c.saldo)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
     async def delete_cliente(
         self,
         cliente_id: int,
@@ -105,3 +160,92 @@ class ClienteRepository(BaseRepository[Cliente]):
         items = (await session.execute(stmt)).scalars().all()
         total = await session.scalar(select(func.count(Cliente.id)))
         return items, int(total or 0)
+
+    async def buscar(
+        self,
+        texto: str,
+        limite: int,
+        session: AsyncSession
+    ) -> List[Cliente]:
+        """
+        Busca clientes por prefijo de cc_nit o por nombre aproximado (pg_trgm)
+        y retorna los `limite` mejores resultados con un orden estable:
+        primero coincidencias de cc_nit, luego por similitud del nombre,
+        nombre e id.
+        """
+        patron = escapar_like(texto)
+        por_nit = Cliente.cc_nit.like(f"{patron}%", escape="\\")
+        stmt = (
+            select(Cliente)
+            .where(
+                or_(
+                    por_nit,
+                    Cliente.nombre.ilike(f"%{patron}%", escape="\\"),
+                    Cliente.nombre.op("%")(texto),
+                )
+            )
+            .order_by(
+                case((por_nit, 0), else_=1),
+                func.similarity(Cliente.nombre, texto).desc(),
+                Cliente.nombre.asc(),
+                Cliente.id.asc(),
+            )
+            .limit(limite)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def importar_filas(
+        self,
+        filas: Union[Iterable[FilaTercero], AsyncIterable[FilaTercero]],
+        session: AsyncSession
+    ) -> Tuple[int, int]:
+        """
+        Importa clientes en bloque (COPY + upsert por cc_nit). Los nuevos
+        se crean con saldo 0; a los existentes se les conserva saldo y
+        fecha de creación. Retorna (insertados, actualizados).
+        """
+        return await self.upsert_desde_copy(
+            filas,
+            COLUMNAS_TERCERO,
+            "cc_nit",
+            session,
+            valores_nuevos={"fecha_creacion": func.localtimestamp(), "saldo": literal(0.0)},
+        )
+
+    async def aplicar_deltas_saldo(
+        self,
+        deltas: Dict[int, float],
+        session: AsyncSession
+    ) -> int:
+        """
+        Versión por lotes de `ajustar_saldo`: suma a cada cliente su delta con
+        un único UPDATE ... FROM (VALUES ...). Retorna cuántos actualizó.
+        """
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return 0
+        delta = values(
+            column("cliente_id", Integer),
+            column("monto", Float),
+            name="deltas",
+        ).data(sorted(deltas.items()))
+        stmt = (
+            update(Cliente)
+            .where(Cliente.id == delta.c.cliente_id)
+            .values(saldo=func.coalesce(Cliente.saldo, 0.0) + delta.c.monto)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def nombres_por_id(
+        self,
+        ids: List[int],
+        session: AsyncSession
+    ) -> Dict[int, str]:
+        """Retorna {id: nombre} de los clientes existentes entre `ids`."""
+        if not ids:
+            return {}
+        stmt = select(Cliente.id, Cliente.nombre).where(Cliente.id.in_(ids))
+        return dict((await session.execute(stmt)).all())
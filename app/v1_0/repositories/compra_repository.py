@@ -1,12 +1,14 @@
 # app/v1_0/repositories/compra_repository.py
 
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, values, column, case, and_, func, Integer, Float
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 
-from app.v1_0.models import Compra
+from app.v1_0.models import Compra, Proveedor, DetallePagoCompra, Banco
 from app.v1_0.entities import CompraDTO
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, SALDO_CERO
 
 class CompraRepository(BaseRepository[Compra]):
     def __init__(self):
@@ -85,3 +87,147 @@ class CompraRepository(BaseRepository[Compra]):
         await session.delete(compra)
         await session.flush()
         return True
+
+    async def list_credito_pendientes(
+        self,
+        proveedor_id: int,
+        estado_credito_id: int,
+        session: AsyncSession,
+        compra_ids: Optional[List[int]] = None
+    ) -> List[Compra]:
+        """
+        Recupera (y bloquea con FOR UPDATE) las compras a crédito con saldo
+        pendiente de un proveedor, de la más antigua a la más reciente.
+
+        Si se indican `compra_ids`, sólo considera esas compras y las devuelve
+        en el mismo orden en que fueron enviadas.
+        """
+        stmt = (
+            select(Compra)
+            .where(
+                Compra.proveedor_id == proveedor_id,
+                Compra.estado_id == estado_credito_id,
+                Compra.saldo > SALDO_CERO,
+            )
+            .order_by(Compra.fecha_compra.asc(), Compra.id.asc())
+            .with_for_update()
+        )
+        if compra_ids:
+            stmt = stmt.where(Compra.id.in_(compra_ids))
+
+        compras = list((await session.execute(stmt)).scalars().all())
+        if compra_ids:
+            orden = {cid: i for i, cid in enumerate(compra_ids)}
+            compras.sort(key=lambda c: orden[c.id])
+        return compras
+
+    async def aplicar_abonos(
+        self,
+        abonos: Dict[int, float],
+        estado_cancelada_id: Optional[int],
+        session: AsyncSession
+    ) -> int:
+        """
+        Descuenta de cada compra el monto abonado con un único
+        UPDATE ... FROM (VALUES ...) y, si se indica `estado_cancelada_id`,
+        cambia a ese estado las compras cuyo saldo queda en cero.
+        No hace commit: deja flush/commit a la transacción externa.
+        """
+        if not abonos:
+            return 0
+
+        abono = values(
+            column("compra_id", Integer),
+            column("monto", Float),
+            name="abonos",
+        ).data(list(abonos.items()))
+
+        nuevo_saldo = Compra.saldo - abono.c.monto
+        cambios: Dict[str, Any] = {"saldo": nuevo_saldo}
+        if estado_cancelada_id is not None:
+            cambios["estado_id"] = case(
+                (nuevo_saldo <= 0, estado_cancelada_id),
+                else_=Compra.estado_id,
+            )
+
+        stmt = (
+            update(Compra)
+            .where(Compra.id == abono.c.compra_id)
+            .values(**cambios)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def cartera_por_proveedor(
+        self,
+        fecha_corte: datetime,
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Agrupa en una sola consulta el saldo pendiente de las compras a crédito
+        por proveedor y por edad (0-30, 31-60, 61-90 y más de 90 días respecto a
+        `fecha_corte`). Usa el índice parcial `ix_compra_credito_abierta`.
+        """
+        limite_30 = fecha_corte - timedelta(days=30)
+        limite_60 = fecha_corte - timedelta(days=60)
+        limite_90 = fecha_corte - timedelta(days=90)
+        saldo = Compra.saldo
+
+        def tramo(condicion):
+            return func.sum(case((condicion, saldo), else_=0.0))
+
+        stmt = (
+            select(
+                Compra.proveedor_id,
+                Proveedor.nombre.label("proveedor"),
+                func.count(Compra.id).label("compras_abiertas"),
+                tramo(Compra.fecha_compra >= limite_30).label("dias_0_30"),
+                tramo(and_(Compra.fecha_compra < limite_30, Compra.fecha_compra >= limite_60)).label("dias_31_60"),
+                tramo(and_(Compra.fecha_compra < limite_60, Compra.fecha_compra >= limite_90)).label("dias_61_90"),
+                tramo(Compra.fecha_compra < limite_90).label("dias_mas_90"),
+                func.sum(saldo).label("total"),
+            )
+            .join(Proveedor, Proveedor.id == Compra.proveedor_id)
+            .where(Compra.saldo > SALDO_CERO, Compra.fecha_compra <= fecha_corte)
+            .group_by(Compra.proveedor_id, Proveedor.nombre)
+            .order_by(func.sum(saldo).desc(), Compra.proveedor_id.asc())
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
+
+    async def list_pendientes_con_pagos(
+        self,
+        proveedor_id: int,
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Trae en una sola consulta las compras con saldo pendiente de un proveedor
+        junto con su historial de pagos (LEFT JOIN a detalle_pago_compra y banco).
+
+        Devuelve una fila por pago (o una fila con columnas de pago nulas si la
+        compra no tiene pagos), ordenadas por compra y fecha de pago.
+        """
+        stmt = (
+            select(
+                Compra.id.label("compra_id"),
+                Compra.fecha_compra,
+                Compra.total,
+                Compra.saldo,
+                DetallePagoCompra.id.label("pago_id"),
+                DetallePagoCompra.monto,
+                DetallePagoCompra.fecha_creacion.label("fecha_pago"),
+                Banco.nombre.label("banco"),
+            )
+            .outerjoin(DetallePagoCompra, DetallePagoCompra.compra_id == Compra.id)
+            .outerjoin(Banco, Banco.id == DetallePagoCompra.banco_id)
+            .where(Compra.proveedor_id == proveedor_id, Compra.saldo > SALDO_CERO)
+            .order_by(
+                Compra.fecha_compra.asc(),
+                Compra.id.asc(),
+                DetallePagoCompra.fecha_creacion.asc(),
+                DetallePagoCompra.id.asc(),
+            )
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
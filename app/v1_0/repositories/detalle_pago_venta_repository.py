@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.models import DetallePagoVenta
@@ -60,3 +60,19 @@ class DetallePagoVentaRepository(BaseRepository[DetallePagoVenta]):
         result = await session.execute(stmt)
         await session.flush()
         return result.rowcount
+
+    async def bulk_create_pagos(
+        self,
+        dtos: List[DetallePagoVentaDTO],
+        session: AsyncSession
+    ) -> List[DetallePagoVenta]:
+        """
+        Inserta en lote varios pagos con un único INSERT ... RETURNING y
+        devuelve las entidades persistidas en el mismo orden de los DTOs.
+        """
+        if not dtos:
+            return []
+
+        stmt = insert(DetallePagoVenta).returning(DetallePagoVenta, sort_by_parameter_order=True)
+        result = await session.scalars(stmt, [dto.model_dump() for dto in dtos])
+        return list(result.all())
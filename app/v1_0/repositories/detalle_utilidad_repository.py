@@ -1,5 +1,5 @@
-from typing import Optional, List
-from sqlalchemy import select, delete
+from typing import Any, Dict, Optional, List
+from sqlalchemy import select, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.models import DetalleUtilidad
@@ -61,3 +61,17 @@ class DetalleUtilidadRepository(BaseRepository[DetalleUtilidad]):
         result = await session.execute(stmt)
         await session.flush()
         return result.rowcount
+
+    async def bulk_create_detalles(
+        self,
+        filas: List[Dict[str, Any]],
+        session: AsyncSession
+    ) -> int:
+        """
+        Inserta detalles de utilidad de varias ventas con un único INSERT
+        (executemany). Retorna cuántos insertó.
+        """
+        if not filas:
+            return 0
+        await session.execute(insert(DetalleUtilidad), filas)
+        return len(filas)
@@ -1,5 +1,5 @@
-from typing import Optional, List
-from sqlalchemy import select, delete
+from typing import Any, Dict, Optional, List
+from sqlalchemy import select, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.schemas.venta_schema import DetalleVentaCreate
@@ -80,4 +80,18 @@ class DetalleVentaRepository(BaseRepository[DetalleVenta]):
         stmt = delete(DetalleVenta).where(DetalleVenta.venta_id == venta_id)
         result = await session.execute(stmt)
         await session.flush()
-        return result.rowcount
\ No newline at end of file
+        return result.rowcount
+
+    async def bulk_create_detalles(
+        self,
+        filas: List[Dict[str, Any]],
+        session: AsyncSession
+    ) -> int:
+        """
+        Inserta detalles de varias ventas con un único INSERT (executemany)
+        sin materializar objetos ORM. Retorna cuántos insertó.
+        """
+        if not filas:
+            return 0
+        await session.execute(insert(DetalleVenta), filas)
+        return len(filas)
@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select, insert, func, or_, true, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.v1_0.models import MovimientoInventario, SnapshotInventario, Producto
+from .base_repository import BaseRepository
+
+# Tipos de movimiento del kardex.
+TIPO_INICIAL = "inicial"
+TIPO_VENTA = "venta"
+TIPO_ANULACION_VENTA = "anulacion_venta"
+TIPO_COMPRA = "compra"
+TIPO_ANULACION_COMPRA = "anulacion_compra"
+TIPO_AJUSTE = "ajuste"
+TIPO_CONTEO = "conteo"
+
+# (producto_id, cantidad con signo, tipo, documento_id)
+Movimiento = Tuple[int, int, str, Optional[int]]
+
+
+class MovimientoInventarioRepository(BaseRepository[MovimientoInventario]):
+    def __init__(self):
+        super().__init__(MovimientoInventario)
+
+    async def registrar(
+        self,
+        movimientos: List[Movimiento],
+        session: AsyncSession
+    ) -> None:
+        """
+        Inserta en bloque los movimientos (un solo INSERT multi-fila).
+        Los movimientos con cantidad 0 se omiten; la fecha la pone la base.
+        """
+        filas = [
+            {
+                "producto_id": producto_id,
+                "cantidad": cantidad,
+                "tipo": tipo,
+                "documento_id": documento_id,
+            }
+            for producto_id, cantidad, tipo, documento_id in movimientos
+            if cantidad
+        ]
+        if filas:
+            await session.execute(insert(MovimientoInventario), filas)
+
+    async def ahora(self, session: AsyncSession) -> datetime:
+        """Hora de la base: el reloj con el que se fechan los movimientos."""
+        return await session.scalar(select(func.localtimestamp()))
+
+    async def stock_a_fecha(
+        self,
+        producto_id: int,
+        fecha: datetime,
+        session: AsyncSession
+    ) -> int:
+        """
+        Stock del producto al cierre de `fecha`: último snapshot con
+        fecha <= `fecha` más los movimientos posteriores a ese snapshot
+        (dos lecturas por rango de índice, sin recorrer todo el historial).
+        """
+        snapshot = (
+            await session.execute(
+                select(SnapshotInventario.fecha, SnapshotInventario.cantidad)
+                .where(
+                    SnapshotInventario.producto_id == producto_id,
+                    SnapshotInventario.fecha <= fecha,
+                )
+                .order_by(SnapshotInventario.fecha.desc())
+                .limit(1)
+            )
+        ).first()
+
+        stmt = select(func.coalesce(func.sum(MovimientoInventario.cantidad), 0)).where(
+            MovimientoInventario.producto_id == producto_id,
+            MovimientoInventario.fecha <= fecha,
+        )
+        base = 0
+        if snapshot:
+            stmt = stmt.where(MovimientoInventario.fecha > snapshot.fecha)
+            base = snapshot.cantidad
+        return base + int(await session.scalar(stmt) or 0)
+
+    async def list_movimientos(
+        self,
+        producto_id: int,
+        desde: datetime,
+        hasta: datetime,
+        saldo_inicial: int,
+        limite: int,
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Movimientos del producto entre `desde` (exclusivo) y `hasta`
+        (inclusivo), en orden cronológico, con el saldo acumulado tras cada
+        uno a partir de `saldo_inicial` (stock al cierre de `desde`).
+
+        Returns:
+            List[Row]: (id, fecha, tipo, documento_id, cantidad, saldo).
+        """
+        m = MovimientoInventario
+        stmt = (
+            select(
+                m.id,
+                m.fecha,
+                m.tipo,
+                m.documento_id,
+                m.cantidad,
+                (
+                    literal(saldo_inicial)
+                    + func.sum(m.cantidad).over(order_by=(m.fecha, m.id))
+                ).label("saldo"),
+            )
+            .where(m.producto_id == producto_id, m.fecha > desde, m.fecha <= hasta)
+            .order_by(m.fecha.asc(), m.id.asc())
+            .limit(limite)
+        )
+        return list((await session.execute(stmt)).all())
+
+    async def registrar_iniciales(
+        self,
+        session: AsyncSession
+    ) -> int:
+        """
+        Abre el kardex de los productos que aún no tienen movimientos con un
+        movimiento "inicial" igual a su stock actual. Idempotente.
+        """
+        sin_movimientos = ~(
+            select(MovimientoInventario.id)
+            .where(MovimientoInventario.producto_id == Producto.id)
+            .exists()
+        )
+        stmt = insert(MovimientoInventario).from_select(
+            ["producto_id", "cantidad", "tipo", "fecha"],
+            select(
+                Producto.id,
+                Producto.cantidad,
+                literal(TIPO_INICIAL),
+                func.localtimestamp(),
+            ).where(sin_movimientos, Producto.cantidad != 0),
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def generar_snapshots(
+        self,
+        corte: datetime,
+        session: AsyncSession
+    ) -> int:
+        """
+        Crea un snapshot al `corte` para cada producto con movimientos desde
+        su último snapshot: toma ese snapshot (LATERAL sobre la PK) y le suma
+        sólo los movimientos posteriores (rango sobre el índice
+        producto_id, fecha). Retorna cuántos snapshots creó.
+        """
+        ultimo = (
+            select(SnapshotInventario.fecha, SnapshotInventario.cantidad)
+            .where(
+                SnapshotInventario.producto_id == Producto.id,
+                SnapshotInventario.fecha <= corte,
+            )
+            .order_by(SnapshotInventario.fecha.desc())
+            .limit(1)
+            .lateral("ultimo")
+        )
+        pendientes = (
+            select(
+                func.sum(MovimientoInventario.cantidad).label("suma"),
+                func.count().label("n"),
+            )
+            .where(
+                MovimientoInventario.producto_id == Producto.id,
+                MovimientoInventario.fecha <= corte,
+                or_(ultimo.c.fecha.is_(None), MovimientoInventario.fecha > ultimo.c.fecha),
+            )
+            .lateral("pendientes")
+        )
+        nuevos = (
+            select(
+                Producto.id,
+                literal(corte),
+                func.coalesce(ultimo.c.cantidad, 0) + pendientes.c.suma,
+            )
+            .select_from(Producto)
+            .outerjoin(ultimo, true())
+            .join(pendientes, true())
+            .where(pendientes.c.n > 0)
+        )
+        stmt = (
+            pg_insert(SnapshotInventario)
+            .from_select(["producto_id", "fecha", "cantidad"], nuevos)
+            .on_conflict_do_nothing(index_elements=["producto_id", "fecha"])
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
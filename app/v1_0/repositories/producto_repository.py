@@ -1,10 +1,22 @@
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Any, Dict, Optional, List, Tuple
+from sqlalchemy import (
+    select, update, insert, exists, func, cast, literal, literal_column,
+    values, column, Numeric, Float, Integer, String, Text,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.v1_0.models import Producto
+from app.v1_0.models import Producto, DetalleCompra, Compra, AjusteInventario, MovimientoInventario
+from app.v1_0.helper.busqueda import escapar_like
+from app.v1_0.helper.eventos_producto import marcar_productos
 from app.v1_0.entities import ProductoDTO
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, SALDO_CERO
+from .movimiento_inventario_repository import TIPO_CONTEO
+
+# Filas por sentencia en la carga masiva (7 parámetros por fila).
+UPSERT_LOTE = 1000
+
 
 class ProductoRepository(BaseRepository[Producto]):
     def __init__(self):
@@ -145,4 +157,337 @@ class ProductoRepository(BaseRepository[Producto]):
         """
         stmt = select(Producto).order_by(Producto.id.asc())
         result = await session.execute(stmt)
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def upsert_productos(
+        self,
+        filas: List[Dict[str, Any]],
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Crea o actualiza productos por `referencia` con
+        INSERT ... ON CONFLICT (referencia) DO UPDATE, en lotes de UPSERT_LOTE.
+        En los existentes sólo se actualizan descripción y precios; la
+        cantidad en inventario, el estado y la fecha de creación se conservan.
+        Las referencias no deben repetirse dentro de `filas`.
+
+        Returns:
+            List[Row]: (id, cantidad, insertado) por cada producto afectado.
+        """
+        filas_resultado: List[Row] = []
+        for inicio in range(0, len(filas), UPSERT_LOTE):
+            stmt = pg_insert(Producto).values(filas[inicio:inicio + UPSERT_LOTE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Producto.referencia],
+                set_={
+                    "descripcion": stmt.excluded.descripcion,
+                    "precio_compra": stmt.excluded.precio_compra,
+                    "precio_venta": stmt.excluded.precio_venta,
+                },
+            ).returning(
+                Producto.id,
+                Producto.cantidad,
+                literal_column("(xmax = 0)").label("insertado"),
+            )
+            filas_resultado.extend((await session.execute(stmt)).all())
+        marcar_productos(session, (f.id for f in filas_resultado))
+        return filas_resultado
+
+    async def ajustar_precios(
+        self,
+        campo: str,
+        factor: float,
+        session: AsyncSession,
+        referencia_prefijo: Optional[str] = None,
+        descripcion: Optional[str] = None,
+        proveedor_id: Optional[int] = None,
+        solo_activos: bool = True,
+        aplicar: bool = False
+    ) -> List[Row]:
+        """
+        Multiplica `campo` (precio_venta o precio_compra) por `factor`,
+        redondeado a 2 decimales, en los productos que cumplan los filtros.
+
+        Con aplicar=False sólo consulta el resultado. Con aplicar=True ejecuta
+        un único UPDATE ... FROM (SELECT ... FOR UPDATE) que bloquea las filas
+        y devuelve el precio anterior y el nuevo de cada producto.
+
+        Returns:
+            List[Row]: (id, referencia, descripcion, precio_anterior, precio_nuevo)
+            ordenadas por referencia.
+        """
+        precio = getattr(Producto, campo)
+        filtros = []
+        if solo_activos:
+            filtros.append(Producto.activo.is_(True))
+        if referencia_prefijo:
+            filtros.append(
+                Producto.referencia.like(f"{escapar_like(referencia_prefijo)}%", escape="\\")
+            )
+        if descripcion:
+            filtros.append(
+                Producto.descripcion.ilike(f"%{escapar_like(descripcion)}%", escape="\\")
+            )
+        if proveedor_id is not None:
+            filtros.append(
+                exists()
+                .where(DetalleCompra.producto_id == Producto.id)
+                .where(DetalleCompra.compra_id == Compra.id)
+                .where(Compra.proveedor_id == proveedor_id)
+            )
+
+        def redondear(valor):
+            return cast(func.round(cast(valor * factor, Numeric), 2), Float)
+
+        if not aplicar:
+            stmt = (
+                select(
+                    Producto.id,
+                    Producto.referencia,
+                    Producto.descripcion,
+                    precio.label("precio_anterior"),
+                    redondear(precio).label("precio_nuevo"),
+                )
+                .where(*filtros)
+                .order_by(Producto.referencia.asc())
+            )
+            return list((await session.execute(stmt)).all())
+
+        anteriores = (
+            select(Producto.id, precio.label("precio"))
+            .where(*filtros)
+            .with_for_update()
+            .subquery("anteriores")
+        )
+        stmt = (
+            update(Producto)
+            .where(Producto.id == anteriores.c.id)
+            .values({campo: redondear(anteriores.c.precio)})
+            .returning(
+                Producto.id,
+                Producto.referencia,
+                Producto.descripcion,
+                anteriores.c.precio.label("precio_anterior"),
+                precio.label("precio_nuevo"),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        filas = (await session.execute(stmt)).all()
+        marcar_productos(session, (f.id for f in filas))
+        return sorted(filas, key=lambda f: f.referencia)
+
+    async def referencias_inexistentes(
+        self,
+        referencias: List[str],
+        session: AsyncSession
+    ) -> List[str]:
+        """
+        Retorna las referencias de la lista que no corresponden a ningún Producto.
+        """
+        if not referencias:
+            return []
+        stmt = select(Producto.referencia).where(Producto.referencia.in_(referencias))
+        existentes = set((await session.execute(stmt)).scalars().all())
+        return [r for r in referencias if r not in existentes]
+
+    async def aplicar_conteo(
+        self,
+        conteo: List[Tuple[str, int]],
+        observacion: Optional[str],
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Fija `cantidad` al valor contado para cada (referencia, cantidad) y
+        registra el ajuste en `ajuste_inventario` y en el kardex, todo en una
+        sola sentencia:
+
+            WITH anteriores AS (SELECT ... FROM producto JOIN (VALUES ...) ... FOR UPDATE),
+                 actualizados AS (UPDATE producto ... RETURNING ...),
+                 ajustes AS (INSERT INTO ajuste_inventario SELECT ... FROM actualizados RETURNING ...),
+                 movimientos AS (INSERT INTO movimiento_inventario SELECT ... FROM ajustes)
+            SELECT ... FROM actualizados
+
+        La diferencia se calcula en SQL contra la cantidad vigente al bloquear
+        la fila. Los productos cuyo stock ya coincide no se tocan. Las
+        referencias no deben repetirse.
+
+        Returns:
+            List[Row]: (producto_id, referencia, cantidad_anterior, cantidad_nueva,
+            diferencia) por cada producto ajustado.
+        """
+        if not conteo:
+            return []
+
+        contado = (
+            values(
+                column("referencia", String),
+                column("cantidad", Integer),
+                name="contado",
+            )
+            .data(conteo)
+        )
+        anteriores = (
+            select(
+                Producto.id.label("producto_id"),
+                Producto.cantidad.label("cantidad_anterior"),
+                contado.c.cantidad.label("cantidad_nueva"),
+            )
+            .join(contado, contado.c.referencia == Producto.referencia)
+            .where(Producto.cantidad.is_distinct_from(contado.c.cantidad))
+            .with_for_update(of=Producto)
+            .cte("anteriores")
+        )
+        actualizados = (
+            update(Producto)
+            .where(Producto.id == anteriores.c.producto_id)
+            .values(cantidad=anteriores.c.cantidad_nueva)
+            .returning(
+                Producto.id.label("producto_id"),
+                Producto.referencia,
+                anteriores.c.cantidad_anterior,
+                Producto.cantidad.label("cantidad_nueva"),
+                (Producto.cantidad - anteriores.c.cantidad_anterior).label("diferencia"),
+            )
+            .cte("actualizados")
+        )
+        ajustes = (
+            insert(AjusteInventario)
+            .from_select(
+                ["producto_id", "cantidad_anterior", "cantidad_nueva", "diferencia", "observacion", "fecha"],
+                select(
+                    actualizados.c.producto_id,
+                    actualizados.c.cantidad_anterior,
+                    actualizados.c.cantidad_nueva,
+                    actualizados.c.diferencia,
+                    literal(observacion, Text),
+                    func.localtimestamp(),
+                ),
+            )
+            .returning(
+                AjusteInventario.id,
+                AjusteInventario.producto_id,
+                AjusteInventario.diferencia,
+                AjusteInventario.fecha,
+            )
+            .cte("ajustes")
+        )
+        movimientos = (
+            insert(MovimientoInventario)
+            .from_select(
+                ["producto_id", "cantidad", "tipo", "documento_id", "fecha"],
+                select(
+                    ajustes.c.producto_id,
+                    ajustes.c.diferencia,
+                    literal(TIPO_CONTEO),
+                    ajustes.c.id,
+                    ajustes.c.fecha,
+                ),
+            )
+            .cte("movimientos")
+        )
+        stmt = (
+            select(actualizados)
+            .add_cte(ajustes, movimientos)
+            .order_by(actualizados.c.referencia)
+        )
+        filas = list((await session.execute(stmt)).all())
+        marcar_productos(session, (f.producto_id for f in filas))
+        return filas
+
+    async def list_bajo_stock(
+        self,
+        limite: int,
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Productos activos con cantidad <= stock_minimo (y umbral definido),
+        ordenados por referencia. El predicado coincide con el del índice
+        parcial `ix_producto_bajo_stock`, así que sólo se leen esas entradas.
+
+        Returns:
+            List[Row]: (id, referencia, descripcion, cantidad, stock_minimo).
+        """
+        stmt = (
+            select(
+                Producto.id,
+                Producto.referencia,
+                Producto.descripcion,
+                Producto.cantidad,
+                Producto.stock_minimo,
+            )
+            .where(
+                Producto.activo,
+                Producto.stock_minimo > SALDO_CERO,
+                Producto.cantidad <= Producto.stock_minimo,
+            )
+            .order_by(Producto.referencia.asc())
+            .limit(limite)
+        )
+        return list((await session.execute(stmt)).all())
+
+    async def update_stock_minimo(
+        self,
+        producto_id: int,
+        stock_minimo: int,
+        session: AsyncSession
+    ) -> Optional[Producto]:
+        """
+        Actualiza el punto de reorden de un Producto.
+        """
+        producto = await self.get_by_id(producto_id, session)
+        if not producto:
+            return None
+
+        producto.stock_minimo = stock_minimo
+        await self.update(producto, session)
+        return producto
+
+    async def bloquear_productos(
+        self,
+        producto_ids: List[int],
+        session: AsyncSession
+    ) -> Dict[int, Row]:
+        """
+        Bloquea (FOR UPDATE) en una sola consulta los productos indicados,
+        siempre en orden de id para que lotes concurrentes no se bloqueen
+        mutuamente en orden cruzado.
+
+        Returns:
+            Dict[int, Row]: {id: (id, referencia, cantidad, precio_compra)}.
+        """
+        if not producto_ids:
+            return {}
+        stmt = (
+            select(Producto.id, Producto.referencia, Producto.cantidad, Producto.precio_compra)
+            .where(Producto.id.in_(producto_ids))
+            .order_by(Producto.id)
+            .with_for_update()
+        )
+        return {f.id: f for f in (await session.execute(stmt)).all()}
+
+    async def aplicar_deltas_cantidad(
+        self,
+        deltas: Dict[int, int],
+        session: AsyncSession
+    ) -> int:
+        """
+        Suma a cada producto su delta de stock (positivo o negativo) con un
+        único UPDATE ... FROM (VALUES ...). Retorna cuántos actualizó.
+        """
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return 0
+        delta = values(
+            column("producto_id", Integer),
+            column("cantidad", Integer),
+            name="deltas",
+        ).data(sorted(deltas.items()))
+        stmt = (
+            update(Producto)
+            .where(Producto.id == delta.c.producto_id)
+            .values(cantidad=Producto.cantidad + delta.c.cantidad)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        marcar_productos(session, deltas.keys())
+        return result.rowcount
@@ -1,9 +1,11 @@
-from typing import Optional, List, Tuple
-from sqlalchemy import select, func
+from typing import AsyncIterable, Iterable, Optional, List, Tuple, Union
+from sqlalchemy import select, func, or_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.models import Proveedor
 from app.v1_0.entities import ProveedorDTO
+from app.v1_0.helper.busqueda import escapar_like
+from app.v1_0.helper.importacion import COLUMNAS_TERCERO, FilaTercero
 from .base_repository import BaseRepository
 
 
@@ -77,4 +79,56 @@ class ProveedorRepository(BaseRepository[Proveedor]):
         )
         items = (await session.execute(stmt)).scalars().all()
         total = await session.scalar(select(func.count(Proveedor.id)))
-        return items, int(total or 0)
\ No newline at end of file
+        return items, int(total or 0)
+
+    async def buscar(
+        self,
+        texto: str,
+        limite: int,
+        session: AsyncSession
+    ) -> List[Proveedor]:
+        """
+        Busca proveedores por prefijo de cc_nit o por nombre aproximado (pg_trgm)
+        y retorna los `limite` mejores resultados con un orden estable:
+        primero coincidencias de cc_nit, luego por similitud del nombre,
+        nombre e id.
+        """
+        patron = escapar_like(texto)
+        por_nit = Proveedor.cc_nit.like(f"{patron}%", escape="\\")
+        stmt = (
+            select(Proveedor)
+            .where(
+                or_(
+                    por_nit,
+                    Proveedor.nombre.ilike(f"%{patron}%", escape="\\"),
+                    Proveedor.nombre.op("%")(texto),
+                )
+            )
+            .order_by(
+                case((por_nit, 0), else_=1),
+                func.similarity(Proveedor.nombre, texto).desc(),
+                Proveedor.nombre.asc(),
+                Proveedor.id.asc(),
+            )
+            .limit(limite)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def importar_filas(
+        self,
+        filas: Union[Iterable[FilaTercero], AsyncIterable[FilaTercero]],
+        session: AsyncSession
+    ) -> Tuple[int, int]:
+        """
+        Importa proveedores en bloque (COPY + upsert por cc_nit). A los
+        existentes se les conserva la fecha de creación.
+        Retorna (insertados, actualizados).
+        """
+        return await self.upsert_desde_copy(
+            filas,
+            COLUMNAS_TERCERO,
+            "cc_nit",
+            session,
+            valores_nuevos={"fecha_creacion": func.localtimestamp()},
+        )
@@ -1,5 +1,5 @@
 from typing import List, Optional, Tuple
-from sqlalchemy import select, desc, or_, and_, func
+from sqlalchemy import select, desc, or_, and_, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
@@ -38,6 +38,27 @@ class TransaccionRepository(BaseRepository[Transaccion]):
         await self.add(transaccion, session)
         return transaccion
 
+    async def bulk_create_transacciones(
+        self,
+        dtos: List[TransaccionDTO],
+        session: AsyncSession
+    ) -> int:
+        """
+        Inserta en lote varias Transacciones con un único INSERT (executemany)
+        y retorna cuántas se insertaron.
+
+        Args:
+            dtos (List[TransaccionDTO]): DTOs con los datos de cada transacción.
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy.
+
+        Returns:
+            int: Número de transacciones insertadas.
+        """
+        if not dtos:
+            return 0
+        await session.execute(insert(Transaccion), [dto.model_dump() for dto in dtos])
+        return len(dtos)
+
     async def list_paginated(
     self,
     offset: int,
@@ -1,5 +1,5 @@
-from typing import Optional, List, Tuple
-from sqlalchemy import select, delete, func
+from typing import Any, Dict, Optional, List, Tuple
+from sqlalchemy import select, delete, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.models import Utilidad
@@ -79,3 +79,16 @@ class UtilidadRepository(BaseRepository[Utilidad]):
         stmt = select(Utilidad).where(Utilidad.venta_id == venta_id)
         result = await session.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def bulk_create_utilidades(
+        self,
+        filas: List[Dict[str, Any]],
+        session: AsyncSession
+    ) -> int:
+        """
+        Inserta la utilidad de varias ventas con un único INSERT (executemany).
+        """
+        if not filas:
+            return 0
+        await session.execute(insert(Utilidad), filas)
+        return len(filas)
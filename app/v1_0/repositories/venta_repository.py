@@ -1,10 +1,14 @@
+from datetime import datetime, timedelta
 from typing import Optional, List, Union, Dict, Any, Tuple
-from sqlalchemy import select, func
+from uuid import UUID
+from sqlalchemy import select, func, update, insert, values, column, case, and_, literal, BigInteger, Integer, Float
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.v1_0.models import Venta
+from app.v1_0.models import Venta, Cliente
 from app.v1_0.entities import VentaDTO
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, SALDO_CERO
 
 class VentaRepository(BaseRepository[Venta]):
     def __init__(self):
@@ -110,4 +114,170 @@ class VentaRepository(BaseRepository[Venta]):
         )
         items = (await session.execute(stmt)).scalars().all()
         total = await session.scalar(select(func.count(Venta.id)))
-        return items, int(total or 0)
\ No newline at end of file
+        return items, int(total or 0)
+
+    async def list_credito_pendientes(
+        self,
+        cliente_id: int,
+        estado_credito_id: int,
+        session: AsyncSession,
+        venta_ids: Optional[List[int]] = None
+    ) -> List[Venta]:
+        """
+        Recupera (y bloquea con FOR UPDATE) las ventas a crédito con saldo
+        pendiente de un cliente, de la más antigua a la más reciente.
+
+        Si se indican `venta_ids`, sólo considera esas ventas y las devuelve
+        en el mismo orden en que fueron enviadas.
+        """
+        stmt = (
+            select(Venta)
+            .where(
+                Venta.cliente_id == cliente_id,
+                Venta.estado_id == estado_credito_id,
+                Venta.saldo_restante > SALDO_CERO,
+            )
+            .order_by(Venta.fecha.asc(), Venta.id.asc())
+            .with_for_update()
+        )
+        if venta_ids:
+            stmt = stmt.where(Venta.id.in_(venta_ids))
+
+        ventas = list((await session.execute(stmt)).scalars().all())
+        if venta_ids:
+            orden = {vid: i for i, vid in enumerate(venta_ids)}
+            ventas.sort(key=lambda v: orden[v.id])
+        return ventas
+
+    async def aplicar_abonos(
+        self,
+        abonos: Dict[int, float],
+        estado_cancelada_id: Optional[int],
+        session: AsyncSession
+    ) -> int:
+        """
+        Descuenta de cada venta el monto abonado con un único
+        UPDATE ... FROM (VALUES ...) y, si se indica `estado_cancelada_id`,
+        cambia a ese estado las ventas cuyo saldo queda en cero.
+
+        Args:
+            abonos:              Dict {venta_id: monto abonado}.
+            estado_cancelada_id: ID del estado "venta cancelada" (o None).
+            session:             Sesión asíncrona de SQLAlchemy.
+
+        Returns:
+            Número de ventas actualizadas.
+        """
+        if not abonos:
+            return 0
+
+        abono = values(
+            column("venta_id", Integer),
+            column("monto", Float),
+            name="abonos",
+        ).data(list(abonos.items()))
+
+        nuevo_saldo = Venta.saldo_restante - abono.c.monto
+        cambios: Dict[str, Any] = {"saldo_restante": nuevo_saldo}
+        if estado_cancelada_id is not None:
+            cambios["estado_id"] = case(
+                (nuevo_saldo <= 0, estado_cancelada_id),
+                else_=Venta.estado_id,
+            )
+
+        stmt = (
+            update(Venta)
+            .where(Venta.id == abono.c.venta_id)
+            .values(**cambios)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def cartera_por_cliente(
+        self,
+        fecha_corte: datetime,
+        session: AsyncSession
+    ) -> List[Row]:
+        """
+        Agrupa en una sola consulta el saldo pendiente de las ventas a crédito
+        por cliente y por edad (0-30, 31-60, 61-90 y más de 90 días respecto a
+        `fecha_corte`). Usa el índice parcial `ix_venta_credito_abierta`.
+
+        Returns:
+            Filas con cliente_id, cliente, ventas_abiertas, dias_0_30,
+            dias_31_60, dias_61_90, dias_mas_90 y total, ordenadas por total desc.
+        """
+        limite_30 = fecha_corte - timedelta(days=30)
+        limite_60 = fecha_corte - timedelta(days=60)
+        limite_90 = fecha_corte - timedelta(days=90)
+        saldo = Venta.saldo_restante
+
+        def tramo(condicion):
+            return func.sum(case((condicion, saldo), else_=0.0))
+
+        stmt = (
+            select(
+                Venta.cliente_id,
+                Cliente.nombre.label("cliente"),
+                func.count(Venta.id).label("ventas_abiertas"),
+                tramo(Venta.fecha >= limite_30).label("dias_0_30"),
+                tramo(and_(Venta.fecha < limite_30, Venta.fecha >= limite_60)).label("dias_31_60"),
+                tramo(and_(Venta.fecha < limite_60, Venta.fecha >= limite_90)).label("dias_61_90"),
+                tramo(Venta.fecha < limite_90).label("dias_mas_90"),
+                func.sum(saldo).label("total"),
+            )
+            .join(Cliente, Cliente.id == Venta.cliente_id)
+            .where(Venta.saldo_restante > SALDO_CERO, Venta.fecha <= fecha_corte)
+            .group_by(Venta.cliente_id, Cliente.nombre)
+            .order_by(func.sum(saldo).desc(), Venta.cliente_id.asc())
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
+
+    async def bloquear_uuids(
+        self,
+        uuids: List[UUID],
+        session: AsyncSession
+    ) -> None:
+        """
+        Toma un advisory lock de transacción por cada UUID de terminal (en
+        orden, con una sola consulta), para que dos sincronizaciones con
+        ventas en común se serialicen: la segunda espera el commit de la
+        primera y ve sus ventas como ya registradas.
+        """
+        if not uuids:
+            return
+        # 64 bits altos del UUID como clave bigint con signo.
+        claves = sorted({int.from_bytes(u.bytes[:8], "big", signed=True) for u in uuids})
+        clave = func.unnest(literal(claves, ARRAY(BigInteger))).column_valued("clave")
+        await session.execute(select(func.count(func.pg_advisory_xact_lock(clave))))
+
+    async def ids_por_uuid(
+        self,
+        uuids: List[UUID],
+        session: AsyncSession
+    ) -> Dict[UUID, int]:
+        """
+        Retorna {uuid_terminal: venta_id} de las ventas ya registradas con
+        alguno de los UUID indicados.
+        """
+        if not uuids:
+            return {}
+        stmt = select(Venta.uuid_terminal, Venta.id).where(Venta.uuid_terminal.in_(uuids))
+        return {u: vid for u, vid in (await session.execute(stmt)).all()}
+
+    async def bulk_create_ventas(
+        self,
+        filas: List[Dict[str, Any]],
+        session: AsyncSession
+    ) -> List[int]:
+        """
+        Inserta varias ventas con un único INSERT ... RETURNING y retorna sus
+        IDs en el mismo orden de `filas`.
+        """
+        if not filas:
+            return []
+        stmt = insert(Venta).returning(Venta.id, sort_by_parameter_order=True)
+        result = await session.execute(stmt, filas)
+        return list(result.scalars().all())
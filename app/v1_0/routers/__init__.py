@@ -13,6 +13,8 @@ from app.v1_0.routers.utilidad_router import router as utilidad_router
 from app.v1_0.routers.auth_router import router as auth_router
 from app.v1_0.routers.banco_router import router as banco_router
 from app.v1_0.routers.estado_router import router as estado_router  
+from app.v1_0.routers.cartera_router import router as cartera_router
+from app.v1_0.routers.admin_router import router as admin_router
 defined_routers = [
     venta_router,
     compra_router,
@@ -28,5 +30,7 @@ defined_routers = [
     utilidad_router, 
     auth_router,
     banco_router,
-    estado_router
+    estado_router,
+    cartera_router,
+    admin_router
 ]
\ No newline at end of file
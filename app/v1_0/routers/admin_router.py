@@ -0,0 +1,183 @@
+# app/v1_0/routers/admin_router.py
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.utils.admision import admision_reportes
+from app.utils.database.consultas_lentas import consultas_lentas
+from app.utils.database.db_connector import engine, read_engine, report_engine, settings, DATABASE_PERFIL
+from app.utils.database.pool import estadisticas_pool
+from app.utils.database.transacciones import estadisticas_reintento
+from app.utils.memoria import rastreador_memoria
+from app.utils.perfilador import formato_colapsado, perfilador
+from app.v1_0.entities import (
+    ConsultaLentaDTO,
+    EstadisticaMemoriaDTO,
+    EstadoPoolDTO,
+    MemoriaRutaDTO,
+    SnapshotMemoriaDTO,
+)
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+ENGINES = {"oltp": engine, "lectura": read_engine, "reportes": report_engine}
+
+
+@router.get(
+    "/db/pool",
+    response_model=EstadoPoolDTO,
+    summary="Estado del pool de conexiones (en uso, overflow, espera) y reintentos",
+)
+async def estado_pool(
+    pool: Literal["oltp", "lectura", "reportes"] = Query("oltp", description="Pool a consultar"),
+) -> EstadoPoolDTO:
+    return EstadoPoolDTO(
+        perfil=DATABASE_PERFIL,
+        reintentos=estadisticas_reintento(),
+        **estadisticas_pool(ENGINES[pool]),
+    )
+
+
+@router.get(
+    "/admision",
+    response_model=Dict[str, Dict[str, int]],
+    summary="Estado del control de admisión por clase de carga",
+)
+async def estado_admision() -> Dict[str, Dict[str, int]]:
+    return {admision_reportes.nombre: admision_reportes.estadisticas()}
+
+
+@router.get(
+    "/db/consultas-lentas",
+    response_model=List[ConsultaLentaDTO],
+    summary="Últimas consultas lentas con parámetros redactados y plan de ejecución muestreado",
+)
+async def listar_consultas_lentas(
+    limite: int = Query(50, ge=1, le=1000, description="Cantidad máxima de consultas"),
+) -> List[ConsultaLentaDTO]:
+    return [ConsultaLentaDTO(**c) for c in consultas_lentas.consultas()[:limite]]
+
+
+@router.delete(
+    "/db/consultas-lentas",
+    response_model=Dict[str, str],
+    summary="Vacía el registro de consultas lentas",
+)
+async def limpiar_consultas_lentas() -> Dict[str, str]:
+    consultas_lentas.limpiar()
+    return {"mensaje": "Registro de consultas lentas vaciado"}
+
+
+@router.post(
+    "/perfilador",
+    response_class=PlainTextResponse,
+    summary="Perfila el worker por muestreo durante N segundos (pilas colapsadas para flamegraph)",
+)
+async def perfilar(
+    segundos: float = Query(10, gt=0, description="Duración del muestreo (tope: perfilador.max_segundos)"),
+    intervalo_ms: float = Query(5, ge=1, le=1000, description="Milisegundos entre muestras"),
+    hilos: Literal["loop", "todos"] = Query(
+        "loop", description="Sólo el hilo del event loop o todos los hilos del proceso"
+    ),
+) -> PlainTextResponse:
+    try:
+        pilas = await perfilador.muestrear_loop(segundos, intervalo_ms / 1000, solo_loop=hilos == "loop")
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    nombre = f"perfil-{datetime.now():%Y%m%d-%H%M%S}.folded"
+    return PlainTextResponse(
+        formato_colapsado(pilas),
+        headers={"Content-Disposition": f'attachment; filename="{nombre}"'},
+    )
+
+
+AgrupacionMemoria = Literal["lineno", "filename", "traceback"]
+
+
+def _snapshot_dto(datos: Dict) -> SnapshotMemoriaDTO:
+    return SnapshotMemoriaDTO(
+        actual_kb=datos["actual_kb"],
+        pico_kb=datos["pico_kb"],
+        estadisticas=[EstadisticaMemoriaDTO(**e) for e in datos["estadisticas"]],
+    )
+
+
+@router.post(
+    "/memoria/iniciar",
+    response_model=Dict[str, str],
+    summary="Activa tracemalloc en este worker (tiene costo de CPU y memoria)",
+)
+async def iniciar_memoria(
+    frames: Optional[int] = Query(None, ge=1, le=100, description="Frames guardados por asignación"),
+) -> Dict[str, str]:
+    rastreador_memoria.iniciar(frames or settings.get("memoria.frames", 10))
+    return {"mensaje": "tracemalloc activo"}
+
+
+@router.post(
+    "/memoria/detener",
+    response_model=Dict[str, str],
+    summary="Desactiva tracemalloc y descarta el snapshot base",
+)
+async def detener_memoria() -> Dict[str, str]:
+    rastreador_memoria.detener()
+    return {"mensaje": "tracemalloc detenido"}
+
+
+@router.get(
+    "/memoria/snapshot",
+    response_model=SnapshotMemoriaDTO,
+    summary="Mayores asignaciones vivas; el snapshot queda como base para /memoria/diff",
+)
+async def snapshot_memoria(
+    agrupar: AgrupacionMemoria = Query("lineno"),
+    limite: int = Query(25, ge=1, le=500),
+) -> SnapshotMemoriaDTO:
+    try:
+        # take_snapshot retiene el GIL mientras copia las trazas y la agrupación
+        # lo cede sólo cada pocos ms: aun en un hilo, el worker queda detenido
+        # o muy lento mientras dura (ver memoria.activo en config.yml).
+        return _snapshot_dto(await asyncio.to_thread(rastreador_memoria.snapshot, agrupar, limite))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get(
+    "/memoria/diff",
+    response_model=SnapshotMemoriaDTO,
+    summary="Crecimiento de memoria por ubicación desde el snapshot base",
+)
+async def diff_memoria(
+    agrupar: AgrupacionMemoria = Query("lineno"),
+    limite: int = Query(25, ge=1, le=500),
+    actualizar_base: bool = Query(False, description="Usar este snapshot como nueva base"),
+) -> SnapshotMemoriaDTO:
+    try:
+        return _snapshot_dto(
+            await asyncio.to_thread(rastreador_memoria.diff, agrupar, limite, actualizar_base)
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get(
+    "/memoria/rutas",
+    response_model=List[MemoriaRutaDTO],
+    summary="Pico de memoria asignada por ruta, de mayor a menor",
+)
+async def memoria_por_ruta() -> List[MemoriaRutaDTO]:
+    return [MemoriaRutaDTO(**r) for r in rastreador_memoria.rutas()]
+
+
+@router.delete(
+    "/memoria/rutas",
+    response_model=Dict[str, str],
+    summary="Reinicia las mediciones de memoria por ruta",
+)
+async def reiniciar_memoria_por_ruta() -> Dict[str, str]:
+    rastreador_memoria.reiniciar_rutas()
+    return {"mensaje": "Mediciones de memoria por ruta reiniciadas"}
@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, Depends, Body, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 
 from app.v1_0.entities import BancoDTO
@@ -48,7 +48,7 @@ async def crear_banco(
 )
 @inject
 async def listar_bancos(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     banco_service: BancoService = Depends(
         Provide[ApplicationContainer.api_container.banco_service]
     ),
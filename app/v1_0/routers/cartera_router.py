@@ -0,0 +1,111 @@
+# app/v1_0/routers/cartera_router.py
+
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from dependency_injector.wiring import inject, Provide
+
+from app.utils.admision import admision_reportes
+from app.utils.database.db_connector import get_report_db
+from app.app_containers import ApplicationContainer
+from app.v1_0.entities import CarteraClientesDTO, CarteraProveedoresDTO, CarteraProveedorDetalleDTO
+from app.v1_0.services.cartera_service import CarteraService
+
+# Reportes pesados: pool de reportes y control de admisión (429 si se satura).
+router = APIRouter(
+    prefix="/cartera",
+    tags=["Cartera"],
+    dependencies=[Depends(admision_reportes.dependencia)],
+)
+
+
+@router.get(
+    "/clientes",
+    response_model=CarteraClientesDTO,
+    summary="Cuentas por cobrar por cliente y por edad",
+)
+@inject
+async def cartera_clientes(
+    fecha_corte: Optional[datetime] = Query(None, description="Fecha de corte (por defecto, ahora)"),
+    db: AsyncSession = Depends(get_report_db),
+    cartera_service: CarteraService = Depends(
+        Provide[ApplicationContainer.api_container.cartera_service]
+    ),
+) -> CarteraClientesDTO:
+    return await cartera_service.cartera_clientes(db, fecha_corte=fecha_corte)
+
+
+@router.get(
+    "/clientes/exportar",
+    response_class=Response,
+    summary="Exporta en CSV las cuentas por cobrar por edad",
+)
+@inject
+async def exportar_cartera_clientes(
+    fecha_corte: Optional[datetime] = Query(None, description="Fecha de corte (por defecto, ahora)"),
+    db: AsyncSession = Depends(get_report_db),
+    cartera_service: CarteraService = Depends(
+        Provide[ApplicationContainer.api_container.cartera_service]
+    ),
+):
+    contenido = await cartera_service.exportar_cartera_clientes(db, fecha_corte=fecha_corte)
+    return Response(
+        content=contenido,
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="cartera_clientes.csv"'},
+    )
+
+
+@router.get(
+    "/proveedores",
+    response_model=CarteraProveedoresDTO,
+    summary="Cuentas por pagar por proveedor y por edad",
+)
+@inject
+async def cartera_proveedores(
+    fecha_corte: Optional[datetime] = Query(None, description="Fecha de corte (por defecto, ahora)"),
+    db: AsyncSession = Depends(get_report_db),
+    cartera_service: CarteraService = Depends(
+        Provide[ApplicationContainer.api_container.cartera_service]
+    ),
+) -> CarteraProveedoresDTO:
+    return await cartera_service.cartera_proveedores(db, fecha_corte=fecha_corte)
+
+
+@router.get(
+    "/proveedores/exportar",
+    response_class=Response,
+    summary="Exporta en CSV las cuentas por pagar por edad",
+)
+@inject
+async def exportar_cartera_proveedores(
+    fecha_corte: Optional[datetime] = Query(None, description="Fecha de corte (por defecto, ahora)"),
+    db: AsyncSession = Depends(get_report_db),
+    cartera_service: CarteraService = Depends(
+        Provide[ApplicationContainer.api_container.cartera_service]
+    ),
+):
+    contenido = await cartera_service.exportar_cartera_proveedores(db, fecha_corte=fecha_corte)
+    return Response(
+        content=contenido,
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="cartera_proveedores.csv"'},
+    )
+
+
+@router.get(
+    "/proveedores/{proveedor_id}",
+    response_model=CarteraProveedorDetalleDTO,
+    summary="Compras a crédito abiertas de un proveedor con su historial de pagos",
+)
+@inject
+async def detalle_cartera_proveedor(
+    proveedor_id: int,
+    db: AsyncSession = Depends(get_report_db),
+    cartera_service: CarteraService = Depends(
+        Provide[ApplicationContainer.api_container.cartera_service]
+    ),
+) -> CarteraProveedorDetalleDTO:
+    return await cartera_service.detalle_proveedor(proveedor_id, db=db)
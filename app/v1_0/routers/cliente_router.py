@@ -1,13 +1,14 @@
+from io import TextIOWrapper
 from typing import Dict, List
-from fastapi import APIRouter, HTTPException, Depends, Query, Body
+from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 
 # Solo DTOs de entidades para salida. Schemas sólo para entrada.
-from app.v1_0.entities import ClienteDTO, ClienteListDTO, ClientesPageDTO, ListClienteDTO
+from app.v1_0.entities import ClienteDTO, ClienteListDTO, ClientesPageDTO, ListClienteDTO, ImportacionResultadoDTO
 from app.v1_0.schemas.cliente_schema import ClienteRequestDTO
 from app.v1_0.services.cliente_service import ClienteService
 
@@ -47,6 +48,28 @@ async def crear_cliente(
     )
 
 
+@router.post(
+    "/importar",
+    response_model=ImportacionResultadoDTO,
+    summary="Importa clientes en bloque desde un CSV (upsert por cc_nit)",
+)
+@inject
+async def importar_clientes(
+    archivo: UploadFile = File(..., description="CSV con encabezados cc_nit, nombre, direccion, ciudad, celular, correo"),
+    db: AsyncSession = Depends(get_db),
+    cliente_service: ClienteService = Depends(
+        Provide[ApplicationContainer.api_container.cliente_service]
+    ),
+) -> ImportacionResultadoDTO:
+    texto = TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+    try:
+        return await cliente_service.importar_clientes(texto, db)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        texto.detach()
+
+
 @router.get(
     "/",
     response_model=ClientesPageDTO,
@@ -55,7 +78,7 @@ async def crear_cliente(
 @inject
 async def listar_clientes(
     page: int = Query(1, ge=1, description="Número de página"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     cliente_service: ClienteService = Depends(
         Provide[ApplicationContainer.api_container.cliente_service]
     ),
@@ -70,13 +93,29 @@ async def listar_clientes(
 )
 @inject
 async def listar_clientes_all(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     cliente_service: ClienteService = Depends(
         Provide[ApplicationContainer.api_container.cliente_service]
     ),
 ) -> List[ListClienteDTO]:
     return await cliente_service.listar_clientes_all(db=db)
 
+@router.get(
+    "/buscar",
+    response_model=List[ClienteListDTO],
+    summary="Busca clientes por prefijo de cc_nit o por nombre",
+)
+@inject
+async def buscar_clientes(
+    q: str = Query(..., min_length=1, description="Prefijo de cc_nit o parte del nombre"),
+    limite: int = Query(20, ge=1, le=100, description="Máximo de resultados"),
+    db: AsyncSession = Depends(get_read_db),
+    cliente_service: ClienteService = Depends(
+        Provide[ApplicationContainer.api_container.cliente_service]
+    ),
+) -> List[ClienteListDTO]:
+    return await cliente_service.buscar_clientes(q, limite, db=db)
+
 @router.get(
     "/{cliente_id}",
     response_model=ClienteListDTO,
@@ -85,7 +124,7 @@ async def listar_clientes_all(
 @inject
 async def obtener_cliente_por_id(
     cliente_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     cliente_service: ClienteService = Depends(
         Provide[ApplicationContainer.api_container.cliente_service]
     ),
@@ -169,6 +208,22 @@ async def actualizar_saldo_cliente(
     )
 
 
+@router.post(
+    "/recalcular-saldos",
+    response_model=Dict[str, int],
+    summary="Recalcula el saldo de todos los clientes a partir de sus ventas a crédito",
+)
+@inject
+async def recalcular_saldos_clientes(
+    db: AsyncSession = Depends(get_db),
+    cliente_service: ClienteService = Depends(
+        Provide[ApplicationContainer.api_container.cliente_service]
+    ),
+):
+    actualizados = await cliente_service.recompute_saldos_clientes(db)
+    return {"actualizados": actualizados}
+
+
 @router.delete(
     "/eliminar/{cliente_id}",
     response_model=Dict[str, str],
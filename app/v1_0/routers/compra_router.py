@@ -1,13 +1,15 @@
 # app/v1_0/routers/compra_router.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.schemas.compra_schema import CompraResponse, CompraRequestDTO
 from app.v1_0.entities.compraDTO import CompraDTO
+from app.v1_0.services.idempotencia_service import IdempotenciaService
 
 router = APIRouter(prefix="/compras", tags=["Compras"])
 
@@ -19,18 +21,29 @@ router = APIRouter(prefix="/compras", tags=["Compras"])
 @inject
 async def crear_compra(
     request: CompraRequestDTO ,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: AsyncSession = Depends(get_db),
-    compra_service=Depends(Provide[ApplicationContainer.api_container.compra_service])
+    compra_service=Depends(Provide[ApplicationContainer.api_container.compra_service]),
+    idempotencia_service: IdempotenciaService = Depends(
+        Provide[ApplicationContainer.api_container.idempotencia_service]
+    )
 ):
     if not request.carrito:
         raise HTTPException(status_code=400, detail="El carrito no puede estar vacío")
 
     detalles = compra_service.construir_detalles(request.carrito)
-    compra = await compra_service.registrar_compra(
-        proveedor_id=request.proveedor_id,
-        banco_id=request.banco_id,
-        estado_id=request.estado_id,
-        detalles=detalles,
+    compra = await idempotencia_service.ejecutar(
+        idempotency_key,
+        "POST /compras/crear",
+        request.model_dump(),
+        lambda: compra_service.registrar_compra(
+            proveedor_id=request.proveedor_id,
+            banco_id=request.banco_id,
+            estado_id=request.estado_id,
+            detalles=detalles,
+            db=db
+        ),
+        modelo=CompraResponse,
         db=db
     )
     return compra
@@ -43,7 +56,7 @@ async def crear_compra(
 @inject
 async def obtener_compra(
     compra_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     compra_service=Depends(Provide[ApplicationContainer.api_container.compra_service])
 ):
     return await compra_service.obtener_compra(compra_id, db=db)
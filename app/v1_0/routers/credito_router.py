@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.schemas.credito_schema import CreditoRequestDTO, CreditoResponseDTO
 from app.v1_0.entities import CreditoDTO
@@ -45,7 +45,7 @@ async def crear_credito(
 @inject
 async def obtener_credito(
     credito_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     credito_service=Depends(Provide[ApplicationContainer.api_container.credito_service])
 ):
     """
@@ -65,7 +65,7 @@ async def obtener_credito(
 )
 @inject
 async def listar_creditos(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     credito_service=Depends(Provide[ApplicationContainer.api_container.credito_service])
 ):
     """
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.services.estado_service import EstadoService
 from app.v1_0.entities import EstadoDTO
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/estados", tags=["Estados"])
 )
 @inject
 async def listar_estados(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     estado_service: EstadoService = Depends(
         Provide[ApplicationContainer.api_container.estado_service]
     ),
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.schemas.gasto_schema import GastoRequestDTO, GastoResponseDTO
 from app.v1_0.entities import GastoDTO
@@ -47,7 +47,7 @@ async def crear_gasto(
 @inject
 async def listar_gastos_por_categoria(
     categoria_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     gasto_service=Depends(Provide[ApplicationContainer.api_container.gasto_service])
 ):
     """
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.schemas.inversion_schema import InversionRequestDTO, InversionResponseDTO, InversionUpdateDTO
 from app.v1_0.entities import InversionDTO
@@ -48,7 +48,7 @@ async def crear_inversion(
 @inject
 async def obtener_inversion(
     inversion_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     inversion_service=Depends(Provide[ApplicationContainer.api_container.inversion_service])
 ):
     inv = await inversion_service.obtener_inversion(inversion_id, db=db)
@@ -66,7 +66,7 @@ async def obtener_inversion(
 )
 @inject
 async def listar_inversiones(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     inversion_service=Depends(Provide[ApplicationContainer.api_container.inversion_service])
 ):
     inversiones = await inversion_service.listar_inversiones(db=db)
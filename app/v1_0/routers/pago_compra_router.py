@@ -1,13 +1,15 @@
 # app/v1_0/routers/pago_router.py
 
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
+from app.v1_0.services.idempotencia_service import IdempotenciaService
 from app.v1_0.schemas.pago_venta_schema import PagoRequestDTO
+from app.v1_0.schemas.pago_compra_schema import PagoMasivoCompraRequestDTO
 from app.v1_0.entities import PagoResponseDTO
 
 router = APIRouter(
@@ -24,16 +26,61 @@ router = APIRouter(
 async def crear_pago_compra(
     compra_id: int,
     request: PagoRequestDTO,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: AsyncSession = Depends(get_db),
-    pago_compra_service=Depends(Provide[ApplicationContainer.api_container.pago_compra_service])
+    pago_compra_service=Depends(Provide[ApplicationContainer.api_container.pago_compra_service]),
+    idempotencia_service: IdempotenciaService = Depends(
+        Provide[ApplicationContainer.api_container.idempotencia_service]
+    )
 ):
     """
     Body: { "banco_id": int, "monto": float }
     """
-    return await pago_compra_service.crear_pago_compra(
-        compra_id=compra_id,
-        banco_id=request.banco_id,
-        monto=request.monto,
+    return await idempotencia_service.ejecutar(
+        idempotency_key,
+        "POST /pagos/compras/{compra_id}",
+        {"compra_id": compra_id, **request.model_dump()},
+        lambda: pago_compra_service.crear_pago_compra(
+            compra_id=compra_id,
+            banco_id=request.banco_id,
+            monto=request.monto,
+            db=db
+        ),
+        modelo=PagoResponseDTO,
+        db=db
+    )
+
+@router.post(
+    "/compras/proveedor/{proveedor_id}",
+    response_model=List[PagoResponseDTO],
+    summary="Reparte un pago entre varias compras a crédito de un proveedor"
+)
+@inject
+async def crear_pagos_compra_masivo(
+    proveedor_id: int,
+    request: PagoMasivoCompraRequestDTO,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_db),
+    pago_compra_service=Depends(Provide[ApplicationContainer.api_container.pago_compra_service]),
+    idempotencia_service: IdempotenciaService = Depends(
+        Provide[ApplicationContainer.api_container.idempotencia_service]
+    )
+):
+    """
+    Body: { "banco_id": int, "monto": float, "compra_ids": [int] | null }
+    """
+    return await idempotencia_service.ejecutar(
+        idempotency_key,
+        "POST /pagos/compras/proveedor/{proveedor_id}",
+        {"proveedor_id": proveedor_id, **request.model_dump()},
+        lambda: pago_compra_service.crear_pagos_compra_masivo(
+            proveedor_id=proveedor_id,
+            banco_id=request.banco_id,
+            monto=request.monto,
+            compra_ids=request.compra_ids,
+            db=db
+        ),
+        modelo=List[PagoResponseDTO],
         db=db
     )
 
@@ -45,7 +92,7 @@ async def crear_pago_compra(
 @inject
 async def listar_pagos_compra(
     compra_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     pago_compra_service=Depends(Provide[ApplicationContainer.api_container.pago_compra_service])
 ):
     return await pago_compra_service.listar_pagos_compra(compra_id, db=db)
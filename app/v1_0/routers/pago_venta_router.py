@@ -1,13 +1,14 @@
 # app/v1_0/routers/pago_router.py
 
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
-from app.v1_0.schemas.pago_venta_schema import PagoRequestDTO
+from app.v1_0.services.idempotencia_service import IdempotenciaService
+from app.v1_0.schemas.pago_venta_schema import PagoRequestDTO, PagoMasivoVentaRequestDTO
 from app.v1_0.entities import PagoResponseDTO 
 
 router = APIRouter(
@@ -24,16 +25,61 @@ router = APIRouter(
 async def crear_pago_venta(
     venta_id: int,
     request: PagoRequestDTO,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: AsyncSession = Depends(get_db),
-    pago_venta_service=Depends(Provide[ApplicationContainer.api_container.pago_venta_service])
+    pago_venta_service=Depends(Provide[ApplicationContainer.api_container.pago_venta_service]),
+    idempotencia_service: IdempotenciaService = Depends(
+        Provide[ApplicationContainer.api_container.idempotencia_service]
+    )
 ):
     """
     Body: { "banco_id": int, "monto": float }
     """
-    return await pago_venta_service.crear_pago_venta(
-        venta_id=venta_id,
-        banco_id=request.banco_id,
-        monto=request.monto,
+    return await idempotencia_service.ejecutar(
+        idempotency_key,
+        "POST /pagos/ventas/{venta_id}",
+        {"venta_id": venta_id, **request.model_dump()},
+        lambda: pago_venta_service.crear_pago_venta(
+            venta_id=venta_id,
+            banco_id=request.banco_id,
+            monto=request.monto,
+            db=db
+        ),
+        modelo=PagoResponseDTO,
+        db=db
+    )
+
+@router.post(
+    "/ventas/cliente/{cliente_id}",
+    response_model=List[PagoResponseDTO],
+    summary="Reparte un abono entre varias ventas a crédito de un cliente"
+)
+@inject
+async def crear_pagos_venta_masivo(
+    cliente_id: int,
+    request: PagoMasivoVentaRequestDTO,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_db),
+    pago_venta_service=Depends(Provide[ApplicationContainer.api_container.pago_venta_service]),
+    idempotencia_service: IdempotenciaService = Depends(
+        Provide[ApplicationContainer.api_container.idempotencia_service]
+    )
+):
+    """
+    Body: { "banco_id": int, "monto": float, "venta_ids": [int] | null }
+    """
+    return await idempotencia_service.ejecutar(
+        idempotency_key,
+        "POST /pagos/ventas/cliente/{cliente_id}",
+        {"cliente_id": cliente_id, **request.model_dump()},
+        lambda: pago_venta_service.crear_pagos_venta_masivo(
+            cliente_id=cliente_id,
+            banco_id=request.banco_id,
+            monto=request.monto,
+            venta_ids=request.venta_ids,
+            db=db
+        ),
+        modelo=List[PagoResponseDTO],
         db=db
     )
 
@@ -45,7 +91,7 @@ async def crear_pago_venta(
 @inject
 async def listar_pagos_venta(
     venta_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     pago_venta_service=Depends(Provide[ApplicationContainer.api_container.pago_venta_service])
 ):
     return await pago_venta_service.listar_pagos_venta(venta_id, db=db)
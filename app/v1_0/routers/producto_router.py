@@ -1,18 +1,44 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, Query, Body
+import asyncio
+import json
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.admision import admision_reportes
+from app.utils.database.db_connector import get_db, get_read_db, get_report_db
+from app.utils.eventos import broker_productos, RESYNC
 from app.app_containers import ApplicationContainer
 
-from app.v1_0.entities import ProductoDTO, ProductoListDTO, ProductosPageDTO
-from app.v1_0.schemas.producto_schema import ProductoRequestDTO
+from app.v1_0.entities import (
+    ProductoDTO,
+    ProductoListDTO,
+    ProductosPageDTO,
+    ProductoUpsertResultadoDTO,
+    AjustePreciosResultadoDTO,
+    ConteoInventarioResultadoDTO,
+    KardexProductoDTO,
+    StockAFechaDTO,
+    CierreKardexDTO,
+    ProductoBajoStockDTO,
+)
+from app.v1_0.schemas.producto_schema import (
+    ProductoRequestDTO,
+    ProductoUpsertRequestDTO,
+    AjustePreciosRequestDTO,
+    ConteoInventarioRequestDTO,
+)
 
 from app.v1_0.services.producto_service import ProductoService
+from app.v1_0.services.kardex_service import KardexService
 
 router = APIRouter(prefix="/productos", tags=["Productos"])
 
+# Intervalo de comentarios keep-alive en el stream SSE (segundos).
+SSE_KEEPALIVE = 15
+
 
 @router.post(
     "/crear",
@@ -27,7 +53,7 @@ async def crear_producto(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
 ):
-    dto = ProductoDTO(**request.model_dump())
+    dto = ProductoDTO(**request.model_dump(exclude_none=True))
     try:
         creado = await producto_service.crear_producto(dto, db)
     except ValueError as e:
@@ -42,9 +68,69 @@ async def crear_producto(
         precio_venta=creado.precio_venta,
         activo=creado.activo,
         fecha_creacion=creado.fecha_creacion,
+        stock_minimo=creado.stock_minimo,
     )
 
 
+@router.post(
+    "/upsert",
+    response_model=ProductoUpsertResultadoDTO,
+    summary="Crea o actualiza productos en bloque por referencia",
+)
+@inject
+async def upsert_productos(
+    request: ProductoUpsertRequestDTO,
+    db: AsyncSession = Depends(get_db),
+    producto_service: ProductoService = Depends(
+        Provide[ApplicationContainer.api_container.producto_service]
+    ),
+):
+    dtos = [ProductoDTO(**p.model_dump(exclude_none=True)) for p in request.productos]
+    try:
+        return await producto_service.upsert_productos(dtos, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/ajustar-precios",
+    response_model=AjustePreciosResultadoDTO,
+    summary="Ajusta en un porcentaje los precios de los productos filtrados",
+)
+@inject
+async def ajustar_precios(
+    request: AjustePreciosRequestDTO,
+    db: AsyncSession = Depends(get_db),
+    producto_service: ProductoService = Depends(
+        Provide[ApplicationContainer.api_container.producto_service]
+    ),
+):
+    try:
+        return await producto_service.ajustar_precios(db=db, **request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/conteo",
+    response_model=ConteoInventarioResultadoDTO,
+    summary="Aplica un conteo físico de inventario (ajuste masivo de stock)",
+)
+@inject
+async def registrar_conteo(
+    request: ConteoInventarioRequestDTO,
+    db: AsyncSession = Depends(get_db),
+    producto_service: ProductoService = Depends(
+        Provide[ApplicationContainer.api_container.producto_service]
+    ),
+):
+    conteo = [(item.referencia, item.cantidad) for item in request.items]
+    try:
+        return await producto_service.registrar_conteo(conteo, request.observacion, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get(
     "/",
     response_model=ProductosPageDTO,
@@ -53,7 +139,7 @@ async def crear_producto(
 @inject
 async def listar_productos(
     page: int = Query(1, ge=1, description="Número de página"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     producto_service: ProductoService = Depends(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
@@ -68,7 +154,7 @@ async def listar_productos(
 )
 @inject
 async def listar_productos_all(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     producto_service: ProductoService = Depends(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
@@ -83,7 +169,7 @@ async def listar_productos_all(
 @inject
 async def obtener_producto(
     referencia: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     producto_service: ProductoService = Depends(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
@@ -101,6 +187,7 @@ async def obtener_producto(
         precio_venta=prod.precio_venta,
         activo=prod.activo,
         fecha_creacion=prod.fecha_creacion,
+        stock_minimo=prod.stock_minimo,
     )
 
 
@@ -112,7 +199,7 @@ async def obtener_producto(
 @inject
 async def buscar_productos(
     descripcion: str = Query(..., description="Texto a buscar en la descripción"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     producto_service: ProductoService = Depends(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
@@ -128,10 +215,60 @@ async def buscar_productos(
             precio_venta=p.precio_venta,
             activo=p.activo,
             fecha_creacion=p.fecha_creacion,
+            stock_minimo=p.stock_minimo,
         )
         for p in resultados
     ]
 
+@router.get(
+    "/stream",
+    summary="Stream SSE de cambios de stock, precio y estado de productos",
+    response_class=StreamingResponse,
+)
+async def stream_productos(request: Request):
+    """
+    Server-Sent Events. Cada evento `productos` trae la lista de productos
+    cambiados en una transacción confirmada como
+    {id, cantidad, precio_venta, activo} (o {id, eliminado: true}).
+    Un evento `resync` indica que se perdieron eventos y hay que recargar
+    el listado completo.
+    """
+    async def eventos():
+        async with broker_productos.suscribir() as cola:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    evento = await asyncio.wait_for(cola.get(), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if evento is RESYNC:
+                    yield "event: resync\ndata: {}\n\n"
+                else:
+                    datos = json.dumps(evento, separators=(",", ":"))
+                    yield f"event: productos\ndata: {datos}\n\n"
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get(
+    "/bajo-stock",
+    response_model=List[ProductoBajoStockDTO],
+    summary="Lista los productos activos en o bajo su stock mínimo",
+)
+@inject
+async def listar_bajo_stock(
+    limite: int = Query(200, ge=1, le=1000, description="Máximo de productos"),
+    db: AsyncSession = Depends(get_read_db),
+    producto_service: ProductoService = Depends(
+        Provide[ApplicationContainer.api_container.producto_service]
+    ),
+) -> List[ProductoBajoStockDTO]:
+    return await producto_service.listar_bajo_stock(limite, db)
+
 @router.get(
     "/{producto_id}",
     response_model=ProductoListDTO,
@@ -140,7 +277,7 @@ async def buscar_productos(
 @inject
 async def obtener_producto_por_id(
     producto_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     producto_service: ProductoService = Depends(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
@@ -158,6 +295,7 @@ async def obtener_producto_por_id(
         precio_venta=prod.precio_venta,
         activo=prod.activo,
         fecha_creacion=prod.fecha_creacion,
+        stock_minimo=prod.stock_minimo,
     )
 
 
@@ -175,7 +313,7 @@ async def actualizar_producto(
         Provide[ApplicationContainer.api_container.producto_service]
     ),
 ):
-    dto = ProductoDTO(**request.model_dump())
+    dto = ProductoDTO(**request.model_dump(exclude_none=True))
     try:
         actualizado = await producto_service.actualizar_producto(producto_id, dto, db)
     except ValueError as e:
@@ -190,6 +328,7 @@ async def actualizar_producto(
         precio_venta=actualizado.precio_venta,
         activo=actualizado.activo,
         fecha_creacion=actualizado.fecha_creacion,
+        stock_minimo=actualizado.stock_minimo,
     )
 
 
@@ -242,6 +381,7 @@ async def cambiar_estado(
         precio_venta=mod.precio_venta,
         activo=mod.activo,
         fecha_creacion=mod.fecha_creacion,
+        stock_minimo=mod.stock_minimo,
     )
 
 
@@ -273,6 +413,7 @@ async def aumentar_stock(
         precio_venta=mod.precio_venta,
         activo=mod.activo,
         fecha_creacion=mod.fecha_creacion,
+        stock_minimo=mod.stock_minimo,
     )
 
 
@@ -305,4 +446,95 @@ async def disminuir_stock(
         precio_venta=mod.precio_venta,
         activo=mod.activo,
         fecha_creacion=mod.fecha_creacion,
+        stock_minimo=mod.stock_minimo,
+    )
+
+
+@router.post(
+    "/kardex/cierre",
+    response_model=CierreKardexDTO,
+    summary="Genera un punto de control (snapshot) del kardex",
+)
+@inject
+async def cerrar_kardex(
+    db: AsyncSession = Depends(get_db),
+    kardex_service: KardexService = Depends(
+        Provide[ApplicationContainer.api_container.kardex_service]
+    ),
+):
+    return await kardex_service.cerrar_periodo(db)
+
+
+@router.get(
+    "/{producto_id}/kardex",
+    response_model=KardexProductoDTO,
+    summary="Historial de movimientos de inventario de un producto",
+    dependencies=[Depends(admision_reportes.dependencia)],
+)
+@inject
+async def kardex_producto(
+    producto_id: int,
+    desde: Optional[datetime] = Query(None, description="Inicio del rango (exclusivo); por defecto hace 30 días"),
+    hasta: Optional[datetime] = Query(None, description="Fin del rango (inclusivo); por defecto ahora"),
+    limite: int = Query(500, ge=1, le=5000, description="Máximo de movimientos"),
+    db: AsyncSession = Depends(get_report_db),
+    kardex_service: KardexService = Depends(
+        Provide[ApplicationContainer.api_container.kardex_service]
+    ),
+):
+    try:
+        return await kardex_service.historial(producto_id, limite, db, desde=desde, hasta=hasta)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get(
+    "/{producto_id}/stock-a-fecha",
+    response_model=StockAFechaDTO,
+    summary="Stock de un producto al cierre de una fecha",
+)
+@inject
+async def stock_a_fecha(
+    producto_id: int,
+    fecha: datetime = Query(..., description="Fecha y hora de corte"),
+    db: AsyncSession = Depends(get_read_db),
+    kardex_service: KardexService = Depends(
+        Provide[ApplicationContainer.api_container.kardex_service]
+    ),
+):
+    try:
+        return await kardex_service.stock_a_fecha(producto_id, fecha, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.patch(
+    "/{producto_id}/stock-minimo",
+    response_model=ProductoListDTO,
+    summary="Define el punto de reorden de un producto",
+)
+@inject
+async def actualizar_stock_minimo(
+    producto_id: int,
+    stock_minimo: int = Body(..., embed=True, ge=0, description="Nuevo stock mínimo"),
+    db: AsyncSession = Depends(get_db),
+    producto_service: ProductoService = Depends(
+        Provide[ApplicationContainer.api_container.producto_service]
+    ),
+):
+    try:
+        mod = await producto_service.actualizar_stock_minimo(producto_id, stock_minimo, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return ProductoListDTO(
+        id=mod.id,
+        referencia=mod.referencia,
+        descripcion=mod.descripcion,
+        cantidad=mod.cantidad,
+        precio_compra=mod.precio_compra,
+        precio_venta=mod.precio_venta,
+        activo=mod.activo,
+        fecha_creacion=mod.fecha_creacion,
+        stock_minimo=mod.stock_minimo,
     )
@@ -1,13 +1,14 @@
-from typing import Dict
-from fastapi import APIRouter, HTTPException, Depends, Query
+from io import TextIOWrapper
+from typing import Dict, List
+from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 
 # DTOs de entidades para salida. Schemas sólo para entrada.
-from app.v1_0.entities import ProveedorDTO, ProveedorListDTO, ProveedoresPageDTO
+from app.v1_0.entities import ProveedorDTO, ProveedorListDTO, ProveedoresPageDTO, ImportacionResultadoDTO
 from app.v1_0.schemas.proveedor_schema import ProveedorRequestDTO
 from app.v1_0.services.proveedor_service import ProveedorService
 
@@ -45,6 +46,28 @@ async def crear_proveedor(
     )
 
 
+@router.post(
+    "/importar",
+    response_model=ImportacionResultadoDTO,
+    summary="Importa proveedores en bloque desde un CSV (upsert por cc_nit)",
+)
+@inject
+async def importar_proveedores(
+    archivo: UploadFile = File(..., description="CSV con encabezados cc_nit, nombre, direccion, ciudad, celular, correo"),
+    db: AsyncSession = Depends(get_db),
+    proveedor_service: ProveedorService = Depends(
+        Provide[ApplicationContainer.api_container.proveedor_service]
+    ),
+) -> ImportacionResultadoDTO:
+    texto = TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+    try:
+        return await proveedor_service.importar_proveedores(texto, db)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        texto.detach()
+
+
 @router.get(
     "/",
     response_model=ProveedoresPageDTO,
@@ -53,7 +76,7 @@ async def crear_proveedor(
 @inject
 async def listar_proveedores(
     page: int = Query(1, ge=1, description="Número de página"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     proveedor_service: ProveedorService = Depends(
         Provide[ApplicationContainer.api_container.proveedor_service]
     ),
@@ -61,6 +84,22 @@ async def listar_proveedores(
     return await proveedor_service.listar_proveedores(page=page, db=db)
 
 
+@router.get(
+    "/buscar",
+    response_model=List[ProveedorListDTO],
+    summary="Busca proveedores por prefijo de cc_nit o por nombre",
+)
+@inject
+async def buscar_proveedores(
+    q: str = Query(..., min_length=1, description="Prefijo de cc_nit o parte del nombre"),
+    limite: int = Query(20, ge=1, le=100, description="Máximo de resultados"),
+    db: AsyncSession = Depends(get_read_db),
+    proveedor_service: ProveedorService = Depends(
+        Provide[ApplicationContainer.api_container.proveedor_service]
+    ),
+) -> List[ProveedorListDTO]:
+    return await proveedor_service.buscar_proveedores(q, limite, db=db)
+
 @router.get(
     "/{proveedor_id}",
     response_model=ProveedorListDTO,
@@ -69,7 +108,7 @@ async def listar_proveedores(
 @inject
 async def obtener_proveedor_por_id(
     proveedor_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     proveedor_service: ProveedorService = Depends(
         Provide[ApplicationContainer.api_container.proveedor_service]
     ),
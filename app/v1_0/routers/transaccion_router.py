@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 from datetime import datetime
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.entities import TransaccionPageDTO, TransaccionListDTO, TransaccionResponseDTO
 
@@ -64,7 +64,7 @@ async def eliminar_transaccion(
 @inject
 async def listar_transacciones(
     page: int = Query(1, ge=1, description="Número de página (1-based)"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     transaccion_service=Depends(Provide[ApplicationContainer.api_container.transaccion_service])
 ):
     return await transaccion_service.listar_transacciones(page, db)
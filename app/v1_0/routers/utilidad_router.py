@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 from typing import List
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_read_db
 from app.app_containers import ApplicationContainer
 from app.v1_0.entities import UtilidadListDTO, UtilidadPageDTO, DetalleUtilidadDTO
 from app.v1_0.services.utilidad_service import UtilidadService
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/utilidades", tags=["Utilidades"])
 @inject
 async def listar_utilidades(
     page: int = Query(1, ge=1, description="Número de página"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     service: UtilidadService = Depends(
         Provide[ApplicationContainer.api_container.utilidad_service]
     ),
@@ -34,7 +34,7 @@ async def listar_utilidades(
 @inject
 async def obtener_por_venta_id(
     venta_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     service: UtilidadService = Depends(
         Provide[ApplicationContainer.api_container.utilidad_service]
     ),
@@ -53,7 +53,7 @@ async def obtener_por_venta_id(
 @inject
 async def obtener_detalles_por_venta(
     venta_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     service: UtilidadService = Depends(
         Provide[ApplicationContainer.api_container.utilidad_service]
     ),
@@ -1,19 +1,25 @@
 # app/v1_0/routers/venta_router.py
 
-from typing import Dict, List
-from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 from dependency_injector.wiring import inject, Provide
 
-from app.utils.database.db_connector import get_db
+from app.utils.database.db_connector import get_db, get_read_db
 from app.app_containers import ApplicationContainer
 
 # Schemas SOLO para entrada
-from app.v1_0.schemas.venta_schema import VentaRequestDTO
+from app.v1_0.schemas.venta_schema import VentaRequestDTO, SincronizarVentasRequestDTO
 
 # Entidades (salida)
-from app.v1_0.entities import VentaListDTO, VentasPageDTO, DetalleVentaViewDTO
+from app.v1_0.entities import (
+    VentaListDTO,
+    VentasPageDTO,
+    DetalleVentaViewDTO,
+    SincronizacionVentasDTO,
+)
 from app.v1_0.services.venta_service import VentaService
+from app.v1_0.services.idempotencia_service import IdempotenciaService
 
 router = APIRouter(prefix="/ventas", tags=["Ventas"])
 
@@ -26,24 +32,52 @@ router = APIRouter(prefix="/ventas", tags=["Ventas"])
 @inject
 async def crear_venta(
     request: VentaRequestDTO,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: AsyncSession = Depends(get_db),
     venta_service: VentaService = Depends(
         Provide[ApplicationContainer.api_container.venta_service]
     ),
+    idempotencia_service: IdempotenciaService = Depends(
+        Provide[ApplicationContainer.api_container.idempotencia_service]
+    ),
 ):
     if not request.carrito:
         raise HTTPException(status_code=400, detail="El carrito no puede estar vacío")
 
     # El servicio ahora recibe el carrito crudo y arma los DetalleVentaDTO internamente
-    return await venta_service.finalizar_venta(
-        cliente_id=request.cliente_id,
-        banco_id=request.banco_id,
-        estado_id=request.estado_id,
-        carrito=[c.model_dump() for c in request.carrito],  # si DetalleCarrito es pydantic
+    return await idempotencia_service.ejecutar(
+        idempotency_key,
+        "POST /ventas/crear",
+        request.model_dump(),
+        lambda: venta_service.finalizar_venta(
+            cliente_id=request.cliente_id,
+            banco_id=request.banco_id,
+            estado_id=request.estado_id,
+            carrito=[c.model_dump() for c in request.carrito],  # si DetalleCarrito es pydantic
+            db=db,
+        ),
+        modelo=VentaListDTO,
         db=db,
     )
 
 
+@router.post(
+    "/sincronizar",
+    response_model=SincronizacionVentasDTO,
+    summary="Sincroniza por lote las ventas registradas sin conexión en una terminal",
+)
+@inject
+async def sincronizar_ventas(
+    request: SincronizarVentasRequestDTO,
+    db: AsyncSession = Depends(get_db),
+    venta_service: VentaService = Depends(
+        Provide[ApplicationContainer.api_container.venta_service]
+    ),
+) -> SincronizacionVentasDTO:
+    # La deduplicación por UUID de cada venta hace el lote reintentable sin Idempotency-Key.
+    return await venta_service.sincronizar_ventas(request.ventas, db=db)
+
+
 @router.get(
     "/",
     response_model=VentasPageDTO,
@@ -52,7 +86,7 @@ async def crear_venta(
 @inject
 async def listar_ventas(
     page: int = Query(1, ge=1, description="Número de página"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     venta_service: VentaService = Depends(
         Provide[ApplicationContainer.api_container.venta_service]
     ),
@@ -68,7 +102,7 @@ async def listar_ventas(
 @inject
 async def obtener_venta(
     venta_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     venta_service: VentaService = Depends(
         Provide[ApplicationContainer.api_container.venta_service]
     ),
@@ -100,7 +134,7 @@ async def eliminar_venta(
 @inject
 async def listar_detalles_venta(
     venta_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     venta_service: VentaService = Depends(
         Provide[ApplicationContainer.api_container.venta_service]
     ),
@@ -0,0 +1,11 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class PagoMasivoCompraRequestDTO(BaseModel):
+    banco_id: int = Field(..., description="ID del banco desde el que se paga")
+    monto: float = Field(..., gt=0, description="Monto total a repartir")
+    compra_ids: Optional[List[int]] = Field(
+        None,
+        description="Compras a abonar en orden; si se omite, se abonan de la más antigua a la más reciente",
+    )
@@ -1,6 +1,15 @@
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 class PagoRequestDTO(BaseModel):
     banco_id: int
     monto: float
 
+
+class PagoMasivoVentaRequestDTO(BaseModel):
+    banco_id: int = Field(..., description="ID del banco que recibe el abono")
+    monto: float = Field(..., gt=0, description="Monto total a repartir")
+    venta_ids: Optional[List[int]] = Field(
+        None,
+        description="Ventas a abonar en orden; si se omite, se abonan de la más antigua a la más reciente",
+    )
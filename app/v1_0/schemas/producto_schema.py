@@ -1,3 +1,4 @@
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 class ProductoRequestDTO(BaseModel):
@@ -9,3 +10,43 @@ class ProductoRequestDTO(BaseModel):
     precio_compra: float = Field(..., ge=0, description="Precio de compra")
     precio_venta: float = Field(..., ge=0, description="Precio de venta")
     cantidad: int = Field(..., ge=0, description="Cantidad en stock inicial")
+    stock_minimo: Optional[int] = Field(None, ge=0, description="Punto de reorden; si se omite no se modifica")
+
+
+class ProductoUpsertRequestDTO(BaseModel):
+    """
+    DTO para la carga masiva de productos identificados por referencia.
+    """
+    productos: List[ProductoRequestDTO] = Field(
+        ...,
+        min_length=1,
+        description="Productos a crear o actualizar; la cantidad sólo se usa al crear",
+    )
+
+
+class AjustePreciosRequestDTO(BaseModel):
+    """
+    DTO para el ajuste porcentual de precios sobre los productos que cumplan los filtros.
+    """
+    porcentaje: float = Field(..., gt=-100, description="Variación porcentual, p. ej. 8 para +8%")
+    campo: Literal["precio_venta", "precio_compra"] = Field(
+        "precio_venta", description="Precio a ajustar"
+    )
+    referencia_prefijo: Optional[str] = Field(None, description="Sólo referencias que empiecen por este texto")
+    descripcion: Optional[str] = Field(None, description="Sólo productos cuya descripción contenga este texto")
+    proveedor_id: Optional[int] = Field(None, description="Sólo productos comprados alguna vez a este proveedor")
+    solo_activos: bool = Field(True, description="Excluir productos inactivos")
+    dry_run: bool = Field(False, description="Si es True sólo muestra el resultado, sin aplicar cambios")
+
+
+class ConteoItemDTO(BaseModel):
+    referencia: str = Field(..., description="Referencia del producto contado")
+    cantidad: int = Field(..., ge=0, description="Cantidad contada físicamente")
+
+
+class ConteoInventarioRequestDTO(BaseModel):
+    """
+    DTO para registrar un conteo físico de inventario (hoja de conteo).
+    """
+    items: List[ConteoItemDTO] = Field(..., min_length=1, description="Filas (referencia, cantidad contada)")
+    observacion: Optional[str] = Field(None, description="Nota que se guarda con cada ajuste")
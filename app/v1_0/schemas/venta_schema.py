@@ -1,4 +1,6 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
 from pydantic import BaseModel, Field
 
 class DetalleCarrito(BaseModel):
@@ -17,4 +19,24 @@ class DetalleVentaCreate(BaseModel):
     venta_id: int
     producto_id: int
     cantidad: int = Field(gt=0)
-    precio_producto: float = Field(gt=0)
\ No newline at end of file
+    precio_producto: float = Field(gt=0)
+
+
+class VentaOfflineDTO(VentaRequestDTO):
+    uuid: UUID = Field(..., description="Identificador generado por la terminal; evita duplicados al reintentar")
+    fecha: Optional[datetime] = Field(None, description="Fecha en que se registró la venta en la terminal")
+    carrito: List[DetalleCarrito] = Field(..., min_length=1, description="Productos incluidos en la venta")
+
+
+# Tope de ventas por envío: el lote es una sola transacción que bloquea sus
+# productos; las terminales con más ventas pendientes las envían en varios.
+MAX_VENTAS_SINCRONIZACION = 500
+
+
+class SincronizarVentasRequestDTO(BaseModel):
+    ventas: List[VentaOfflineDTO] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_VENTAS_SINCRONIZACION,
+        description="Ventas registradas sin conexión, en orden",
+    )
@@ -0,0 +1,204 @@
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.v1_0.entities import (
+    CarteraClienteDTO,
+    CarteraClientesDTO,
+    CarteraProveedorDTO,
+    CarteraProveedoresDTO,
+    CarteraProveedorDetalleDTO,
+    CompraPendienteDTO,
+    PagoCompraHistorialDTO,
+)
+from app.v1_0.repositories import VentaRepository, CompraRepository
+from app.v1_0.helper.csv_export import filas_a_csv
+
+
+class CarteraService:
+    """
+    Servicio de reportes de cartera por edades: cuentas por cobrar (ventas a
+    crédito) y cuentas por pagar (compras a crédito).
+    """
+
+    def __init__(
+        self,
+        venta_repository: VentaRepository,
+        compra_repository: CompraRepository,
+    ):
+        self.venta_repository = venta_repository
+        self.compra_repository = compra_repository
+
+    async def cartera_clientes(
+        self,
+        db: AsyncSession,
+        fecha_corte: Optional[datetime] = None
+    ) -> CarteraClientesDTO:
+        """
+        Reporte de cuentas por cobrar agrupado por cliente y por edad
+        (0-30, 31-60, 61-90 y más de 90 días) de las ventas a crédito abiertas.
+
+        Args:
+            db (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            fecha_corte (Optional[datetime]): Fecha contra la que se calcula la edad; por defecto, ahora.
+
+        Returns:
+            CarteraClientesDTO: Filas por cliente y totales por tramo.
+        """
+        fecha_corte = fecha_corte or datetime.now()
+        async with db.begin():
+            rows = await self.venta_repository.cartera_por_cliente(fecha_corte, session=db)
+
+        items = [
+            CarteraClienteDTO(
+                cliente_id=r.cliente_id,
+                cliente=r.cliente,
+                ventas_abiertas=int(r.ventas_abiertas),
+                dias_0_30=float(r.dias_0_30 or 0),
+                dias_31_60=float(r.dias_31_60 or 0),
+                dias_61_90=float(r.dias_61_90 or 0),
+                dias_mas_90=float(r.dias_mas_90 or 0),
+                total=float(r.total or 0),
+            )
+            for r in rows
+        ]
+        return CarteraClientesDTO(
+            fecha_corte=fecha_corte,
+            items=items,
+            dias_0_30=sum(i.dias_0_30 for i in items),
+            dias_31_60=sum(i.dias_31_60 for i in items),
+            dias_61_90=sum(i.dias_61_90 for i in items),
+            dias_mas_90=sum(i.dias_mas_90 for i in items),
+            total=sum(i.total for i in items),
+        )
+
+    async def exportar_cartera_clientes(
+        self,
+        db: AsyncSession,
+        fecha_corte: Optional[datetime] = None
+    ) -> str:
+        """
+        Genera el reporte de cuentas por cobrar por edades en formato CSV.
+        """
+        reporte = await self.cartera_clientes(db, fecha_corte=fecha_corte)
+        return filas_a_csv(
+            ["cliente_id", "cliente", "ventas_abiertas", "dias_0_30",
+             "dias_31_60", "dias_61_90", "dias_mas_90", "total"],
+            [
+                (i.cliente_id, i.cliente, i.ventas_abiertas, i.dias_0_30,
+                 i.dias_31_60, i.dias_61_90, i.dias_mas_90, i.total)
+                for i in reporte.items
+            ],
+        )
+
+    async def cartera_proveedores(
+        self,
+        db: AsyncSession,
+        fecha_corte: Optional[datetime] = None
+    ) -> CarteraProveedoresDTO:
+        """
+        Reporte de cuentas por pagar agrupado por proveedor y por edad
+        (0-30, 31-60, 61-90 y más de 90 días) de las compras a crédito abiertas.
+
+        Args:
+            db (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            fecha_corte (Optional[datetime]): Fecha contra la que se calcula la edad; por defecto, ahora.
+
+        Returns:
+            CarteraProveedoresDTO: Filas por proveedor y totales por tramo.
+        """
+        fecha_corte = fecha_corte or datetime.now()
+        async with db.begin():
+            rows = await self.compra_repository.cartera_por_proveedor(fecha_corte, session=db)
+
+        items = [
+            CarteraProveedorDTO(
+                proveedor_id=r.proveedor_id,
+                proveedor=r.proveedor,
+                compras_abiertas=int(r.compras_abiertas),
+                dias_0_30=float(r.dias_0_30 or 0),
+                dias_31_60=float(r.dias_31_60 or 0),
+                dias_61_90=float(r.dias_61_90 or 0),
+                dias_mas_90=float(r.dias_mas_90 or 0),
+                total=float(r.total or 0),
+            )
+            for r in rows
+        ]
+        return CarteraProveedoresDTO(
+            fecha_corte=fecha_corte,
+            items=items,
+            dias_0_30=sum(i.dias_0_30 for i in items),
+            dias_31_60=sum(i.dias_31_60 for i in items),
+            dias_61_90=sum(i.dias_61_90 for i in items),
+            dias_mas_90=sum(i.dias_mas_90 for i in items),
+            total=sum(i.total for i in items),
+        )
+
+    async def exportar_cartera_proveedores(
+        self,
+        db: AsyncSession,
+        fecha_corte: Optional[datetime] = None
+    ) -> str:
+        """
+        Genera el reporte de cuentas por pagar por edades en formato CSV.
+        """
+        reporte = await self.cartera_proveedores(db, fecha_corte=fecha_corte)
+        return filas_a_csv(
+            ["proveedor_id", "proveedor", "compras_abiertas", "dias_0_30",
+             "dias_31_60", "dias_61_90", "dias_mas_90", "total"],
+            [
+                (i.proveedor_id, i.proveedor, i.compras_abiertas, i.dias_0_30,
+                 i.dias_31_60, i.dias_61_90, i.dias_mas_90, i.total)
+                for i in reporte.items
+            ],
+        )
+
+    async def detalle_proveedor(
+        self,
+        proveedor_id: int,
+        db: AsyncSession
+    ) -> CarteraProveedorDetalleDTO:
+        """
+        Lista las compras a crédito abiertas de un proveedor con su historial de
+        pagos, obtenido en una sola consulta.
+
+        Args:
+            proveedor_id (int): ID del proveedor.
+            db (AsyncSession): Sesión asíncrona de SQLAlchemy.
+
+        Returns:
+            CarteraProveedorDetalleDTO: Compras abiertas (más antiguas primero) y saldo total.
+        """
+        async with db.begin():
+            rows = await self.compra_repository.list_pendientes_con_pagos(proveedor_id, session=db)
+
+        ahora = datetime.now()
+        compras: Dict[int, CompraPendienteDTO] = {}
+        for r in rows:
+            compra = compras.get(r.compra_id)
+            if compra is None:
+                compra = CompraPendienteDTO(
+                    id=r.compra_id,
+                    fecha=r.fecha_compra,
+                    dias=(ahora - r.fecha_compra).days if r.fecha_compra else 0,
+                    total=r.total,
+                    saldo=r.saldo,
+                    pagos=[],
+                )
+                compras[r.compra_id] = compra
+            if r.pago_id is not None:
+                compra.pagos.append(
+                    PagoCompraHistorialDTO(
+                        id=r.pago_id,
+                        banco=r.banco or "Desconocido",
+                        monto=r.monto,
+                        fecha_creacion=r.fecha_pago,
+                    )
+                )
+
+        items = list(compras.values())
+        return CarteraProveedorDetalleDTO(
+            proveedor_id=proveedor_id,
+            compras=items,
+            total=sum(c.saldo for c in items),
+        )
@@ -1,9 +1,10 @@
-from typing import Optional, List
+from typing import Optional, List, TextIO
 from sqlalchemy.ext.asyncio import AsyncSession
 from math import ceil
 
 from app.v1_0.repositories.cliente_repository import ClienteRepository
-from app.v1_0.entities import ClienteDTO, ClientesPageDTO, ClienteListDTO, ListClienteDTO
+from app.v1_0.entities import ClienteDTO, ClientesPageDTO, ClienteListDTO, ListClienteDTO, ImportacionResultadoDTO
+from app.v1_0.helper.importacion import LectorTerceros, leer_en_hilo
 from app.v1_0.models import Cliente
 
 PAGE_SIZE = 10
@@ -67,6 +68,18 @@ class ClienteService:
                 raise ValueError("Cliente no encontrado")
             return cliente
 
+    async def recompute_saldos_clientes(
+        self,
+        db: AsyncSession
+    ) -> int:
+        """
+        Recalcula el saldo de todos los clientes como la suma del saldo pendiente
+        de sus ventas a crédito, en una sola sentencia. Retorna cuántos clientes
+        tenían un saldo desfasado y fueron corregidos.
+        """
+        async with db.begin():
+            return await self.cliente_repository.recompute_saldos_clientes(session=db)
+
     async def eliminar_cliente(
         self,
         cliente_id: int,
@@ -124,4 +137,59 @@ class ClienteService:
         async with db.begin():
             rows = await self.cliente_repository.list_clientes(session=db)
 
-        return [ListClienteDTO(id=cid, nombre=nombre) for cid, nombre in rows]
\ No newline at end of file
+        return [ListClienteDTO(id=cid, nombre=nombre) for cid, nombre in rows]
+
+    async def buscar_clientes(
+        self,
+        texto: str,
+        limite: int,
+        db: AsyncSession
+    ) -> List[ClienteListDTO]:
+        """
+        Busca clientes por prefijo de cc_nit o nombre aproximado y devuelve
+        como máximo `limite` resultados ordenados por relevancia.
+        """
+        texto = texto.strip()
+        if not texto:
+            return []
+        async with db.begin():
+            items = await self.cliente_repository.buscar(texto, limite, session=db)
+
+        return [
+            ClienteListDTO(
+                id=c.id,
+                nombre=c.nombre,
+                cc_nit=c.cc_nit,
+                correo=c.correo,
+                celular=c.celular,
+                direccion=c.direccion,
+                ciudad=c.ciudad,
+                saldo=c.saldo,
+                fecha_creacion=c.fecha_creacion
+            )
+            for c in items
+        ]
+
+    async def importar_clientes(
+        self,
+        archivo: TextIO,
+        db: AsyncSession
+    ) -> ImportacionResultadoDTO:
+        """
+        Importa clientes desde un CSV (encabezados: cc_nit, nombre, direccion,
+        ciudad, celular, correo). Normaliza cada fila como `crear_cliente`,
+        carga las válidas con COPY y hace upsert por cc_nit en una sola
+        transacción. El archivo se lee y valida en el threadpool (`leer_en_hilo`).
+        Las filas inválidas se reportan en `rechazados`.
+        """
+        lector = LectorTerceros(archivo)
+        async with db.begin():
+            insertados, actualizados = await self.cliente_repository.importar_filas(
+                leer_en_hilo(lector), session=db
+            )
+        return ImportacionResultadoDTO(
+            procesados=lector.procesados,
+            insertados=insertados,
+            actualizados=actualizados,
+            rechazados=lector.rechazos,
+        )
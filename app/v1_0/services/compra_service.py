@@ -14,8 +14,19 @@ from app.v1_0.repositories import (
     BancoRepository,
     ProveedorRepository,
     EstadoRepository,
-    DetallePagoCompraRepository
+    DetallePagoCompraRepository,
+    MovimientoInventarioRepository
 )
+from app.v1_0.repositories.movimiento_inventario_repository import (
+    TIPO_COMPRA,
+    TIPO_ANULACION_COMPRA,
+)
+from app.utils.database.transacciones import (
+    bloquear_filas,
+    reintentar_transaccion,
+    transaccion,
+)
+from app.v1_0.models import Banco, Compra, Producto, Proveedor
 from app.v1_0.services.transaccion_service import TransaccionService
 
 class CompraService:
@@ -35,6 +46,7 @@ class CompraService:
         proveedor_repository: ProveedorRepository,
         estado_repository: EstadoRepository,
         pago_compra_repository: DetallePagoCompraRepository,
+        movimiento_repository: MovimientoInventarioRepository,
         transaccion_service: TransaccionService
     ):
         self.compra_repository = compra_repository
@@ -44,6 +56,7 @@ class CompraService:
         self.proveedor_repository = proveedor_repository
         self.estado_repository = estado_repository
         self.pago_compra_repository = pago_compra_repository
+        self.movimiento_repository = movimiento_repository
         self.transaccion_service = transaccion_service
 
     def construir_detalles(self, carrito: List[dict]) -> List[DetalleCompraDTO]:
@@ -71,6 +84,7 @@ class CompraService:
             ))
         return detalles
 
+    @reintentar_transaccion()
     async def registrar_compra(
         self,
         proveedor_id: int,
@@ -100,7 +114,12 @@ class CompraService:
         Raises:
             HTTPException 404: Si algún producto o la compra no se encuentra.
         """
-        async with db.begin():
+        async with transaccion(db):
+            await bloquear_filas(db, {
+                Producto: [d.producto_id for d in detalles],
+                Banco: [banco_id],
+                Proveedor: [proveedor_id],
+            })
 
             total_compra = 0.0
             for d in detalles:
@@ -139,6 +158,10 @@ class CompraService:
                 await self.producto_repository.aumentar_cantidad(
                     d.producto_id, d.cantidad, session=db
                 )
+            await self.movimiento_repository.registrar(
+                [(d.producto_id, d.cantidad, TIPO_COMPRA, compra.id) for d in detalles],
+                session=db,
+            )
 
             if not es_credito:
                 await self.banco_repository.disminuir_saldo(
@@ -202,6 +225,7 @@ class CompraService:
             fecha=compra.fecha_compra
         )
 
+    @reintentar_transaccion()
     async def eliminar_compra(
         self,
         compra_id: int,
@@ -231,6 +255,15 @@ class CompraService:
             if not compra:
                 raise HTTPException(404, "Compra no encontrada")
 
+            pagos = await self.pago_compra_repository.list_by_compra(compra_id, session=db)
+            detalles = await self.detalle_repository.get_by_compra_id(compra_id, session=db)
+            await bloquear_filas(db, {
+                Producto: [d.producto_id for d in detalles],
+                Banco: [compra.banco_id, *(p.banco_id for p in pagos)],
+                Proveedor: [compra.proveedor_id],
+                Compra: [compra_id],
+            })
+            # Con la compra bloqueada ya no pueden entrar pagos nuevos: releer.
             pagos = await self.pago_compra_repository.list_by_compra(compra_id, session=db)
             for pago in pagos:
                 await self.banco_repository.aumentar_saldo(
@@ -240,13 +273,17 @@ class CompraService:
                 )
             await self.pago_compra_repository.delete_by_compra(compra_id, session=db)
 
-            detalles = await self.detalle_repository.get_by_compra_id(compra_id, session=db)
+            movimientos = []
             for d in detalles:
-                await self.producto_repository.disminuir_cantidad(
+                producto = await self.producto_repository.disminuir_cantidad(
                     d.producto_id,
                     d.cantidad,
                     session=db
                 )
+                # Sin stock suficiente no se descuenta; el kardex refleja sólo lo aplicado.
+                if producto:
+                    movimientos.append((d.producto_id, -d.cantidad, TIPO_ANULACION_COMPRA, compra_id))
+            await self.movimiento_repository.registrar(movimientos, session=db)
 
             estado = await self.estado_repository.get_by_id(compra.estado_id, session=db)
             es_credito = bool(estado and estado.nombre.lower() == "compra credito")
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.database.transacciones import reintentar_transaccion, transaccion_externa
+
+from app.utils.metricas import idempotencia_solicitudes
+from app.v1_0.repositories import ClaveIdempotenciaRepository
+from app.v1_0.repositories.clave_idempotencia_repository import ESTADO_COMPLETADO
+
+ENCABEZADO = "Idempotency-Key"
+ENCABEZADO_REPETIDA = "Idempotent-Replayed"
+
+
+class IdempotenciaService:
+    """
+    Ejecuta una operación de escritura a lo sumo una vez por Idempotency-Key.
+
+    La reserva de la clave, la operación y la respuesta guardada van en una
+    sola transacción (`transaccion_externa`): o se confirman las tres o
+    ninguna, así que nunca queda una venta o un pago sin su respuesta ni una
+    respuesta sin su operación. Un duplicado concurrente espera en el INSERT
+    de la reserva hasta que la primera termina: si se confirmó, recibe la
+    respuesta guardada; si se revirtió, ejecuta la operación él mismo.
+
+    Un reintento con la misma clave y el mismo cuerpo recibe la respuesta
+    guardada; con otro cuerpo, 422. Una clave en proceso que quedó de una
+    versión anterior responde 409 hasta que vence su TTL: nunca se toma.
+    """
+
+    def __init__(
+        self,
+        clave_repository: ClaveIdempotenciaRepository,
+        ttl: timedelta = timedelta(hours=24),
+    ):
+        self.clave_repository = clave_repository
+        self.ttl = ttl
+
+    @staticmethod
+    def _hash(alcance: str, payload: Any) -> str:
+        cuerpo = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{alcance}\n{cuerpo}".encode()).hexdigest()
+
+    @staticmethod
+    def _serializar(adaptador: TypeAdapter, valor: Any) -> Any:
+        # Igual que FastAPI con `response_model`: validar contra el modelo y
+        # volcarlo a JSON (sólo los campos del modelo, con sus tipos).
+        return adaptador.dump_python(
+            adaptador.validate_python(valor, from_attributes=True), mode="json"
+        )
+
+    @reintentar_transaccion()
+    async def ejecutar(
+        self,
+        clave: Optional[str],
+        alcance: str,
+        payload: Any,
+        operacion: Callable[[], Awaitable[Any]],
+        modelo: Any,
+        db: AsyncSession,
+        codigo_estado: int = 200
+    ) -> Any:
+        """
+        Ejecuta `operacion` protegida por la clave. Sin clave, la ejecuta
+        directamente. `alcance` identifica el endpoint (una misma clave puede
+        usarse en endpoints distintos), `payload` todo lo que define la
+        solicitud (cuerpo y parámetros de ruta) y `modelo` el
+        `response_model` del endpoint, con el que se guarda y se repite la
+        respuesta.
+
+        `operacion` debe abrir su transacción con `transaccion(db)` para
+        quedar dentro de la de la clave.
+        """
+        if not clave:
+            return await operacion()
+        if len(clave) > 255:
+            raise HTTPException(400, f"{ENCABEZADO} no puede superar 255 caracteres")
+
+        hash_solicitud = self._hash(alcance, payload)
+        adaptador = TypeAdapter(modelo)
+        async with transaccion_externa(db):
+            reservada = await self.clave_repository.reservar(
+                clave,
+                alcance,
+                hash_solicitud,
+                expira_en=datetime.now() + self.ttl,
+                session=db,
+            )
+            if reservada:
+                resultado = await operacion()
+                await self.clave_repository.completar(
+                    clave,
+                    alcance,
+                    codigo_estado,
+                    self._serializar(adaptador, resultado),
+                    session=db,
+                )
+            else:
+                existente = await self.clave_repository.obtener(clave, alcance, session=db)
+
+        if reservada:
+            idempotencia_solicitudes.inc(resultado="nueva")
+            return resultado
+
+        if existente is None:
+            idempotencia_solicitudes.inc(resultado="conflicto")
+            # Se purgó entre la reserva y la lectura.
+            raise HTTPException(409, "La solicitud con esta Idempotency-Key no se completó; reintente")
+        if existente.hash_solicitud != hash_solicitud:
+            idempotencia_solicitudes.inc(resultado="distinta")
+            raise HTTPException(422, "Idempotency-Key ya usada con una solicitud distinta")
+        if existente.estado != ESTADO_COMPLETADO:
+            idempotencia_solicitudes.inc(resultado="conflicto")
+            raise HTTPException(409, "Hay una solicitud en curso con esta Idempotency-Key")
+        idempotencia_solicitudes.inc(resultado="repetida")
+        return JSONResponse(
+            content=self._serializar(adaptador, existente.respuesta),
+            status_code=existente.codigo_estado or codigo_estado,
+            headers={ENCABEZADO_REPETIDA: "true"},
+        )
+
+    async def purgar_vencidas(self, db: AsyncSession) -> int:
+        """Elimina las claves cuyo TTL venció."""
+        async with db.begin():
+            return await self.clave_repository.purgar_vencidas(session=db)
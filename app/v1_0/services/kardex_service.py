@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.v1_0.entities import (
+    MovimientoKardexDTO,
+    KardexProductoDTO,
+    StockAFechaDTO,
+    CierreKardexDTO,
+)
+from app.v1_0.repositories import ProductoRepository, MovimientoInventarioRepository
+
+# Rango por defecto del historial cuando no se indica `desde`.
+DIAS_HISTORIAL = 30
+
+
+class KardexService:
+    """
+    Consultas sobre el kardex (movimientos de inventario) y puntos de
+    control periódicos (snapshots) que acotan el cálculo de stock a fecha.
+    """
+
+    def __init__(
+        self,
+        producto_repository: ProductoRepository,
+        movimiento_repository: MovimientoInventarioRepository,
+    ):
+        self.producto_repository = producto_repository
+        self.movimiento_repository = movimiento_repository
+
+    async def stock_a_fecha(
+        self,
+        producto_id: int,
+        fecha: datetime,
+        db: AsyncSession
+    ) -> StockAFechaDTO:
+        """Stock del producto al cierre de `fecha`."""
+        async with db.begin():
+            producto = await self.producto_repository.get_by_id(producto_id, session=db)
+            if not producto:
+                raise ValueError("Producto no encontrado")
+            cantidad = await self.movimiento_repository.stock_a_fecha(
+                producto_id, fecha, session=db
+            )
+        return StockAFechaDTO(producto_id=producto_id, fecha=fecha, cantidad=cantidad)
+
+    async def historial(
+        self,
+        producto_id: int,
+        limite: int,
+        db: AsyncSession,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None
+    ) -> KardexProductoDTO:
+        """
+        Movimientos del producto en (desde, hasta] con saldo acumulado,
+        partiendo del stock al cierre de `desde`. Por defecto, los últimos
+        DIAS_HISTORIAL días hasta la hora de la base.
+
+        Se retornan a lo más `limite` movimientos (`truncado` indica que hay
+        más en el rango); `saldo_final` es siempre el stock al cierre de
+        `hasta`, no el saldo del último movimiento retornado.
+        """
+        async with db.begin():
+            producto = await self.producto_repository.get_by_id(producto_id, session=db)
+            if not producto:
+                raise ValueError("Producto no encontrado")
+            hasta = hasta or await self.movimiento_repository.ahora(session=db)
+            desde = desde or hasta - timedelta(days=DIAS_HISTORIAL)
+            if desde >= hasta:
+                raise ValueError("'desde' debe ser anterior a 'hasta'")
+            saldo_inicial = await self.movimiento_repository.stock_a_fecha(
+                producto_id, desde, session=db
+            )
+            # Una fila de más para saber si el rango quedó truncado.
+            filas = await self.movimiento_repository.list_movimientos(
+                producto_id, desde, hasta, saldo_inicial, limite + 1, session=db
+            )
+            truncado = len(filas) > limite
+            if truncado:
+                filas = filas[:limite]
+                saldo_final = await self.movimiento_repository.stock_a_fecha(
+                    producto_id, hasta, session=db
+                )
+            else:
+                saldo_final = int(filas[-1].saldo) if filas else saldo_inicial
+
+        movimientos = [
+            MovimientoKardexDTO(
+                id=f.id,
+                fecha=f.fecha,
+                tipo=f.tipo,
+                documento_id=f.documento_id,
+                cantidad=f.cantidad,
+                saldo=int(f.saldo),
+            )
+            for f in filas
+        ]
+        return KardexProductoDTO(
+            producto_id=producto_id,
+            referencia=producto.referencia,
+            desde=desde,
+            hasta=hasta,
+            saldo_inicial=saldo_inicial,
+            saldo_final=saldo_final,
+            truncado=truncado,
+            movimientos=movimientos,
+        )
+
+    async def abrir_kardex(self, db: AsyncSession) -> int:
+        """
+        Registra el movimiento inicial de los productos que aún no tienen
+        kardex (stock existente antes de llevar el historial).
+        """
+        async with db.begin():
+            return await self.movimiento_repository.registrar_iniciales(session=db)
+
+    async def cerrar_periodo(
+        self,
+        db: AsyncSession,
+        margen: timedelta = timedelta(minutes=5)
+    ) -> CierreKardexDTO:
+        """
+        Genera snapshots al corte `ahora - margen` (hora de la base). El
+        margen deja fuera los movimientos de transacciones que aún podrían
+        estar en curso, para que un snapshot no quede desfasado por un commit
+        tardío.
+        """
+        async with db.begin():
+            ahora = await self.movimiento_repository.ahora(session=db)
+            corte = (ahora - margen).replace(microsecond=0)
+            iniciales = await self.movimiento_repository.registrar_iniciales(session=db)
+            snapshots = await self.movimiento_repository.generar_snapshots(corte, session=db)
+        return CierreKardexDTO(corte=corte, iniciales=iniciales, snapshots=snapshots)
@@ -1,7 +1,7 @@
 # app/v1_0/services/pago_compra_service.py
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,7 +12,15 @@ from app.v1_0.repositories import (
     DetallePagoCompraRepository,
     BancoRepository,
 )
+from app.utils.database.transacciones import (
+    bloquear_filas,
+    reintentar_transaccion,
+    transaccion,
+)
+from app.utils.metricas import pagos_registrados
+from app.v1_0.models import Banco, Compra, Proveedor
 from app.v1_0.services.transaccion_service import TransaccionService
+from app.v1_0.helper.abonos import repartir_abono
 
 class PagoCompraService:
     """
@@ -32,6 +40,7 @@ class PagoCompraService:
         self.banco_repo = banco_repository
         self.transaccion_service = transaccion_service
 
+    @reintentar_transaccion()
     async def crear_pago_compra(
         self,
         compra_id: int,
@@ -60,11 +69,18 @@ class PagoCompraService:
                                el monto es inválido/excede el saldo de la compra,
                                o saldo insuficiente en el banco.
         """
-        async with db.begin():
+        async with transaccion(db):
             compra = await self.compra_repo.get_by_id(compra_id, session=db)
-            banco = await self.banco_repo.get_by_id(banco_id, session=db)
             if not compra:
                 raise HTTPException(404, "Compra no encontrada")
+            bloqueadas = await bloquear_filas(db, {
+                Banco: [banco_id],
+                Proveedor: [compra.proveedor_id],
+                Compra: [compra_id],
+            })
+            banco = bloqueadas.get(Banco, {}).get(banco_id)
+            if not banco:
+                raise HTTPException(404, "Banco no encontrado")
 
             estado = await self.estado_repo.get_by_id(compra.estado_id, session=db)
             if not estado or estado.nombre.lower() != "compra credito":
@@ -118,6 +134,7 @@ class PagoCompraService:
                 db=db
             )
 
+        pagos_registrados.inc(tipo="compra")
         return PagoResponseDTO(
             id=pago.id,
             venta_id=compra_id,
@@ -127,6 +144,124 @@ class PagoCompraService:
             fecha_creacion=pago.fecha_creacion
         )
 
+    @reintentar_transaccion()
+    async def crear_pagos_compra_masivo(
+        self,
+        proveedor_id: int,
+        banco_id: int,
+        monto: float,
+        db: AsyncSession,
+        compra_ids: Optional[List[int]] = None
+    ) -> List[PagoResponseDTO]:
+        """
+        Reparte un único pago entre varias compras a crédito de un proveedor.
+
+        Cubre las compras con saldo pendiente de la más antigua a la más reciente
+        (o en el orden de `compra_ids`) hasta agotar el monto, todo en una sola
+        transacción con sentencias por lotes.
+
+        Args:
+            proveedor_id (int): ID del proveedor al que se le paga.
+            banco_id (int): ID del banco desde el que se paga.
+            monto (float): Monto total a repartir.
+            db (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            compra_ids (Optional[List[int]]): Compras a abonar, en orden de prioridad.
+
+        Returns:
+            List[PagoResponseDTO]: Un DTO por cada compra que recibió parte del pago.
+
+        Raises:
+            HTTPException 404: Si el banco no existe.
+            HTTPException 400: Si el monto es inválido o supera el saldo pendiente,
+                               si alguna compra indicada no está a crédito con saldo,
+                               o saldo insuficiente en el banco.
+        """
+        # El reparto trabaja en centavos; redondear aquí evita que el monto
+        # recibido y la suma de los abonos difieran en fracciones de centavo.
+        monto = round(monto, 2)
+        if monto <= 0:
+            raise HTTPException(400, "El monto debe ser mayor que cero")
+
+        async with transaccion(db):
+            # El proveedor bloqueado serializa los abonos sobre sus compras.
+            bloqueadas = await bloquear_filas(db, {Banco: [banco_id], Proveedor: [proveedor_id]})
+            banco = bloqueadas.get(Banco, {}).get(banco_id)
+            if not banco:
+                raise HTTPException(404, "Banco no encontrado")
+            if banco.saldo < monto:
+                raise HTTPException(400, f"Saldo insuficiente en el banco ({banco.saldo:.2f})")
+
+            estado_credito = await self.estado_repo.get_by_nombre("compra credito", session=db)
+            if not estado_credito:
+                raise HTTPException(400, "Estado 'compra credito' no configurado")
+            estado_cancelada = await self.estado_repo.get_by_nombre("compra cancelada", session=db)
+
+            compras = await self.compra_repo.list_credito_pendientes(
+                proveedor_id, estado_credito.id, session=db, compra_ids=compra_ids
+            )
+            if compra_ids:
+                faltantes = set(compra_ids) - {c.id for c in compras}
+                if faltantes:
+                    raise HTTPException(
+                        400,
+                        f"Compras sin saldo a crédito pendiente para el proveedor: {sorted(faltantes)}"
+                    )
+            if not compras:
+                raise HTTPException(400, "El proveedor no tiene compras a crédito con saldo pendiente")
+
+            try:
+                abonos = repartir_abono(monto, [(c.id, c.saldo) for c in compras])
+            except ValueError as e:
+                raise HTTPException(400, str(e))
+
+            fecha = datetime.now()
+            pagos = await self.pago_compra_repo.bulk_create_pagos(
+                [
+                    DetallePagoCompraDTO(
+                        compra_id=compra_id,
+                        banco_id=banco_id,
+                        monto=abonado,
+                        fecha_creacion=fecha
+                    )
+                    for compra_id, abonado in abonos.items()
+                ],
+                session=db
+            )
+            await self.compra_repo.aplicar_abonos(
+                abonos,
+                estado_cancelada.id if estado_cancelada else None,
+                session=db
+            )
+            # El banco se mueve por lo efectivamente aplicado a las compras.
+            aplicado = round(sum(abonos.values()), 2)
+            await self.banco_repo.disminuir_saldo(banco_id, aplicado, session=db)
+            await self.transaccion_service.insertar_transacciones(
+                [
+                    TransaccionDTO(
+                        banco_id=banco_id,
+                        monto=pago.monto,
+                        tipo_id=3,
+                        descripcion=f"{pago.id} Abono compra {pago.compra_id}"
+                    )
+                    for pago in pagos
+                ],
+                db=db
+            )
+
+        saldos = {c.id: c.saldo for c in compras}
+        pagos_registrados.inc(len(pagos), tipo="compra")
+        return [
+            PagoResponseDTO(
+                id=pago.id,
+                venta_id=pago.compra_id,
+                banco=banco.nombre,
+                saldo_restante=saldos[pago.compra_id] - pago.monto,
+                monto_abonado=pago.monto,
+                fecha_creacion=pago.fecha_creacion
+            )
+            for pago in pagos
+        ]
+
     async def listar_pagos_compra(
         self,
         compra_id: int,
@@ -162,6 +297,7 @@ class PagoCompraService:
             ))
         return result
 
+    @reintentar_transaccion()
     async def eliminar_pago_compra(
         self,
         pago_id: int,
@@ -192,6 +328,11 @@ class PagoCompraService:
             compra = await self.compra_repo.get_by_id(pago.compra_id, session=db)
             if not compra:
                 raise HTTPException(404, "Compra asociada no encontrada")
+            await bloquear_filas(db, {
+                Banco: [pago.banco_id],
+                Proveedor: [compra.proveedor_id],
+                Compra: [compra.id],
+            })
 
             estado_actual = await self.estado_repo.get_by_id(compra.estado_id, session=db)
             if estado_actual and estado_actual.nombre.lower() == "compra cancelada":
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,9 +8,18 @@ from app.v1_0.repositories import (
     VentaRepository,
     EstadoRepository,
     DetallePagoVentaRepository,
-    BancoRepository
+    BancoRepository,
+    ClienteRepository
 )
+from app.utils.database.transacciones import (
+    bloquear_filas,
+    reintentar_transaccion,
+    transaccion,
+)
+from app.utils.metricas import pagos_registrados
+from app.v1_0.models import Banco, Cliente, Venta
 from app.v1_0.services.transaccion_service import TransaccionService
+from app.v1_0.helper.abonos import repartir_abono
 
 class PagoVentaService:
     """
@@ -23,14 +32,17 @@ class PagoVentaService:
         estado_repository: EstadoRepository,
         pago_venta_repository: DetallePagoVentaRepository,
         banco_repository: BancoRepository,
+        cliente_repository: ClienteRepository,
         transaccion_service: TransaccionService
     ):
         self.venta_repo = venta_repository
         self.estado_repo = estado_repository
         self.pago_venta_repo = pago_venta_repository
         self.banco_repo = banco_repository
+        self.cliente_repo = cliente_repository
         self.transaccion_service = transaccion_service
 
+    @reintentar_transaccion()
     async def crear_pago_venta(
             self,
             venta_id: int,
@@ -40,7 +52,8 @@ class PagoVentaService:
         ) -> PagoResponseDTO:
             """Registra un pago sobre una venta a crédito.
 
-            Descuenta el monto del saldo pendiente de la venta y lo añade al saldo del banco.
+            Descuenta el monto del saldo pendiente de la venta y del saldo del cliente,
+            y lo añade al saldo del banco.
             Si tras el pago el saldo de la venta queda en cero, actualiza su estado a “venta cancelada”.
 
             Args:
@@ -57,10 +70,15 @@ class PagoVentaService:
                 HTTPException 400: Si la venta no está a crédito, no tiene saldo pendiente,
                                 o el monto es inválido/excede el saldo.
             """
-            async with db.begin():
+            async with transaccion(db):
                 venta = await self.venta_repo.get_by_id(venta_id, session=db)
                 if not venta:
                     raise HTTPException(404, "Venta no encontrada")
+                await bloquear_filas(db, {
+                    Banco: [banco_id],
+                    Cliente: [venta.cliente_id],
+                    Venta: [venta_id],
+                })
 
                 estado = await self.estado_repo.get_by_id(venta.estado_id, session=db)
                 if not estado or estado.nombre.lower() != "venta credito":
@@ -99,6 +117,7 @@ class PagoVentaService:
                             session=db
                         )
 
+                await self.cliente_repo.ajustar_saldo(venta.cliente_id, -monto, session=db)
                 await self.banco_repo.aumentar_saldo(
                     banco_id, monto, session=db
                 )
@@ -113,6 +132,7 @@ class PagoVentaService:
                 )
                 banco = await self.banco_repo.get_by_id(banco_id, session=db)
 
+            pagos_registrados.inc(tipo="venta")
             return PagoResponseDTO(
                 id=pago.id,
                 venta_id=venta_id,
@@ -122,6 +142,122 @@ class PagoVentaService:
                 fecha_creacion=pago.fecha_creacion
             )
 
+    @reintentar_transaccion()
+    async def crear_pagos_venta_masivo(
+        self,
+        cliente_id: int,
+        banco_id: int,
+        monto: float,
+        db: AsyncSession,
+        venta_ids: Optional[List[int]] = None
+    ) -> List[PagoResponseDTO]:
+        """Reparte un único abono entre varias ventas a crédito de un cliente.
+
+        Cubre las ventas con saldo pendiente de la más antigua a la más reciente
+        (o en el orden de `venta_ids`) hasta agotar el monto. Los pagos, los
+        saldos de las ventas y los movimientos del banco se registran en una sola
+        transacción con sentencias por lotes, en lugar de una transacción por venta.
+
+        Args:
+            cliente_id (int): ID del cliente que realiza el abono.
+            banco_id (int): ID del banco que recibe el abono.
+            monto (float): Monto total a repartir.
+            db (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            venta_ids (Optional[List[int]]): Ventas a abonar, en orden de prioridad.
+
+        Returns:
+            List[PagoResponseDTO]: Un DTO por cada venta que recibió parte del abono.
+
+        Raises:
+            HTTPException 404: Si el banco no existe.
+            HTTPException 400: Si el monto es inválido o supera el saldo pendiente,
+                               o si alguna venta indicada no está a crédito con saldo.
+        """
+        # El reparto trabaja en centavos; redondear aquí evita que el monto
+        # recibido y la suma de los abonos difieran en fracciones de centavo.
+        monto = round(monto, 2)
+        if monto <= 0:
+            raise HTTPException(400, "El monto debe ser mayor que cero")
+
+        async with transaccion(db):
+            # El cliente bloqueado serializa los abonos sobre sus ventas.
+            bloqueadas = await bloquear_filas(db, {Banco: [banco_id], Cliente: [cliente_id]})
+            banco = bloqueadas.get(Banco, {}).get(banco_id)
+            if not banco:
+                raise HTTPException(404, "Banco no encontrado")
+
+            estado_credito = await self.estado_repo.get_by_nombre("venta credito", session=db)
+            if not estado_credito:
+                raise HTTPException(400, "Estado 'venta credito' no configurado")
+            estado_cancelada = await self.estado_repo.get_by_nombre("venta cancelada", session=db)
+
+            ventas = await self.venta_repo.list_credito_pendientes(
+                cliente_id, estado_credito.id, session=db, venta_ids=venta_ids
+            )
+            if venta_ids:
+                faltantes = set(venta_ids) - {v.id for v in ventas}
+                if faltantes:
+                    raise HTTPException(
+                        400,
+                        f"Ventas sin saldo a crédito pendiente para el cliente: {sorted(faltantes)}"
+                    )
+            if not ventas:
+                raise HTTPException(400, "El cliente no tiene ventas a crédito con saldo pendiente")
+
+            try:
+                abonos = repartir_abono(monto, [(v.id, v.saldo_restante) for v in ventas])
+            except ValueError as e:
+                raise HTTPException(400, str(e))
+
+            fecha = datetime.now()
+            pagos = await self.pago_venta_repo.bulk_create_pagos(
+                [
+                    DetallePagoVentaDTO(
+                        venta_id=venta_id,
+                        banco_id=banco_id,
+                        monto=abonado,
+                        fecha_creacion=fecha
+                    )
+                    for venta_id, abonado in abonos.items()
+                ],
+                session=db
+            )
+            await self.venta_repo.aplicar_abonos(
+                abonos,
+                estado_cancelada.id if estado_cancelada else None,
+                session=db
+            )
+            # Cliente y banco se mueven por lo efectivamente aplicado a las ventas.
+            aplicado = round(sum(abonos.values()), 2)
+            await self.cliente_repo.ajustar_saldo(cliente_id, -aplicado, session=db)
+            await self.banco_repo.aumentar_saldo(banco_id, aplicado, session=db)
+            await self.transaccion_service.insertar_transacciones(
+                [
+                    TransaccionDTO(
+                        banco_id=banco_id,
+                        monto=pago.monto,
+                        tipo_id=3,
+                        descripcion=f"{pago.id} Abono venta {pago.venta_id}"
+                    )
+                    for pago in pagos
+                ],
+                db=db
+            )
+
+        saldos = {v.id: v.saldo_restante for v in ventas}
+        pagos_registrados.inc(len(pagos), tipo="venta")
+        return [
+            PagoResponseDTO(
+                id=pago.id,
+                venta_id=pago.venta_id,
+                banco=banco.nombre,
+                saldo_restante=saldos[pago.venta_id] - pago.monto,
+                monto_abonado=pago.monto,
+                fecha_creacion=pago.fecha_creacion
+            )
+            for pago in pagos
+        ]
+
     async def listar_pagos_venta(
         self,
         venta_id: int,
@@ -157,6 +293,7 @@ class PagoVentaService:
 
         return result
 
+    @reintentar_transaccion()
     async def eliminar_pago_venta(
         self,
         pago_id: int,
@@ -165,7 +302,8 @@ class PagoVentaService:
         """Elimina un pago de venta.
 
         Si la venta estaba en “venta cancelada”, la cambia a “venta credito”,
-        restaura el saldo pendiente y descuenta del banco el monto del pago eliminado.
+        restaura el saldo pendiente de la venta y del cliente, y descuenta del
+        banco el monto del pago eliminado.
 
         Args:
             pago_id (int): ID del pago a eliminar.
@@ -185,6 +323,11 @@ class PagoVentaService:
             venta = await self.venta_repo.get_by_id(pago.venta_id, session=db)
             if not venta:
                 raise HTTPException(404, "Venta asociada no encontrada")
+            await bloquear_filas(db, {
+                Banco: [pago.banco_id],
+                Cliente: [venta.cliente_id],
+                Venta: [venta.id],
+            })
 
             estado_actual = await self.estado_repo.get_by_id(venta.estado_id, session=db)
             if estado_actual and estado_actual.nombre.lower() == "venta cancelada":
@@ -203,6 +346,7 @@ class PagoVentaService:
                 session=db
             )
 
+            await self.cliente_repo.ajustar_saldo(venta.cliente_id, pago.monto, session=db)
             await self.banco_repo.disminuir_saldo(
                 pago.banco_id,
                 pago.monto,
@@ -1,18 +1,41 @@
 from math import ceil
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.v1_0.repositories.producto_repository import ProductoRepository
-from app.v1_0.entities import ProductoDTO, ProductoListDTO, ProductosPageDTO
+from app.v1_0.repositories.movimiento_inventario_repository import (
+    MovimientoInventarioRepository,
+    TIPO_INICIAL,
+    TIPO_AJUSTE,
+)
+from app.v1_0.entities import (
+    ProductoDTO,
+    ProductoListDTO,
+    ProductosPageDTO,
+    ProductoUpsertResultadoDTO,
+    AjustePrecioItemDTO,
+    AjustePreciosResultadoDTO,
+    AjusteInventarioDTO,
+    ConteoInventarioResultadoDTO,
+    ProductoBajoStockDTO,
+)
 from app.v1_0.models import Producto
 
 PAGE_SIZE = 10
+# Filas por sentencia al aplicar un conteo físico (2 parámetros por fila).
+CONTEO_LOTE = 10000
 
 class ProductoService:
-    def __init__(self, producto_repository: ProductoRepository):
+    def __init__(
+        self,
+        producto_repository: ProductoRepository,
+        movimiento_repository: MovimientoInventarioRepository
+    ):
         self.repository = producto_repository
+        self.movimiento_repository = movimiento_repository
 
     async def crear_producto(
         self,
@@ -33,7 +56,11 @@ class ProductoService:
                 )
                 if existente:
                     raise ValueError("Ya existe un producto con esa referencia.")
-            return await self.repository.create_producto(producto_dto, session=db)
+            producto = await self.repository.create_producto(producto_dto, session=db)
+            await self.movimiento_repository.registrar(
+                [(producto.id, producto.cantidad or 0, TIPO_INICIAL, None)], session=db
+            )
+            return producto
 
     async def actualizar_producto(
         self,
@@ -49,9 +76,15 @@ class ProductoService:
             raise ValueError("cantidad inválida")
 
         async with db.begin():
-            updated = await self.repository.update_producto(producto_id, producto_dto, session=db)
-            if not updated:
+            actual = await self.repository.get_by_id(producto_id, session=db)
+            if not actual:
                 raise ValueError("Producto no encontrado")
+            cantidad_anterior = actual.cantidad or 0
+            updated = await self.repository.update_producto(producto_id, producto_dto, session=db)
+            await self.movimiento_repository.registrar(
+                [(producto_id, (updated.cantidad or 0) - cantidad_anterior, TIPO_AJUSTE, None)],
+                session=db,
+            )
             return updated
 
     async def eliminar_producto(
@@ -88,6 +121,9 @@ class ProductoService:
             prod = await self.repository.aumentar_cantidad(producto_id, cantidad, session=db)
             if not prod:
                 raise ValueError("Producto no encontrado")
+            await self.movimiento_repository.registrar(
+                [(producto_id, cantidad, TIPO_AJUSTE, None)], session=db
+            )
             return prod
 
     async def disminuir_stock(
@@ -108,6 +144,9 @@ class ProductoService:
             prod = await self.repository.disminuir_cantidad(producto_id, cantidad, session=db)
             if not prod:
                 raise ValueError("Producto no encontrado o stock insuficiente")
+            await self.movimiento_repository.registrar(
+                [(producto_id, -cantidad, TIPO_AJUSTE, None)], session=db
+            )
             return prod
 
     async def listar_productos(
@@ -138,6 +177,7 @@ class ProductoService:
                 precio_venta=p.precio_venta,
                 activo=bool(p.activo),
                 fecha_creacion=p.fecha_creacion,
+                stock_minimo=p.stock_minimo,
             )
             for p in items_models
         ]
@@ -181,6 +221,186 @@ class ProductoService:
                 precio_venta=p.precio_venta,
                 activo=bool(p.activo),
                 fecha_creacion=p.fecha_creacion,
+                stock_minimo=p.stock_minimo,
             )
             for p in items_models
-        ]
\ No newline at end of file
+        ]
+
+    async def upsert_productos(
+        self,
+        productos: List[ProductoDTO],
+        db: AsyncSession
+    ) -> ProductoUpsertResultadoDTO:
+        """
+        Crea o actualiza en bloque productos identificados por referencia.
+        A los existentes sólo se les actualiza descripción y precios (el stock
+        no se toca). Si una referencia se repite, prevalece la última.
+        """
+        filas = {}
+        ahora = datetime.now()
+        for p in productos:
+            if p.precio_compra < 0 or p.precio_venta < 0:
+                raise ValueError(f"Precios negativos en la referencia {p.referencia}.")
+            if p.cantidad is not None and p.cantidad < 0:
+                raise ValueError(f"Cantidad negativa en la referencia {p.referencia}.")
+            referencia = p.referencia.strip()
+            if not referencia:
+                raise ValueError("La referencia es obligatoria.")
+            filas[referencia] = {
+                "referencia": referencia,
+                "descripcion": p.descripcion,
+                "precio_compra": p.precio_compra,
+                "precio_venta": p.precio_venta,
+                "cantidad": p.cantidad or 0,
+                "activo": True,
+                "fecha_creacion": ahora,
+            }
+
+        async with db.begin():
+            afectados = await self.repository.upsert_productos(
+                list(filas.values()), session=db
+            )
+            await self.movimiento_repository.registrar(
+                [(f.id, f.cantidad, TIPO_INICIAL, None) for f in afectados if f.insertado],
+                session=db,
+            )
+        insertados = sum(1 for f in afectados if f.insertado)
+        return ProductoUpsertResultadoDTO(
+            insertados=insertados,
+            actualizados=len(afectados) - insertados,
+        )
+
+    async def ajustar_precios(
+        self,
+        porcentaje: float,
+        db: AsyncSession,
+        campo: str = "precio_venta",
+        referencia_prefijo: Optional[str] = None,
+        descripcion: Optional[str] = None,
+        proveedor_id: Optional[int] = None,
+        solo_activos: bool = True,
+        dry_run: bool = False
+    ) -> AjustePreciosResultadoDTO:
+        """
+        Ajusta en un porcentaje el precio de venta (o de compra) de todos los
+        productos que cumplan los filtros, en un solo UPDATE. Con dry_run=True
+        devuelve los precios resultantes sin modificar nada.
+        """
+        if campo not in ("precio_venta", "precio_compra"):
+            raise ValueError("campo debe ser precio_venta o precio_compra")
+        if porcentaje <= -100:
+            raise ValueError("El porcentaje debe ser mayor que -100.")
+
+        async with db.begin():
+            filas = await self.repository.ajustar_precios(
+                campo,
+                1 + porcentaje / 100,
+                session=db,
+                referencia_prefijo=referencia_prefijo,
+                descripcion=descripcion,
+                proveedor_id=proveedor_id,
+                solo_activos=solo_activos,
+                aplicar=not dry_run,
+            )
+
+        return AjustePreciosResultadoDTO(
+            campo=campo,
+            porcentaje=porcentaje,
+            aplicado=not dry_run,
+            total=len(filas),
+            items=[
+                AjustePrecioItemDTO(
+                    id=f.id,
+                    referencia=f.referencia,
+                    descripcion=f.descripcion,
+                    precio_anterior=f.precio_anterior,
+                    precio_nuevo=f.precio_nuevo,
+                )
+                for f in filas
+            ],
+        )
+
+    async def registrar_conteo(
+        self,
+        conteo: List[Tuple[str, int]],
+        observacion: Optional[str],
+        db: AsyncSession
+    ) -> ConteoInventarioResultadoDTO:
+        """
+        Aplica una hoja de conteo físico: fija el stock de cada referencia a la
+        cantidad contada y deja auditado cada ajuste. Si una referencia se
+        repite, prevalece la última fila. Las referencias inexistentes se
+        reportan y no detienen el resto del conteo.
+        """
+        contado = {}
+        for referencia, cantidad in conteo:
+            if cantidad < 0:
+                raise ValueError(f"Cantidad negativa en la referencia {referencia}.")
+            contado[referencia.strip()] = cantidad
+        filas = list(contado.items())
+
+        ajustes = []
+        async with db.begin():
+            no_encontradas = await self.repository.referencias_inexistentes(
+                list(contado), session=db
+            )
+            for inicio in range(0, len(filas), CONTEO_LOTE):
+                ajustes.extend(
+                    await self.repository.aplicar_conteo(
+                        filas[inicio:inicio + CONTEO_LOTE], observacion, session=db
+                    )
+                )
+
+        return ConteoInventarioResultadoDTO(
+            procesados=len(filas),
+            ajustados=len(ajustes),
+            sin_cambios=len(filas) - len(ajustes) - len(no_encontradas),
+            no_encontradas=no_encontradas,
+            ajustes=[
+                AjusteInventarioDTO(
+                    producto_id=a.producto_id,
+                    referencia=a.referencia,
+                    cantidad_anterior=a.cantidad_anterior,
+                    cantidad_nueva=a.cantidad_nueva,
+                    diferencia=a.diferencia,
+                )
+                for a in ajustes
+            ],
+        )
+
+    async def listar_bajo_stock(
+        self,
+        limite: int,
+        db: AsyncSession
+    ) -> List[ProductoBajoStockDTO]:
+        """
+        Lista de reposición: productos activos en o bajo su stock mínimo.
+        """
+        async with db.begin():
+            filas = await self.repository.list_bajo_stock(limite, session=db)
+
+        return [
+            ProductoBajoStockDTO(
+                id=f.id,
+                referencia=f.referencia,
+                descripcion=f.descripcion,
+                cantidad=f.cantidad,
+                stock_minimo=f.stock_minimo,
+                faltante=f.stock_minimo - f.cantidad,
+            )
+            for f in filas
+        ]
+
+    async def actualizar_stock_minimo(
+        self,
+        producto_id: int,
+        stock_minimo: int,
+        db: AsyncSession
+    ) -> Producto:
+        if stock_minimo < 0:
+            raise ValueError("El stock mínimo no puede ser negativo.")
+        async with db.begin():
+            prod = await self.repository.update_stock_minimo(producto_id, stock_minimo, session=db)
+            if not prod:
+                raise ValueError("Producto no encontrado")
+            return prod
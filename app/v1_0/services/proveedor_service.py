@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Optional, List, TextIO
 from sqlalchemy.ext.asyncio import AsyncSession
 from math import ceil
 
 from app.v1_0.repositories.proveedor_repository import ProveedorRepository
-from app.v1_0.entities import ProveedorDTO, ProveedoresPageDTO, ProveedorListDTO
+from app.v1_0.entities import ProveedorDTO, ProveedoresPageDTO, ProveedorListDTO, ImportacionResultadoDTO
+from app.v1_0.helper.importacion import LectorTerceros, leer_en_hilo
 from app.v1_0.models import Proveedor
 
 PAGE_SIZE = 10
@@ -101,3 +102,57 @@ class ProveedorService:
             has_next=page < total_pages,
             has_prev=page > 1,
         )
+
+    async def buscar_proveedores(
+        self,
+        texto: str,
+        limite: int,
+        db: AsyncSession
+    ) -> List[ProveedorListDTO]:
+        """
+        Busca proveedores por prefijo de cc_nit o nombre aproximado y devuelve
+        como máximo `limite` resultados ordenados por relevancia.
+        """
+        texto = texto.strip()
+        if not texto:
+            return []
+        async with db.begin():
+            items = await self.proveedor_repository.buscar(texto, limite, session=db)
+
+        return [
+            ProveedorListDTO(
+                id=p.id,
+                nombre=p.nombre,
+                cc_nit=p.cc_nit,
+                correo=p.correo,
+                celular=p.celular,
+                direccion=p.direccion,
+                ciudad=p.ciudad,
+                fecha_creacion=p.fecha_creacion,
+            )
+            for p in items
+        ]
+
+    async def importar_proveedores(
+        self,
+        archivo: TextIO,
+        db: AsyncSession
+    ) -> ImportacionResultadoDTO:
+        """
+        Importa proveedores desde un CSV (encabezados: cc_nit, nombre, direccion,
+        ciudad, celular, correo). Normaliza cada fila como `crear_proveedor`,
+        carga las válidas con COPY y hace upsert por cc_nit en una sola
+        transacción. El archivo se lee y valida en el threadpool (`leer_en_hilo`).
+        Las filas inválidas se reportan en `rechazados`.
+        """
+        lector = LectorTerceros(archivo)
+        async with db.begin():
+            insertados, actualizados = await self.proveedor_repository.importar_filas(
+                leer_en_hilo(lector), session=db
+            )
+        return ImportacionResultadoDTO(
+            procesados=lector.procesados,
+            insertados=insertados,
+            actualizados=actualizados,
+            rechazados=lector.rechazos,
+        )
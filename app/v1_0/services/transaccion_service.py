@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.v1_0.entities import TransaccionDTO, TransaccionListDTO, TransaccionPageDTO, TransaccionResponseDTO
@@ -30,6 +30,13 @@ class TransaccionService:
     ) -> Transaccion:
         return await self.trans_repo.create_transaccion(transaccion_dto, session=db)
 
+    async def insertar_transacciones(
+        self,
+        transacciones: List[TransaccionDTO],
+        db: AsyncSession
+    ) -> int:
+        return await self.trans_repo.bulk_create_transacciones(transacciones, session=db)
+
     async def crear_transaccion(
         self,
         banco_id: int,
@@ -1,5 +1,6 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from math import ceil
@@ -12,7 +13,9 @@ from app.v1_0.entities import (
     DetalleUtilidadDTO,
     VentaListDTO,
     VentasPageDTO,
-    DetalleVentaViewDTO
+    DetalleVentaViewDTO,
+    ResultadoSincronizacionDTO,
+    SincronizacionVentasDTO,
 )
 from app.v1_0.repositories import (
     VentaRepository,
@@ -24,9 +27,23 @@ from app.v1_0.repositories import (
     UtilidadRepository,
     BancoRepository,
     DetallePagoVentaRepository,
+    MovimientoInventarioRepository,
 )
+from app.v1_0.repositories.movimiento_inventario_repository import (
+    TIPO_VENTA,
+    TIPO_ANULACION_VENTA,
+)
+from app.utils.database.commit_agrupado import CommitAgrupado
+from app.utils.database.transacciones import (
+    bloquear_filas,
+    en_transaccion_externa,
+    reintentar_transaccion,
+    transaccion,
+)
+from app.utils.metricas import ventas_registradas
+from app.v1_0.models import Banco, Cliente, Producto, Venta
 from app.v1_0.services.transaccion_service import TransaccionService
-from app.v1_0.schemas.venta_schema import DetalleVentaCreate
+from app.v1_0.schemas.venta_schema import DetalleVentaCreate, VentaOfflineDTO, VentaRequestDTO
 PAGE_SIZE = 13
 
 
@@ -42,7 +59,11 @@ class VentaService:
         utilidad_repository: UtilidadRepository,
         banco_repository: BancoRepository,
         pago_venta_repository: DetallePagoVentaRepository,
+        movimiento_repository: MovimientoInventarioRepository,
         transaccion_service: TransaccionService,
+        agrupar_commits: bool = False,
+        espera_agrupado_ms: float = 5,
+        max_lote_agrupado: int = 50,
     ):
         self.venta_repository = venta_repository
         self.detalle_repository = detalle_repository
@@ -53,8 +74,20 @@ class VentaService:
         self.utilidad_repository = utilidad_repository
         self.banco_repository = banco_repository
         self.pago_venta_repository = pago_venta_repository
+        self.movimiento_repository = movimiento_repository
         self.transaccion_service = transaccion_service
+        # Opcional: ventas concurrentes comparten transacción (ver finalizar_venta).
+        self.commit_agrupado: Optional[CommitAgrupado[VentaRequestDTO, VentaListDTO]] = (
+            CommitAgrupado(
+                self._procesar_lote,
+                self._procesar_venta,
+                espera=espera_agrupado_ms / 1000,
+                max_lote=max_lote_agrupado,
+            )
+            if agrupar_commits else None
+        )
 
+    @reintentar_transaccion()
     async def finalizar_venta(
     self,
     cliente_id: int,
@@ -65,12 +98,37 @@ class VentaService:
     ) -> VentaListDTO:
         """
         Finaliza una venta a partir del carrito JSON del frontend y retorna un VentaListDTO.
+
+        Con el commit agrupado activo, la venta se encola y se registra junto
+        con las que lleguen en los mismos milisegundos, en una sola
+        transacción con actualizaciones de stock y saldos por lote (ver
+        `_registrar_ventas`); el resultado o error es el de esta venta. La
+        venta se registra con las sesiones del worker, no con `db`.
+        Dentro de `transaccion_externa` (p. ej. con Idempotency-Key) no se
+        agrupa: la venta debe confirmarse en la transacción del llamador.
         """
-        async with db.begin():
+        if self.commit_agrupado is not None and not en_transaccion_externa(db):
+            return await self.commit_agrupado.enviar(
+                VentaRequestDTO(
+                    cliente_id=cliente_id,
+                    banco_id=banco_id,
+                    estado_id=estado_id,
+                    carrito=carrito,
+                )
+            )
+
+        async with transaccion(db):
             # 1) Leer estado para saber si es crédito/contado
             estado = await self.estado_repository.get_by_id(estado_id, session=db)
             es_credito = bool(estado and estado.nombre.lower() == "venta credito")
 
+            # Bloqueo de stock y saldos en orden canónico antes de escribir
+            await bloquear_filas(db, {
+                Producto: [int(c["producto_id"]) for c in carrito],
+                Banco: [banco_id],
+                Cliente: [cliente_id],
+            })
+
             # 2) Crear la venta primero (total y saldo se actualizan luego)
             venta_dto = VentaDTO(
                 cliente_id=cliente_id,
@@ -129,13 +187,14 @@ class VentaService:
             # 7) Descontar inventario
             for d in detalles:
                 await self.producto_repository.disminuir_cantidad(d.producto_id, d.cantidad, session=db)
+            await self.movimiento_repository.registrar(
+                [(d.producto_id, -d.cantidad, TIPO_VENTA, venta.id) for d in detalles],
+                session=db,
+            )
 
             # 8) Ajustar saldos / transacción
             if es_credito:
-                cliente = await self.cliente_repository.get_by_id(cliente_id, session=db)
-                if cliente:
-                    nuevo_saldo_cliente = (cliente.saldo or 0) + total_venta
-                    await self.cliente_repository.update_saldo(cliente_id, nuevo_saldo_cliente, session=db)
+                await self.cliente_repository.ajustar_saldo(cliente_id, total_venta, session=db)
             else:
                 banco = await self.banco_repository.get_by_id(banco_id, session=db)
                 if banco:
@@ -164,6 +223,7 @@ class VentaService:
             cliente = await self.cliente_repository.get_by_id(cliente_id, session=db)
             banco = await self.banco_repository.get_by_id(banco_id, session=db)
 
+        ventas_registradas.inc(origen="directa")
         return VentaListDTO(
             id=venta.id,
             cliente=cliente.nombre if cliente else "Desconocido",
@@ -237,6 +297,287 @@ class VentaService:
             )
         return out
 
+    @reintentar_transaccion()
+    async def sincronizar_ventas(
+        self,
+        ventas: List[VentaOfflineDTO],
+        db: AsyncSession,
+    ) -> SincronizacionVentasDTO:
+        """
+        Registra en una sola transacción un lote de ventas hechas sin conexión
+        en una terminal POS.
+
+        Cada venta trae un UUID generado en la terminal: las que ya se
+        registraron (en un envío anterior o repetidas en el mismo lote) se
+        reportan como duplicadas con su venta_id, de modo que la terminal
+        puede reintentar el lote completo sin riesgo. Las ventas con cliente,
+        banco, estado o productos inexistentes, o sin stock suficiente, se
+        rechazan individualmente sin afectar al resto del lote.
+        """
+        resultados: Dict[int, ResultadoSincronizacionDTO] = {}
+        uuids = list({v.uuid for v in ventas})
+        async with db.begin():
+            # Dos envíos simultáneos del mismo lote (reintento de la terminal)
+            # se serializan aquí; sin esto ambos verían los UUID como nuevos y
+            # el segundo fallaría con la restricción única.
+            await self.venta_repository.bloquear_uuids(uuids, session=db)
+            # 1) UUID ya registrados o repetidos dentro del lote
+            existentes = await self.venta_repository.ids_por_uuid(uuids, session=db)
+            vistos = set()
+            pendientes: List[int] = []
+            for i, v in enumerate(ventas):
+                if v.uuid in existentes or v.uuid in vistos:
+                    resultados[i] = ResultadoSincronizacionDTO(
+                        uuid=v.uuid, estado="duplicada", venta_id=existentes.get(v.uuid)
+                    )
+                else:
+                    vistos.add(v.uuid)
+                    pendientes.append(i)
+
+            registradas = await self._registrar_ventas([ventas[i] for i in pendientes], db)
+            for i, r in zip(pendientes, registradas):
+                if isinstance(r, HTTPException):
+                    resultados[i] = ResultadoSincronizacionDTO(
+                        uuid=ventas[i].uuid, estado="rechazada", motivo=r.detail
+                    )
+                else:
+                    resultados[i] = ResultadoSincronizacionDTO(
+                        uuid=ventas[i].uuid, estado="creada", venta_id=r.id
+                    )
+
+        # Las repetidas dentro del lote apuntan a la venta creada por su primera aparición
+        creadas = {r.uuid: r.venta_id for r in resultados.values() if r.estado == "creada"}
+        for r in resultados.values():
+            if r.estado == "duplicada" and r.venta_id is None:
+                r.venta_id = creadas.get(r.uuid)
+
+        ordenados = [resultados[i] for i in range(len(ventas))]
+        creadas_total = sum(r.estado == "creada" for r in ordenados)
+        ventas_registradas.inc(creadas_total, origen="offline")
+        return SincronizacionVentasDTO(
+            creadas=creadas_total,
+            duplicadas=sum(r.estado == "duplicada" for r in ordenados),
+            rechazadas=sum(r.estado == "rechazada" for r in ordenados),
+            resultados=ordenados,
+        )
+
+    async def _registrar_ventas(
+        self,
+        ventas: List[VentaRequestDTO],
+        db: AsyncSession,
+    ) -> List[Union[VentaListDTO, HTTPException]]:
+        """
+        Registra varias ventas dentro de la transacción ya abierta en `db` y
+        retorna, en el mismo orden, la venta creada o el HTTPException que la
+        rechazó (cliente/banco/estado/producto inexistente o stock
+        insuficiente). Una venta rechazada no afecta al resto.
+
+        Los productos se bloquean con una sola consulta (en orden de id), el
+        stock se valida en memoria en el orden recibido y las escrituras se
+        hacen por lotes: un INSERT para ventas, detalles, utilidades, kardex y
+        transacciones, y un UPDATE agregado para stock, saldos de clientes y
+        saldos de bancos.
+        """
+        if not ventas:
+            return []
+
+        # 1) Referencias y bloqueo de productos, todo en consultas por lote
+        clientes = await self.cliente_repository.nombres_por_id(
+            list({v.cliente_id for v in ventas}), session=db
+        )
+        bancos = await self.banco_repository.nombres_por_id(
+            list({v.banco_id for v in ventas}), session=db
+        )
+        estados = {
+            e.id: e.nombre for e in await self.estado_repository.list_estados(session=db)
+        }
+        productos = await self.producto_repository.bloquear_productos(
+            list({d.producto_id for v in ventas for d in v.carrito}),
+            session=db,
+        )
+        # Productos ya bloqueados en orden de id; siguen bancos y clientes (orden canónico).
+        await bloquear_filas(db, {
+            Banco: [v.banco_id for v in ventas],
+            Cliente: [v.cliente_id for v in ventas],
+        })
+
+        # 2) Validar cada venta contra el stock simulado en memoria
+        stock = {pid: p.cantidad or 0 for pid, p in productos.items()}
+        resultados: List[Union[VentaListDTO, HTTPException, None]] = []
+        aceptadas: List[int] = []
+        for i, v in enumerate(ventas):
+            error = None
+            if v.cliente_id not in clientes:
+                error = HTTPException(404, f"Cliente {v.cliente_id} no encontrado")
+            elif v.banco_id not in bancos:
+                error = HTTPException(404, f"Banco {v.banco_id} no encontrado")
+            elif v.estado_id not in estados:
+                error = HTTPException(404, f"Estado {v.estado_id} no encontrado")
+            else:
+                requerido: Dict[int, int] = defaultdict(int)
+                for d in v.carrito:
+                    requerido[d.producto_id] += d.cantidad
+                for pid, cantidad in requerido.items():
+                    if pid not in productos:
+                        error = HTTPException(404, f"Producto {pid} no encontrado")
+                        break
+                    if stock[pid] < cantidad:
+                        error = HTTPException(
+                            400, f"Stock insuficiente para producto {productos[pid].referencia}"
+                        )
+                        break
+                if error is None:
+                    for pid, cantidad in requerido.items():
+                        stock[pid] -= cantidad
+            resultados.append(error)
+            if error is None:
+                aceptadas.append(i)
+
+        if not aceptadas:
+            return resultados
+
+        # 3) Insertar ventas con sus totales ya calculados
+        ahora = datetime.now()
+        totales = {
+            i: sum(d.cantidad * d.precio_producto for d in ventas[i].carrito)
+            for i in aceptadas
+        }
+        credito = {
+            i: estados[ventas[i].estado_id].lower() == "venta credito"
+            for i in aceptadas
+        }
+        fechas = {
+            i: (ventas[i].fecha if isinstance(ventas[i], VentaOfflineDTO) else None) or ahora
+            for i in aceptadas
+        }
+        venta_ids = await self.venta_repository.bulk_create_ventas(
+            [
+                {
+                    "cliente_id": ventas[i].cliente_id,
+                    "banco_id": ventas[i].banco_id,
+                    "estado_id": ventas[i].estado_id,
+                    "total": totales[i],
+                    "saldo_restante": totales[i] if credito[i] else 0.0,
+                    "fecha": fechas[i],
+                    "uuid_terminal": ventas[i].uuid if isinstance(ventas[i], VentaOfflineDTO) else None,
+                }
+                for i in aceptadas
+            ],
+            session=db,
+        )
+        ids = dict(zip(aceptadas, venta_ids))
+
+        # 4) Detalles, utilidades y kardex
+        await self.detalle_repository.bulk_create_detalles(
+            [
+                {
+                    "venta_id": ids[i],
+                    "producto_id": d.producto_id,
+                    "cantidad": d.cantidad,
+                    "precio_producto": d.precio_producto,
+                }
+                for i in aceptadas
+                for d in ventas[i].carrito
+            ],
+            session=db,
+        )
+        await self.detalle_utilidad_repository.bulk_create_detalles(
+            [
+                {
+                    "venta_id": ids[i],
+                    "producto_id": d.producto_id,
+                    "cantidad": d.cantidad,
+                    "precio_compra": productos[d.producto_id].precio_compra,
+                    "precio_venta": d.precio_producto,
+                }
+                for i in aceptadas
+                for d in ventas[i].carrito
+            ],
+            session=db,
+        )
+        await self.utilidad_repository.bulk_create_utilidades(
+            [
+                {
+                    "venta_id": ids[i],
+                    "utilidad": sum(
+                        (d.precio_producto - productos[d.producto_id].precio_compra) * d.cantidad
+                        for d in ventas[i].carrito
+                    ),
+                    "fecha": fechas[i],
+                }
+                for i in aceptadas
+            ],
+            session=db,
+        )
+        await self.movimiento_repository.registrar(
+            [
+                (d.producto_id, -d.cantidad, TIPO_VENTA, ids[i])
+                for i in aceptadas
+                for d in ventas[i].carrito
+            ],
+            session=db,
+        )
+
+        # 5) Stock y saldos agregados: un UPDATE por tabla
+        await self.producto_repository.aplicar_deltas_cantidad(
+            {pid: stock[pid] - (p.cantidad or 0) for pid, p in productos.items()},
+            session=db,
+        )
+        saldo_clientes: Dict[int, float] = defaultdict(float)
+        saldo_bancos: Dict[int, float] = defaultdict(float)
+        transacciones: List[TransaccionDTO] = []
+        for i in aceptadas:
+            v = ventas[i]
+            if credito[i]:
+                saldo_clientes[v.cliente_id] += totales[i]
+            else:
+                saldo_bancos[v.banco_id] += totales[i]
+                transacciones.append(
+                    TransaccionDTO(
+                        banco_id=v.banco_id,
+                        monto=totales[i],
+                        tipo_id=3,  # Pago venta
+                        descripcion=f"Pago venta {ids[i]}",
+                    )
+                )
+        await self.cliente_repository.aplicar_deltas_saldo(saldo_clientes, session=db)
+        await self.banco_repository.aplicar_deltas_saldo(saldo_bancos, session=db)
+        await self.transaccion_service.insertar_transacciones(transacciones, db=db)
+
+        for i in aceptadas:
+            v = ventas[i]
+            resultados[i] = VentaListDTO(
+                id=ids[i],
+                cliente=clientes[v.cliente_id],
+                banco=bancos[v.banco_id],
+                estado=estados[v.estado_id],
+                total=totales[i],
+                saldo_restante=totales[i] if credito[i] else 0.0,
+                fecha=fechas[i],
+            )
+        return resultados
+
+    @reintentar_transaccion()
+    async def _procesar_lote(
+        self,
+        ventas: List[VentaRequestDTO],
+        db: AsyncSession,
+    ) -> List[Union[VentaListDTO, HTTPException]]:
+        """Lote del commit agrupado: todas las ventas en una sola transacción."""
+        async with db.begin():
+            resultados = await self._registrar_ventas(ventas, db)
+        ventas_registradas.inc(
+            sum(not isinstance(r, HTTPException) for r in resultados), origen="agrupada"
+        )
+        return resultados
+
+    async def _procesar_venta(self, venta: VentaRequestDTO, db: AsyncSession) -> VentaListDTO:
+        """Reintento individual de una venta cuyo lote falló completo."""
+        resultado = (await self._procesar_lote([venta], db))[0]
+        if isinstance(resultado, HTTPException):
+            raise resultado
+        return resultado
+
     async def obtener_venta(self, venta_id: int, db: AsyncSession) -> VentaListDTO:
         """
         Obtiene una venta y la devuelve como VentaListDTO.
@@ -259,6 +600,7 @@ class VentaService:
             fecha=venta.fecha,
         )
 
+    @reintentar_transaccion()
     async def eliminar_venta(self, venta_id: int, db: AsyncSession) -> None:
         async with db.begin():
             venta = await self.venta_repository.get_by_id(venta_id, session=db)
@@ -266,23 +608,34 @@ class VentaService:
                 raise HTTPException(404, "Venta no encontrada")
 
             detalles = await self.detalle_repository.get_by_venta_id(venta_id, session=db)
+            pagos = await self.pago_venta_repository.list_by_venta(venta_id, session=db)
+            await bloquear_filas(db, {
+                Producto: [d.producto_id for d in detalles],
+                Banco: [venta.banco_id, *(p.banco_id for p in pagos)],
+                Cliente: [venta.cliente_id],
+                Venta: [venta_id],
+            })
+            # Con la venta bloqueada ya no pueden entrar pagos nuevos: releer.
+            pagos = await self.pago_venta_repository.list_by_venta(venta_id, session=db)
+
             for d in detalles:
                 await self.producto_repository.aumentar_cantidad(d.producto_id, d.cantidad, session=db)
+            await self.movimiento_repository.registrar(
+                [(d.producto_id, d.cantidad, TIPO_ANULACION_VENTA, venta_id) for d in detalles],
+                session=db,
+            )
 
             estado = await self.estado_repository.get_by_id(venta.estado_id, session=db)
             estado_nombre = (estado.nombre or "").lower() if estado else ""
             es_tipo_credito = estado_nombre in ("venta credito", "venta cancelada")
             es_contado = estado_nombre == "venta contado"
 
-            pagos = await self.pago_venta_repository.list_by_venta(venta_id, session=db)
-
             if es_tipo_credito:
                 for pago in pagos:
                     await self.banco_repository.disminuir_saldo(pago.banco_id, pago.monto, session=db)
-                cliente = await self.cliente_repository.get_by_id(venta.cliente_id, session=db)
-                if cliente:
-                    nuevo_saldo = max((cliente.saldo or 0) - venta.total, 0)
-                    await self.cliente_repository.update_saldo(cliente.id, nuevo_saldo, session=db)
+                await self.cliente_repository.ajustar_saldo(
+                    venta.cliente_id, -(venta.saldo_restante or 0), session=db
+                )
             elif es_contado:
                 await self.banco_repository.disminuir_saldo(venta.banco_id, venta.total, session=db)
 
@@ -1,5 +1,9 @@
+from datetime import timedelta
+
 from dependency_injector import containers, providers
 
+from app.utils.database.db_connector import settings
+
 from app.v1_0.repositories import (
     VentaRepository,
     DetalleVentaRepository,
@@ -20,7 +24,9 @@ from app.v1_0.repositories import (
     InversionRepository, 
     TipoTransaccionRepository,
     TransaccionRepository, 
-    UserRepository
+    UserRepository,
+    MovimientoInventarioRepository,
+    ClaveIdempotenciaRepository
 )
 from app.v1_0.services.venta_service import VentaService
 from app.v1_0.services.compra_service import CompraService
@@ -37,6 +43,9 @@ from app.v1_0.services.utilidad_service import UtilidadService
 from app.v1_0.services.user_service import UserService
 from app.v1_0.services.banco_service import BancoService
 from app.v1_0.services.estado_service import EstadoService
+from app.v1_0.services.cartera_service import CarteraService
+from app.v1_0.services.kardex_service import KardexService
+from app.v1_0.services.idempotencia_service import IdempotenciaService
 
 class APIContainer(containers.DeclarativeContainer):
     """
@@ -63,6 +72,8 @@ class APIContainer(containers.DeclarativeContainer):
     tipo_transaccion_repository = providers.Singleton(TipoTransaccionRepository)
     transaccion_repository = providers.Singleton(TransaccionRepository)
     user_repository = providers.Singleton(UserRepository)
+    movimiento_inventario_repository = providers.Singleton(MovimientoInventarioRepository)
+    clave_idempotencia_repository = providers.Singleton(ClaveIdempotenciaRepository)
     # Servicios
     user_service = providers.Singleton(
         UserService,
@@ -99,7 +110,8 @@ class APIContainer(containers.DeclarativeContainer):
     
     producto_service = providers.Singleton(
         ProductoService,
-        producto_repository=producto_repository
+        producto_repository=producto_repository,
+        movimiento_repository=movimiento_inventario_repository
     )
 
     credito_service = providers.Singleton(
@@ -130,7 +142,11 @@ class APIContainer(containers.DeclarativeContainer):
         utilidad_repository=utilidad_repository,
         banco_repository=banco_repository,
         pago_venta_repository=detalle_pago_venta_repository,
-        transaccion_service=transaccion_service
+        movimiento_repository=movimiento_inventario_repository,
+        transaccion_service=transaccion_service,
+        agrupar_commits=settings.get("ventas.commit_agrupado.activo", False),
+        espera_agrupado_ms=settings.get("ventas.commit_agrupado.espera_ms", 5),
+        max_lote_agrupado=settings.get("ventas.commit_agrupado.max_lote", 50),
     )
 
     compra_service = providers.Singleton(
@@ -142,6 +158,7 @@ class APIContainer(containers.DeclarativeContainer):
         proveedor_repository=proveedor_repository,
         estado_repository=estado_repository,
         pago_compra_repository=detalle_pago_compra_repository,
+        movimiento_repository=movimiento_inventario_repository,
         transaccion_service=transaccion_service
     )
 
@@ -168,5 +185,24 @@ class APIContainer(containers.DeclarativeContainer):
         estado_repository=estado_repository,
         pago_venta_repository=detalle_pago_venta_repository,
         banco_repository=banco_repository,
+        cliente_repository=cliente_repository,
         transaccion_service=transaccion_service
-    )
\ No newline at end of file
+    )
+
+    cartera_service = providers.Singleton(
+        CarteraService,
+        venta_repository=venta_repository,
+        compra_repository=compra_repository
+    )
+
+    kardex_service = providers.Singleton(
+        KardexService,
+        producto_repository=producto_repository,
+        movimiento_repository=movimiento_inventario_repository
+    )
+
+    idempotencia_service = providers.Singleton(
+        IdempotenciaService,
+        clave_repository=clave_idempotencia_repository,
+        ttl=providers.Callable(timedelta, hours=settings.get("idempotencia.ttl_horas", 24))
+    )
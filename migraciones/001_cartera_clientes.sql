@@ -0,0 +1,8 @@
+-- Reporte de cartera por edades: ventas a crédito abiertas.
+-- Índice parcial (sólo saldo_restante > 0) con el saldo incluido, para
+-- agrupar por cliente sin leer el heap.
+
+CREATE INDEX IF NOT EXISTS ix_venta_credito_abierta
+    ON venta (cliente_id, fecha)
+    INCLUDE (saldo_restante)
+    WHERE saldo_restante > 0;
@@ -0,0 +1,10 @@
+-- Reporte de cuentas por pagar: compras a crédito abiertas y el detalle de
+-- pagos de cada compra (join del drill-down por proveedor).
+
+CREATE INDEX IF NOT EXISTS ix_compra_credito_abierta
+    ON compra (proveedor_id, fecha_compra)
+    INCLUDE (saldo)
+    WHERE saldo > 0;
+
+CREATE INDEX IF NOT EXISTS ix_detalle_pago_compra_compra_id
+    ON detalle_pago_compra (compra_id);
@@ -0,0 +1,17 @@
+-- Búsqueda de clientes y proveedores: prefijo de cc_nit (LIKE 'abc%') y
+-- búsqueda aproximada por nombre con pg_trgm (%, similarity, ILIKE).
+-- CREATE EXTENSION requiere un rol con privilegios sobre la base.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_cliente_cc_nit_patron
+    ON cliente (cc_nit text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS ix_cliente_nombre_trgm
+    ON cliente USING gin (nombre gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_proveedor_cc_nit_patron
+    ON proveedor (cc_nit text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS ix_proveedor_nombre_trgm
+    ON proveedor USING gin (nombre gin_trgm_ops);
@@ -0,0 +1,14 @@
+-- Auditoría de ajustes de stock por conteo físico.
+
+CREATE TABLE IF NOT EXISTS ajuste_inventario (
+    id                serial PRIMARY KEY,
+    producto_id       integer NOT NULL REFERENCES producto (id) ON DELETE CASCADE,
+    cantidad_anterior integer NOT NULL,
+    cantidad_nueva    integer NOT NULL,
+    diferencia        integer NOT NULL,
+    observacion       text,
+    fecha             timestamp NOT NULL DEFAULT localtimestamp
+);
+
+CREATE INDEX IF NOT EXISTS ix_ajuste_inventario_producto_id
+    ON ajuste_inventario (producto_id);
@@ -0,0 +1,27 @@
+-- Kardex: movimientos de inventario (sólo inserción) y snapshots periódicos
+-- de stock por producto. Las fechas usan el reloj de la base.
+
+CREATE TABLE IF NOT EXISTS movimiento_inventario (
+    id           bigserial PRIMARY KEY,
+    producto_id  integer NOT NULL REFERENCES producto (id) ON DELETE CASCADE,
+    cantidad     integer NOT NULL,
+    tipo         varchar(20) NOT NULL,
+    documento_id integer,
+    fecha        timestamp NOT NULL DEFAULT localtimestamp
+);
+
+-- Historial y stock a fecha: lectura por rango (producto_id, fecha).
+CREATE INDEX IF NOT EXISTS ix_movimiento_inventario_producto_fecha
+    ON movimiento_inventario (producto_id, fecha, id)
+    INCLUDE (cantidad);
+
+-- Cortes de snapshot: movimientos posteriores al último corte.
+CREATE INDEX IF NOT EXISTS ix_movimiento_inventario_fecha
+    ON movimiento_inventario (fecha);
+
+CREATE TABLE IF NOT EXISTS snapshot_inventario (
+    producto_id integer NOT NULL REFERENCES producto (id) ON DELETE CASCADE,
+    fecha       timestamp NOT NULL,
+    cantidad    integer NOT NULL,
+    PRIMARY KEY (producto_id, fecha)
+);
@@ -0,0 +1,10 @@
+-- Punto de reorden por producto y lista de reposición: índice parcial que
+-- sólo contiene los productos activos en o bajo su stock mínimo.
+
+ALTER TABLE producto
+    ADD COLUMN IF NOT EXISTS stock_minimo integer NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_producto_bajo_stock
+    ON producto (referencia)
+    INCLUDE (cantidad, stock_minimo)
+    WHERE activo AND stock_minimo > 0 AND cantidad <= stock_minimo;
@@ -0,0 +1,17 @@
+-- Respuestas guardadas de las operaciones con encabezado Idempotency-Key.
+
+CREATE TABLE IF NOT EXISTS clave_idempotencia (
+    clave          varchar(255) NOT NULL,
+    alcance        varchar(100) NOT NULL,
+    hash_solicitud varchar(64) NOT NULL,
+    estado         varchar(20) NOT NULL,
+    codigo_estado  integer,
+    respuesta      jsonb,
+    fecha_creacion timestamp NOT NULL,
+    expira_en      timestamp NOT NULL,
+    PRIMARY KEY (clave, alcance)
+);
+
+-- Limpieza por TTL.
+CREATE INDEX IF NOT EXISTS ix_clave_idempotencia_expira_en
+    ON clave_idempotencia (expira_en);
@@ -0,0 +1,8 @@
+-- Ventas sincronizadas desde terminales POS sin conexión: UUID generado en
+-- la terminal, único para que un lote reenviado no duplique ventas.
+
+ALTER TABLE venta
+    ADD COLUMN IF NOT EXISTS uuid_terminal uuid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS venta_uuid_terminal_key
+    ON venta (uuid_terminal);
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Uso: scripts/benchmark-drivers.sh local local_asyncpg [--venta CLIENTE BANCO ESTADO] [--producto ID]
+poetry run python -m app.v1_0.helper.benchmark_drivers "$@"
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Uso: scripts/importar-terceros.sh clientes|proveedores archivo.csv
+poetry run python -m app.v1_0.helper.importar_terceros "$@"
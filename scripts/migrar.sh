@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Uso: scripts/migrar.sh [--listar]
+poetry run python -m app.v1_0.helper.migrar "$@"